@@ -1,4 +1,4 @@
-import sqlite3, sys, os, getopt, pandas as pd
+import sqlite3, sys, os, getopt
 from datetime import datetime
 from sklearn.metrics import confusion_matrix
 from sklearn.preprocessing import StandardScaler
@@ -15,28 +15,8 @@ def test_model(conn: sqlite3.Connection, results_path: str, model: str):
   cur = conn.cursor()
   start = datetime.now()
 
-  print("Fetching data...")
-  tokens = utils.query_tokens(cur)
-  pdb = utils.query_pdb(cur)
-  df = utils.balance_dataset(tokens, pdb)
-
-  print('Loading FastText model...')
-  try:
-    ft = utils.load_ft(utils.get_embedder_path())
-  except Exception as ex:
-    print(ex)
-    sys.exit()
-  literals = df['literal']
-  labels = df['is_name']
-
-  print("Splitting datasets...")
-  _, x_test, _, y_test = utils.split_dataset(literals, labels)
-  
-  print("Performing word embedding...")
-  x_test = pd.DataFrame(data=x_test, columns = ['literal'])
-  x_test = utils.ft_embed(ft, x_test)
-  X_test = utils.listify(x_test['lit_vec'].to_list())
-  y_test = tuple(y_test.to_list())
+  print("Loading features...")
+  _, X_test, _, y_test = utils.load_features(cur)
 
   # scaling
   scaler = StandardScaler()
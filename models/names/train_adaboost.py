@@ -1,4 +1,4 @@
-import sqlite3, sys, os, getopt, pandas as pd
+import sqlite3, sys, os, getopt
 from sklearn.ensemble import AdaBoostClassifier
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import cross_val_score
@@ -13,29 +13,8 @@ def train_adaboost(conn: sqlite3.Connection):
   """Trains function name classifier using AdaBoost model (scikit-learn) and saves it to a file."""
   cur = conn.cursor()
 
-  print('Loading FastText model...')
-  try:
-    ft = utils.load_ft(utils.get_embedder_path())
-  except Exception as ex:
-    print(ex)
-    sys.exit()
-
-  print("Fetching data...")
-  tokens = utils.query_tokens(cur)
-  pdb = utils.query_pdb(cur)
-  df = utils.balance_dataset(tokens, pdb)
-  
-  literals = df['literal']
-  labels = df['is_name']
-
-  print("Splitting datasets...")
-  x_train, _, y_train, _ = utils.split_dataset(literals, labels)
-  
-  print("Performing word embedding...")
-  x_train = pd.DataFrame(data=x_train, columns = ['literal'])
-  x_train = utils.ft_embed(ft, x_train)
-  x_train = utils.listify(x_train['lit_vec'].to_list())
-  y_train = tuple(y_train.to_list())
+  print("Loading features...")
+  x_train, _, y_train, _ = utils.load_features(cur)
 
   print("Scaling data...")
   scaler = StandardScaler()
@@ -1,10 +1,16 @@
-import sqlite3, sys, os, pandas as pd
+import sqlite3, sys, os, glob, shutil, numpy as np, pandas as pd
+from hashlib import blake2b
 from gensim.models import FastText
 from sklearn.model_selection import train_test_split
 
 _COLUMNS = ['literal', 'is_name']
 _TEST_SIZE_RATIO = 0.2
 """Desired percentage of test samples in the dataset. Needs to stay the same across all evaluated models."""
+_SPLIT_SEED = 0
+"""Random state of the deterministic dataset shuffles."""
+_HASH_CHUNK_SIZE = 1 << 20
+_FEATURE_ARRAYS = ['x_train', 'x_test', 'y_train', 'y_test']
+"""Arrays of a feature store entry, in `split_dataset` order."""
 
 class NameClassifierUtils:
   """Utility functions for function name classifiers."""
@@ -65,31 +71,109 @@ class NameClassifierUtils:
     nb_missing_pos = nb_neg - nb_pos
 
     # deterministic shuffle
-    balancing_pos, _ = train_test_split(pdb_df, train_size=nb_missing_pos, random_state=0)
+    balancing_pos, _ = train_test_split(pdb_df, train_size=nb_missing_pos, random_state=_SPLIT_SEED)
     return pd.concat([tokens_df, balancing_pos], ignore_index=True)
 
   @staticmethod
   def split_dataset(features: pd.DataFrame, labels: pd.DataFrame) -> tuple:
     """Parameterized wrapper for `sklearn.model_selection.train_test_split` for classifier training."""
     # Deterministic shuffle
-    x_train, x_test, y_train, y_test = train_test_split(features, labels, test_size=_TEST_SIZE_RATIO, random_state=0)
+    x_train, x_test, y_train, y_test = train_test_split(features, labels, test_size=_TEST_SIZE_RATIO, random_state=_SPLIT_SEED)
     return x_train, x_test, y_train, y_test
   
   @staticmethod
-  def ft_embed(ft: FastText, tokens: pd.DataFrame):
-    """Performs vectorization on token text data."""
-    tokens['lit_vec'] = ''
-    for idx in tokens.index:
-      tokens.at[idx, 'lit_vec'] = ft.wv[tokens.at[idx, 'literal']]
-    return tokens
+  def embed_literals(ft: FastText, literals: pd.Series) -> tuple:
+    """Returns a `float32` matrix with the vectors of unique literals and an index array mapping each literal to its row."""
+    # each distinct literal is looked up once, OOV n-gram hashing included
+    index, uniques = pd.factorize(literals)
+    matrix = np.empty((len(uniques), ft.wv.vector_size), dtype=np.float32)
+    if len(uniques) > 0:
+      matrix[:] = ft.wv[list(uniques)]
+    return matrix, index
 
   @staticmethod
-  def listify(lst: list) -> list[list]:
-    """Transforms `list[numpy.array]` into a `list[list[any]]`."""
-    result = []
-    for elem in lst:
-      result.append([elem.tolist()])
-    return result
+  def feature_matrix(ft: FastText, literals: pd.Series) -> np.ndarray:
+    """Returns a contiguous `float32` feature matrix with the embedded literal in each row."""
+    matrix, index = NameClassifierUtils.embed_literals(ft, literals)
+    return matrix[index]
+
+  @staticmethod
+  def build_features(cur: sqlite3.Cursor) -> tuple:
+    """Returns `(x_train, x_test, y_train, y_test)` feature matrices and labels of the balanced, split and embedded dataset."""
+    print('Loading FastText model...')
+    try:
+      ft = NameClassifierUtils.load_ft(NameClassifierUtils.get_embedder_path())
+    except Exception as ex:
+      print(ex)
+      sys.exit()
+
+    print("Fetching data...")
+    tokens = NameClassifierUtils.query_tokens(cur)
+    pdb = NameClassifierUtils.query_pdb(cur)
+    df = NameClassifierUtils.balance_dataset(tokens, pdb)
+
+    print("Splitting datasets...")
+    x_train, x_test, y_train, y_test = NameClassifierUtils.split_dataset(df['literal'], df['is_name'])
+
+    print("Performing word embedding...")
+    return (NameClassifierUtils.feature_matrix(ft, x_train), NameClassifierUtils.feature_matrix(ft, x_test),
+            y_train.to_numpy(dtype=np.int8), y_test.to_numpy(dtype=np.int8))
+
+  @staticmethod
+  def get_dataset_fingerprint(cur: sqlite3.Cursor) -> str:
+    """Returns the size and modification time of the dataset database file and its write-ahead log."""
+    _, _, db_path = cur.execute('PRAGMA database_list').fetchone()
+    parts = []
+    for path in (db_path, db_path + '-wal'):
+      if os.path.isfile(path):
+        stat = os.stat(path)
+        parts.append(f'{stat.st_size}:{stat.st_mtime_ns}')
+    return '/'.join(parts)
+
+  @staticmethod
+  def get_embedder_hash(path: str) -> str:
+    """Returns the content hash of FastText model file and its separately stored arrays."""
+    digest = blake2b(digest_size=16)
+    for file_path in sorted(glob.glob(glob.escape(path) + '*')):
+      with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b''):
+          digest.update(chunk)
+    return digest.hexdigest()
+
+  @staticmethod
+  def get_features_key(cur: sqlite3.Cursor) -> str:
+    """Returns the feature store key of the dataset, the embedder and the split parameters."""
+    digest = blake2b(digest_size=16)
+    digest.update(NameClassifierUtils.get_dataset_fingerprint(cur).encode())
+    digest.update(NameClassifierUtils.get_embedder_hash(NameClassifierUtils.get_embedder_path()).encode())
+    digest.update(f'{_TEST_SIZE_RATIO}:{_SPLIT_SEED}'.encode())
+    return f'names_{digest.hexdigest()}'
+
+  @staticmethod
+  def get_features_path(key: str) -> str:
+    """Returns the feature store directory of a key."""
+    models_path, _ = os.path.split(os.getcwd())
+    return os.path.join(models_path, 'features', key)
+
+  @staticmethod
+  def save_features(features: tuple, path: str):
+    """Saves `(x_train, x_test, y_train, y_test)` arrays to a feature store directory (or overwrites existing)."""
+    # written aside and renamed, interrupted runs leave no partial entries
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    os.makedirs(tmp_path, exist_ok=True)
+    for name, array in zip(_FEATURE_ARRAYS, features):
+      np.save(os.path.join(tmp_path, f'{name}.npy'), array)
+    if os.path.isdir(path):
+      shutil.rmtree(path)
+    os.replace(tmp_path, path)
+
+  @staticmethod
+  def load_features(cur: sqlite3.Cursor, rebuild: bool = False) -> tuple:
+    """Returns `(x_train, x_test, y_train, y_test)` memory-mapped from the feature store, building the entry on first use."""
+    path = NameClassifierUtils.get_features_path(NameClassifierUtils.get_features_key(cur))
+    if rebuild or not os.path.isdir(path):
+      NameClassifierUtils.save_features(NameClassifierUtils.build_features(cur), path)
+    return tuple(np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r') for name in _FEATURE_ARRAYS)
   
   @staticmethod
   def save_results(results: dict, table: str, dbpath: str):
@@ -0,0 +1,44 @@
+import sqlite3, sys, os, getopt
+from datetime import datetime
+from utils import PathsClassifierUtils as utils
+
+
+HELP = 'Usage:\npython features.py --dbpath="<database path>" [--rebuild]\n'
+
+def build_feature_store(conn: sqlite3.Connection, rebuild: bool):
+  """Materializes the split and embedded cross-reference path features of the dataset in the feature store."""
+  cur = conn.cursor()
+  start = datetime.now()
+
+  path = utils.get_features_path(utils.get_features_key(cur))
+  cached = not rebuild and os.path.isdir(path)
+  x_train, x_test, _, _ = utils.load_features(cur, rebuild)
+  print(f"Features {'up to date' if cached else 'saved'} at {path}")
+  print(f'Train/test samples:\t{x_train.shape[0]}/{x_test.shape[0]} ({x_train.shape[1]} features)')
+  print(f'Start time:\t{start}')
+  print(f'End time:\t{datetime.now()}')
+
+def main(argv):
+  db_path = ""
+  rebuild = False
+  opts, _ = getopt.getopt(argv,"hd:r",["dbpath=", "rebuild"])
+  for opt, arg in opts:
+    if opt == '-h':
+      print(HELP)
+      sys.exit()
+    elif opt in ("-d", "--dbpath"):
+      db_path = arg
+    elif opt in ("-r", "--rebuild"):
+      rebuild = True
+
+  if db_path == "":
+    raise Exception(f"SQLite database path required\n{HELP}")
+  if not os.path.isfile(db_path):
+    raise Exception(f"Database not found at {db_path}")
+
+  conn = sqlite3.connect(db_path)
+  build_feature_store(conn, rebuild)
+  conn.close()
+
+if __name__ == "__main__":
+  main(sys.argv[1:])
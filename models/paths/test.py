@@ -1,4 +1,4 @@
-import sqlite3, sys, os, getopt, pandas as pd
+import sqlite3, sys, os, getopt
 from datetime import datetime
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import confusion_matrix
@@ -7,35 +7,14 @@ from utils import PathsClassifierUtils as utils
 
 
 HELP = 'Usage:\npython test.py --dbpath="<dataset db path>" --results"<results db path>" --model="<model filename>"\n'
-COLUMNS = ['ref_depth',
-           'is_upward',
-           'nb_referrers',
-           'nb_strings',
-           'nb_referees',
-           'instructions',
-           'lit_vec']
-"""Testing data features."""
 
 def test_model(conn: sqlite3.Connection, results_path: str, model: str):
   """Tests cross-reference path classifier model of choice and saves the results."""
   cur = conn.cursor()
   start = datetime.now()
 
-  print('Loading FastText model...')
-  try:
-    ft = utils.load_ft(utils.get_embedder_path())
-  except Exception as ex:
-    print(ex)
-    sys.exit()
-
-  print("Fetching data...")
-  data = utils.get_unbalanced_data(cur)
-  labels = data['names_func']
-  data.drop(['names_func'], axis=1, inplace=True)
-
-  print("Performing word embedding...")
-  data = utils.ft_embed(ft, data)
-  data.drop(['token_literal'], axis=1, inplace=True)
+  print("Loading features...")
+  _, X_test, _, y_test = utils.load_features(cur)
 
   print('Loading classifier model...')
   file_path = utils.get_model_path(model)
@@ -45,12 +24,6 @@ def test_model(conn: sqlite3.Connection, results_path: str, model: str):
     print(ex)
     sys.exit()
 
-  print(f"Splitting dataset...")
-  _, x_test, _, y_test = utils.split_dataset(data, labels)
-  x_test = pd.DataFrame(data=x_test, columns=COLUMNS)
-  X_test = utils.listify(x_test)
-  y_test = tuple(y_test.to_list())
-
   print(f"Scaling data...")
   scaler = StandardScaler()
   scaler.fit(X_test)
@@ -1,4 +1,4 @@
-import sqlite3, sys, os, getopt, pandas as pd
+import sqlite3, sys, os, getopt
 from datetime import datetime
 from sklearn.naive_bayes import GaussianNB
 from sklearn.preprocessing import StandardScaler
@@ -9,45 +9,18 @@ from utils import PathsClassifierUtils as utils
 
 HELP = 'Usage:\npython train_gnbayes.py --dbpath="<database path>"\n'
 MODEL_FILE = 'paths_gnbayes.joblib'
-COLUMNS = ['ref_depth',
-           'is_upward',
-           'nb_referrers',
-           'nb_strings',
-           'nb_referees',
-           'instructions',
-           'lit_vec']
-"""Training data features."""
 
 def train_naive_bayes(conn: sqlite3.Connection):
   """Trains cross-reference path Gaussian Naive Bayes classifier (scikit-learn) and saves it to a file."""
   cur = conn.cursor()
   start = datetime.now()
 
-  print('Loading FastText model...')
-  try:
-    ft = utils.load_ft(utils.get_embedder_path())
-  except Exception as ex:
-    print(ex)
-    sys.exit()
-
-  print("Fetching data...")
-  data = utils.get_unbalanced_data(cur)
-  labels = data['names_func']
-  data.drop(['names_func'], axis=1, inplace=True)
-  
-  print("Performing word embedding...")
-  data = utils.ft_embed(ft, data)
-  data.drop(['token_literal'], axis=1, inplace=True)
+  print("Loading features...")
+  x_train, _, y_train, _ = utils.load_features(cur)
 
   print('Initializing classifier model...')
   gnb = GaussianNB()
 
-  print("Splitting datasets...")
-  x_train, _, y_train, _ = utils.split_dataset(data, labels)
-  x_train = pd.DataFrame(data=x_train, columns=COLUMNS)
-  x_train = utils.listify(x_train)
-  y_train = tuple(y_train.to_list())
-
   print("Scaling data...")
   scaler = StandardScaler()
   scaler.fit(x_train)
@@ -1,4 +1,4 @@
-import sqlite3, sys, os, getopt, pandas as pd
+import sqlite3, sys, os, getopt
 from datetime import datetime
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.preprocessing import StandardScaler
@@ -9,46 +9,19 @@ from utils import PathsClassifierUtils as utils
 
 HELP = 'Usage:\npython train_knn.py --dbpath="<database path> --k=<k neighbors parameter>"\n'
 MODEL_FILE = 'paths_@knn.joblib'
-COLUMNS = ['ref_depth',
-           'is_upward',
-           'nb_referrers',
-           'nb_strings',
-           'nb_referees',
-           'instructions',
-           'lit_vec']
-"""Training data features."""
 
 def train_nearest_neighbours(conn: sqlite3.Connection, k: int):
   """Trains cross-reference path k-Nearest Neighbors classifier (scikit-learn) and saves it to a file."""
   cur = conn.cursor()
   start = datetime.now()
 
-  print('Loading FastText model...')
-  try:
-    ft = utils.load_ft(utils.get_embedder_path())
-  except Exception as ex:
-    print(ex)
-    sys.exit()
-
-  print("Fetching data...")
-  data = utils.get_unbalanced_data(cur)
-  labels = data['names_func']
-  data.drop(['names_func'], axis=1, inplace=True)
-  
-  print("Performing word embedding...")
-  data = utils.ft_embed(ft, data)
-  data.drop(['token_literal'], axis=1, inplace=True)
+  print("Loading features...")
+  x_train, _, y_train, _ = utils.load_features(cur)
 
   print('Initializing classifier model...')
   # 5 neighbors is the default
   knn = KNeighborsClassifier(n_neighbors=k)
 
-  print("Splitting datasets...")
-  x_train, _, y_train, _ = utils.split_dataset(data, labels)
-  x_train = pd.DataFrame(data=x_train, columns=COLUMNS)
-  x_train = utils.listify(x_train)
-  y_train = tuple(y_train.to_list())
-
   print("Scaling data...")
   scaler = StandardScaler()
   scaler.fit(x_train)
@@ -1,4 +1,4 @@
-import sqlite3, sys, os, getopt, pandas as pd
+import sqlite3, sys, os, getopt
 from datetime import datetime
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
@@ -9,47 +9,20 @@ from utils import PathsClassifierUtils as utils
 
 HELP = 'Usage:\npython train_logreg.py --dbpath="<database path>"\n'
 MODEL_FILE = 'paths_logreg.joblib'
-COLUMNS = ['ref_depth',
-           'is_upward',
-           'nb_referrers',
-           'nb_strings',
-           'nb_referees',
-           'instructions',
-           'lit_vec']
-"""Training data features."""
 
 def train_logistic_regression(conn: sqlite3.Connection):
   """Trains cross-reference path Logistic Regression classifier (scikit-learn) and saves it to a file."""
   cur = conn.cursor()
   start = datetime.now()
 
-  print('Loading FastText model...')
-  try:
-    ft = utils.load_ft(utils.get_embedder_path())
-  except Exception as ex:
-    print(ex)
-    sys.exit()
-
-  print("Fetching data...")
-  data = utils.get_unbalanced_data(cur)
-  labels = data['names_func']
-  data.drop(['names_func'], axis=1, inplace=True)
-  
-  print("Performing word embedding...")
-  data = utils.ft_embed(ft, data)
-  data.drop(['token_literal'], axis=1, inplace=True)
+  print("Loading features...")
+  x_train, _, y_train, _ = utils.load_features(cur)
 
   print('Initializing classifier model...')
   # max_iter doubled due to training warnings:
   # ConvergenceWarning: lbfgs failed to converge
   lr = LogisticRegression(max_iter=200, random_state=0)
 
-  print("Splitting datasets...")
-  x_train, _, y_train, _ = utils.split_dataset(data, labels)
-  x_train = pd.DataFrame(data=x_train, columns=COLUMNS)
-  x_train = utils.listify(x_train)
-  y_train = tuple(y_train.to_list())
-
   print("Scaling data...")
   scaler = StandardScaler()
   scaler.fit(x_train)
@@ -0,0 +1,154 @@
+import sqlite3, sys, os, getopt, csv, time
+from datetime import datetime
+from sklearn.base import clone
+from sklearn.ensemble import AdaBoostClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import StratifiedKFold
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.svm import LinearSVC
+from sklearn.tree import DecisionTreeClassifier
+from joblib import Parallel, delayed, dump
+from utils import PathsClassifierUtils as utils
+
+
+HELP = 'Usage:\npython train_zoo.py --dbpath="<database path>" [--models=<comma-separated classifiers>] [--k=<comma-separated k neighbors parameters>] [--jobs=<nb of processes>]\n'
+MODEL_FILE = 'paths_@.joblib'
+TABLE_FILE = 'paths_zoo.csv'
+SCORING = 'f1'
+FOLDS = 5
+CLASSIFIERS = {
+  # defaults to 50 estimators
+  'adaboost': AdaBoostClassifier(n_estimators=50, random_state=0),
+  'dtree': DecisionTreeClassifier(random_state=0),
+  'gnbayes': GaussianNB(),
+  # max_iter doubled due to training warnings:
+  # ConvergenceWarning: lbfgs failed to converge
+  'logreg': LogisticRegression(max_iter=200, random_state=0),
+  'lsvc': LinearSVC(dual='auto', random_state=0),
+  'nn': MLPClassifier(solver='adam', max_iter=200, random_state=0),
+  'rforest': RandomForestClassifier(random_state=0)
+  }
+"""Classifiers of the `train_<classifier>.py` scripts (k-Nearest Neighbors is added per `k` parameter)."""
+
+def get_zoo(names: list, ks: list) -> dict:
+  """Returns the model names and unfitted estimators to train."""
+  zoo = {}
+  for name in names:
+    if name == 'knn':
+      for k in ks:
+        zoo[f'{k}knn'] = KNeighborsClassifier(n_neighbors=k)
+    else:
+      zoo[name] = CLASSIFIERS[name]
+  return zoo
+
+def fit_task(name: str, estimator, x, y, fold: int, train_idx, test_idx) -> tuple:
+  """Fits a fresh copy of the estimator and returns `(name, fold, score, seconds)`.
+
+  Folds are scored on their held-out rows, the final fit (no fold) on all rows is saved to the model file instead."""
+  start = time.perf_counter()
+  estimator = clone(estimator)
+  if fold is None:
+    estimator.fit(X=x, y=y)
+    dump(estimator, utils.get_model_path(MODEL_FILE.replace('@', name)))
+    score = None
+  else:
+    estimator.fit(X=x[train_idx], y=y[train_idx])
+    score = get_scorer(SCORING)(estimator, x[test_idx], y[test_idx])
+  return name, fold, score, time.perf_counter() - start
+
+def train_zoo(conn: sqlite3.Connection, names: list, ks: list, jobs: int):
+  """Trains cross-reference path classifiers in a process pool, cross-validation folds and final fits alike, and saves the models and a score table."""
+  cur = conn.cursor()
+  start = datetime.now()
+
+  print("Loading features...")
+  # memory-mapped arrays are shared with the workers by file name, not copied
+  x_train, _, y_train, _ = utils.load_features(cur)
+  zoo = get_zoo(names, ks)
+
+  # the folds of `cross_val_score` for classifiers
+  folds = list(StratifiedKFold(n_splits=FOLDS).split(x_train, y_train))
+  tasks = []
+  for name, estimator in zoo.items():
+    tasks.append(delayed(fit_task)(name, estimator, x_train, y_train, None, None, None))
+    for fold, (train_idx, test_idx) in enumerate(folds):
+      tasks.append(delayed(fit_task)(name, estimator, x_train, y_train, fold, train_idx, test_idx))
+
+  print(f"Training {len(zoo)} classifiers with {FOLDS}-fold cross-validation ({len(tasks)} fits, {jobs} processes)...")
+  wall = time.perf_counter()
+  # features are used unscaled, as in `train_<classifier>.py`
+  results = Parallel(n_jobs=jobs)(tasks)
+  wall = time.perf_counter() - wall
+
+  rows = []
+  for name in zoo:
+    scores = [score for model, fold, score, _ in results if model == name and fold is not None]
+    fold_times = [seconds for model, fold, _, seconds in results if model == name and fold is not None]
+    fit_time = next(seconds for model, fold, _, seconds in results if model == name and fold is None)
+    mean = sum(scores) / len(scores)
+    std = (sum((score - mean) ** 2 for score in scores) / len(scores)) ** 0.5
+    rows.append((name, round(mean, 3), round(std, 3), round(max(fold_times), 3), round(fit_time, 3), round(sum(fold_times) + fit_time, 3)))
+
+  header = ('model', SCORING, 'std_dev', 'max_fold_time', 'fit_time', 'total_fit_time')
+  print('\t'.join(header))
+  for row in rows:
+    print('\t'.join(str(value) for value in row))
+  print(f"Wall time: {wall:.3f}s (sum of fits: {sum(row[-1] for row in rows):.3f}s)")
+
+  file_path = utils.get_model_path(TABLE_FILE)
+  with open(file_path, 'w', newline='') as file:
+    writer = csv.writer(file)
+    writer.writerow(header)
+    writer.writerows(rows)
+  print(f'Models and score table saved to {os.path.dirname(file_path)}')
+  print(f'Start time:\t{start}')
+  print(f'End time:\t{datetime.now()}')
+
+def main(argv):
+  db_path = ""
+  names = list(CLASSIFIERS) + ['knn']
+  ks = [5]
+  jobs = os.cpu_count()
+  opts, _ = getopt.getopt(argv,"hd:m:k:j:",["dbpath=", "models=", "k=", "jobs="])
+  for opt, arg in opts:
+    if opt == '-h':
+      print(HELP)
+      sys.exit()
+    elif opt in ("-d", "--dbpath"):
+      db_path = arg
+    elif opt in ("-m", "--models"):
+      names = arg.split(',')
+    elif opt in ("-k", "--k"):
+      try:
+        ks = [int(k) for k in arg.split(',')]
+      except Exception as ex:
+        print("Invalid k parameter supplied")
+        sys.exit()
+    elif opt in ("-j", "--jobs"):
+      try:
+        jobs = int(arg)
+      except Exception as ex:
+        print("Invalid jobs parameter supplied")
+        sys.exit()
+
+  if db_path == "":
+    raise Exception(f"SQLite database path required\n{HELP}")
+  if not os.path.isfile(db_path):
+    raise Exception(f"Database not found at {db_path}")
+  for name in names:
+    if name != 'knn' and name not in CLASSIFIERS:
+      raise Exception(f"Unknown classifier {name}, expected one of: {', '.join(list(CLASSIFIERS) + ['knn'])}")
+  if any(k < 1 or k > 10 for k in ks):
+    raise Exception("The allowed range for k parameter is [1,10]")
+  if jobs < 1:
+    raise Exception("At least 1 process required for jobs parameter")
+
+  conn = sqlite3.connect(db_path)
+  train_zoo(conn, names, ks, jobs)
+  conn.close()
+
+if __name__ == "__main__":
+  main(sys.argv[1:])
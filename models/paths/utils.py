@@ -1,4 +1,5 @@
-import sqlite3, sys, os, pandas as pd
+import sqlite3, sys, os, glob, shutil, numpy as np, pandas as pd
+from hashlib import blake2b
 from gensim.models import FastText
 from sklearn.model_selection import train_test_split
 
@@ -14,6 +15,20 @@ _COLUMNS = [
   ]
 _TEST_SIZE_RATIO = 0.2
 """Desired percentage of test samples in the dataset. Needs to stay the same across all evaluated models."""
+_FEATURE_COLUMNS = [
+  'ref_depth',
+  'is_upward',
+  'nb_referrers',
+  'nb_strings',
+  'nb_referees',
+  'instructions'
+  ]
+"""Structural features of token paths, followed by the embedded token literal."""
+_SPLIT_SEED = 0
+"""Random state of the deterministic dataset shuffles."""
+_HASH_CHUNK_SIZE = 1 << 20
+_FEATURE_ARRAYS = ['x_train', 'x_test', 'y_train', 'y_test']
+"""Arrays of a feature store entry, in `split_dataset` order."""
 
 class PathsClassifierUtils:
   """Utility functions for cross-reference paths classifiers."""
@@ -40,59 +55,36 @@ class PathsClassifierUtils:
 
     print("Structuring data...")
     # deterministic shuffle
-    tpaths_neg, _ = train_test_split(tpaths_neg_all, train_size=len(tpaths_pos), random_state=0)
+    tpaths_neg, _ = train_test_split(tpaths_neg_all, train_size=len(tpaths_pos), random_state=_SPLIT_SEED)
     tpaths = tpaths_pos + tpaths_neg
-    df = pd.DataFrame(data=tpaths, columns=_COLUMNS)
-    df['ref_depth'] = ''
-    df['is_upward'] = ''
-    df['nb_referrers'] = ''
-    df['nb_strings'] = ''
-    df['nb_referees'] = ''
-    df['instructions'] = ''
-    df['lit_vec'] = ''
 
-    binary = str('')
-    local_path_id = int(-1)
-    func_addr = int(-1)
-
-    cnt = 1
-    for idx in df.index:
-      binary = str(df.at[idx, 'binary'])
-      local_path_id = int(df.at[idx, 'local_path_id'])
-      func_addr = int(df.at[idx, 'func_addr'])
-
-      path = None
-      for p in paths:
-        if p[0] == binary and p[1] == local_path_id:
-          path = p
-          break
-      
+    # hash join, the first row of duplicate keys wins
+    path_features = {}
+    for binary, local_id, ref_depth, is_upward in paths:
+      path_features.setdefault((binary, local_id), (ref_depth, is_upward))
+    func_features = {}
+    for binary, func_addr, nb_referrers, nb_strings, nb_referees, instructions in func_data:
+      func_features.setdefault((binary, func_addr), (nb_referrers, nb_strings, nb_referees, instructions))
+
+    data = []
+    for cnt, (binary, local_path_id, func_addr, token_literal, names_func) in enumerate(tpaths, 1):
+      path = path_features.get((binary, local_path_id))
       if path is None:
         # in case of this error run `/scripts/tpaths_cleanse.py` on the dataset
         print(f"DataError: Path {local_path_id} of {binary} not found at iter {cnt}")
         sys.exit()
 
-      fdata = None
-      for f in func_data:
-        if f[0] == binary and f[1] == func_addr:
-          fdata = f
-          break
-      
+      fdata = func_features.get((binary, func_addr))
       if fdata is None:
         # in case of this error export function data from the IDB(s) again
         print(f"DataError: Function {hex(func_addr)} of {binary} not found at iter {cnt}")
         sys.exit()
 
-      df.at[idx, 'ref_depth'] = path[2]
-      df.at[idx, 'is_upward'] = path[3]
-      df.at[idx, 'nb_referrers'] = fdata[2]
-      df.at[idx, 'nb_strings'] = fdata[3]
-      df.at[idx, 'nb_referees'] = fdata[4]
-      df.at[idx, 'instructions'] = fdata[5]
-      cnt += 1
-    
-    # delete non-feature columns
-    return df.drop(['binary', 'local_path_id', 'func_addr'], axis=1)
+      data.append((token_literal, names_func) + path + fdata)
+
+    df = pd.DataFrame(data=data, columns=_COLUMNS)
+    df['lit_vec'] = ''
+    return df
 
   @staticmethod
   def get_unbalanced_data(cur: sqlite3.Cursor) -> pd.DataFrame:
@@ -141,24 +133,103 @@ class PathsClassifierUtils:
   def split_dataset(features: pd.DataFrame, labels: pd.DataFrame) -> tuple:
     """Wrapper for `sklearn.model_selection.train_test_split` for classifier training and testing."""
     # Deterministic shuffle
-    x_train, x_test, y_train, y_test = train_test_split(features, labels, test_size=_TEST_SIZE_RATIO, random_state=0)
+    x_train, x_test, y_train, y_test = train_test_split(features, labels, test_size=_TEST_SIZE_RATIO, random_state=_SPLIT_SEED)
     return x_train, x_test, y_train, y_test
   
   @staticmethod
-  def ft_embed(ft: FastText, df: pd.DataFrame):
-    """Performs vectorization on token text data."""
-    df['lit_vec'] = ''
-    for idx in df.index:
-      df.at[idx, 'lit_vec'] = ft.wv[df.at[idx, 'token_literal']]
-    return df
+  def embed_literals(ft: FastText, literals: pd.Series) -> tuple:
+    """Returns a `float32` matrix with the vectors of unique literals and an index array mapping each literal to its row."""
+    # each distinct literal is looked up once, OOV n-gram hashing included
+    index, uniques = pd.factorize(literals)
+    matrix = np.empty((len(uniques), ft.wv.vector_size), dtype=np.float32)
+    if len(uniques) > 0:
+      matrix[:] = ft.wv[list(uniques)]
+    return matrix, index
+
+  @staticmethod
+  def feature_matrix(ft: FastText, df: pd.DataFrame, columns: list) -> np.ndarray:
+    """Returns a contiguous `float32` feature matrix with the given structural columns followed by the embedded token literal."""
+    matrix, index = PathsClassifierUtils.embed_literals(ft, df['token_literal'])
+    features = np.empty((len(df), len(columns) + matrix.shape[1]), dtype=np.float32)
+    features[:, :len(columns)] = df[columns].to_numpy(dtype=np.float32)
+    features[:, len(columns):] = matrix[index]
+    return features
+
+  @staticmethod
+  def build_features(cur: sqlite3.Cursor) -> tuple:
+    """Returns `(x_train, x_test, y_train, y_test)` feature matrices and labels of the embedded and split token paths."""
+    print('Loading FastText model...')
+    try:
+      ft = PathsClassifierUtils.load_ft(PathsClassifierUtils.get_embedder_path())
+    except Exception as ex:
+      print(ex)
+      sys.exit()
+
+    print("Fetching data...")
+    data = PathsClassifierUtils.get_unbalanced_data(cur)
+    labels = data['names_func'].to_numpy(dtype=np.int8)
+
+    print("Performing word embedding...")
+    features = PathsClassifierUtils.feature_matrix(ft, data, _FEATURE_COLUMNS)
+
+    print("Splitting datasets...")
+    return PathsClassifierUtils.split_dataset(features, labels)
+
+  @staticmethod
+  def get_dataset_fingerprint(cur: sqlite3.Cursor) -> str:
+    """Returns the size and modification time of the dataset database file and its write-ahead log."""
+    _, _, db_path = cur.execute('PRAGMA database_list').fetchone()
+    parts = []
+    for path in (db_path, db_path + '-wal'):
+      if os.path.isfile(path):
+        stat = os.stat(path)
+        parts.append(f'{stat.st_size}:{stat.st_mtime_ns}')
+    return '/'.join(parts)
+
+  @staticmethod
+  def get_embedder_hash(path: str) -> str:
+    """Returns the content hash of FastText model file and its separately stored arrays."""
+    digest = blake2b(digest_size=16)
+    for file_path in sorted(glob.glob(glob.escape(path) + '*')):
+      with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b''):
+          digest.update(chunk)
+    return digest.hexdigest()
+
+  @staticmethod
+  def get_features_key(cur: sqlite3.Cursor) -> str:
+    """Returns the feature store key of the dataset, the embedder and the split parameters."""
+    digest = blake2b(digest_size=16)
+    digest.update(PathsClassifierUtils.get_dataset_fingerprint(cur).encode())
+    digest.update(PathsClassifierUtils.get_embedder_hash(PathsClassifierUtils.get_embedder_path()).encode())
+    digest.update(f'{_TEST_SIZE_RATIO}:{_SPLIT_SEED}:{_FEATURE_COLUMNS}'.encode())
+    return f'paths_{digest.hexdigest()}'
+
+  @staticmethod
+  def get_features_path(key: str) -> str:
+    """Returns the feature store directory of a key."""
+    models_path, _ = os.path.split(os.getcwd())
+    return os.path.join(models_path, 'features', key)
+
+  @staticmethod
+  def save_features(features: tuple, path: str):
+    """Saves `(x_train, x_test, y_train, y_test)` arrays to a feature store directory (or overwrites existing)."""
+    # written aside and renamed, interrupted runs leave no partial entries
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    os.makedirs(tmp_path, exist_ok=True)
+    for name, array in zip(_FEATURE_ARRAYS, features):
+      np.save(os.path.join(tmp_path, f'{name}.npy'), array)
+    if os.path.isdir(path):
+      shutil.rmtree(path)
+    os.replace(tmp_path, path)
 
   @staticmethod
-  def listify(df: pd.DataFrame) -> list:
-    """Transforms the vectorized token literal from `numpy.array` into a single-element list, then converts `pd.DataFrame` to list."""
-    for idx in df.index:
-      df.at[idx, 'lit_vec'] = df.at[idx, 'lit_vec'].tolist()
-    
-    return df.values.tolist()
+  def load_features(cur: sqlite3.Cursor, rebuild: bool = False) -> tuple:
+    """Returns `(x_train, x_test, y_train, y_test)` memory-mapped from the feature store, building the entry on first use."""
+    path = PathsClassifierUtils.get_features_path(PathsClassifierUtils.get_features_key(cur))
+    if rebuild or not os.path.isdir(path):
+      PathsClassifierUtils.save_features(PathsClassifierUtils.build_features(cur), path)
+    return tuple(np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r') for name in _FEATURE_ARRAYS)
   
   @staticmethod
   def save_results(results: dict, table: str, dbpath: str):
@@ -0,0 +1,87 @@
+import os, sys, getopt, time, tracemalloc
+import sqlite3, pandas as pd
+from test_pipeline import PATHS_COLUMNS
+from utils import PipelineUtils as utils
+
+
+HELP = 'Usage:\npython bench_features.py --dbpath="<dataset path>" [--embedder="<FastText model path>"]\n'
+
+def legacy_features(ft, df: pd.DataFrame) -> tuple:
+  """Returns names and paths features built the way the former `ft_embed` and `listify_*` helpers did (one array and list per row)."""
+  # object column, as `''` infers a string dtype on recent pandas
+  df['lit_vec'] = pd.Series('', index=df.index, dtype=object)
+  for idx in df.index:
+    df.at[idx, 'lit_vec'] = ft.wv[df.at[idx, 'token_literal']]
+  names = [[vec.tolist()] for vec in df['lit_vec'].to_list()]
+  paths = df[PATHS_COLUMNS + ['lit_vec']]
+  for idx in paths.index:
+    paths.at[idx, 'lit_vec'] = paths.at[idx, 'lit_vec'].tolist()
+  return names, paths.values.tolist()
+
+def dense_features(ft, df: pd.DataFrame) -> tuple:
+  """Returns names and paths feature matrices built by `embed_literals` and `feature_matrix`."""
+  matrix, index = utils.embed_literals(ft, df['token_literal'])
+  return utils.feature_matrix(df, [], matrix, index), utils.feature_matrix(df, PATHS_COLUMNS, matrix, index)
+
+def measure(build, ft, data: pd.DataFrame) -> tuple:
+  """Returns the wall-clock time and the peak traced memory of a feature builder, measured in separate runs."""
+  df = data.copy()
+  start = time.perf_counter()
+  build(ft, df)
+  elapsed = time.perf_counter() - start
+
+  df = data.copy()
+  tracemalloc.start()
+  features = build(ft, df)
+  _, peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  del features
+  return elapsed, peak
+
+def run_benchmark(ft, data: pd.DataFrame):
+  """Prints the timings and peak memory of the legacy and dense feature builders."""
+  print(f"rows:\t\t{len(data)} ({data['token_literal'].nunique()} unique literals)")
+  results = []
+  for name, build in (("legacy", legacy_features), ("dense", dense_features)):
+    elapsed, peak = measure(build, ft, data)
+    results.append((elapsed, peak))
+    print(f"{name}:\t\t{elapsed:.3f}s\t{peak / 2**20:.1f} MiB peak")
+  (legacy_time, legacy_peak), (dense_time, dense_peak) = results
+  print(f"speedup:\t{legacy_time / dense_time:.1f}x")
+  print(f"memory:\t\t{legacy_peak / dense_peak:.1f}x less")
+
+def main(argv):
+  db_path = ""
+  embedder_path = ""
+  opts, _ = getopt.getopt(argv,"hde:",["dbpath=", "embedder="])
+  for opt, arg in opts:
+    if opt == '-h':
+      print(HELP)
+      sys.exit()
+    elif opt in ("-d", "--dbpath"):
+      db_path = arg
+    elif opt in ("-e", "--embedder"):
+      embedder_path = arg
+
+  if db_path == "":
+    raise Exception(f"Dataset SQLite database path required\n{HELP}")
+  if not os.path.isfile(db_path):
+    raise Exception(f"Dataset database not found at {db_path}")
+  if embedder_path == "":
+    embedder_path = utils.get_embedder_path()
+
+  print('Loading FastText model...')
+  try:
+    ft = utils.load_ft(embedder_path)
+  except Exception as ex:
+    print(ex)
+    sys.exit()
+
+  conn = sqlite3.connect(db_path)
+  print("Fetching data...")
+  data = utils.query_data(conn.cursor())
+  conn.close()
+  run_benchmark(ft, data)
+
+if __name__ == "__main__":
+  main(sys.argv[1:])
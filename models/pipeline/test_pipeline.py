@@ -7,6 +7,13 @@ from utils import PipelineUtils as utils
 
 
 HELP = 'Usage:\npython test_pipeline.py --dbpath="<dataset path>" --results="<results db path>" --names="<names classifier model file> --paths="<paths classifier model file>"\n'
+PATHS_COLUMNS = ['ref_depth',
+                 'is_upward',
+                 'nb_referrers',
+                 'nb_strings',
+                 'nb_referees',
+                 'instructions']
+"""Structural features of the paths classifier, followed by the embedded token literal."""
 
 def test_pipeline(conn: sqlite3.Connection, results_path: str, names_model_file: str, paths_model_file: str):
   """Simulates a plugin scenario and evaluates common predictions of both classifiers."""
@@ -22,10 +29,10 @@ def test_pipeline(conn: sqlite3.Connection, results_path: str, names_model_file:
 
   print("Fetching data...")
   data = utils.query_data(cur)
-  data['lit_vec'] = ''
   
   print("Performing word embedding...")
-  data = utils.ft_embed(ft, data)
+  # shared by the feature matrices of both classifiers
+  matrix, index = utils.embed_literals(ft, data['token_literal'])
   data.drop(['token_literal'], axis=1, inplace=True)
     
   print('Loading classifier models...')
@@ -36,7 +43,7 @@ def test_pipeline(conn: sqlite3.Connection, results_path: str, names_model_file:
     print(ex)
     sys.exit()
 
-  names = utils.listify_names(data['lit_vec'].to_list())
+  names = utils.feature_matrix(data, [], matrix, index)
   print("Scaling names data...")
   scaler = StandardScaler()
   scaler.fit(names)
@@ -45,16 +52,7 @@ def test_pipeline(conn: sqlite3.Connection, results_path: str, names_model_file:
   print("Predicting names...")
   data['name_pred'] = names_clf.predict(X=names)
 
-  # rearrange columns
-  paths = data.drop(['binary', 'func_addr', 'names_func', 'name_pred'], axis=1)
-  paths = paths[['ref_depth',
-           'is_upward',
-           'nb_referrers',
-           'nb_strings',
-           'nb_referees',
-           'instructions',
-           'lit_vec']]
-  paths = utils.listify_paths(paths)
+  paths = utils.feature_matrix(data, PATHS_COLUMNS, matrix, index)
 
   print(f"Scaling paths...")
   scaler = StandardScaler()
@@ -80,8 +78,8 @@ def test_pipeline(conn: sqlite3.Connection, results_path: str, names_model_file:
   for func in funcs:
     for tpath in func:
       truth = tpath[4]
-      names_pred = tpath[10]
-      paths_pred = tpath[11]
+      names_pred = tpath[9]
+      paths_pred = tpath[10]
       if truth == 0 and names_pred == 0:
         tn += 1
       if truth == 1 and names_pred == 0:
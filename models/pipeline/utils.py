@@ -1,4 +1,4 @@
-import sqlite3, sys, os, pandas as pd
+import sqlite3, sys, os, numpy as np, pandas as pd
 from gensim.models import FastText
 from sklearn.model_selection import train_test_split
 
@@ -107,28 +107,23 @@ class PipelineUtils:
     return FastText.load(path)
   
   @staticmethod
-  def ft_embed(ft: FastText, df: pd.DataFrame):
-    """Performs vectorization on token text data."""
-    df['lit_vec'] = ''
-    for idx in df.index:
-      df.at[idx, 'lit_vec'] = ft.wv[df.at[idx, 'token_literal']]
-    return df
-  
-  @staticmethod
-  def listify_paths(df: pd.DataFrame) -> list:
-    """Transforms the vectorized token literal from `numpy.array` into a single-element list, then converts `pd.DataFrame` to list."""
-    for idx in df.index:
-      df.at[idx, 'lit_vec'] = df.at[idx, 'lit_vec'].tolist()
-    
-    return df.values.tolist()
-  
+  def embed_literals(ft: FastText, literals: pd.Series) -> tuple:
+    """Returns a `float32` matrix with the vectors of unique literals and an index array mapping each literal to its row."""
+    # each distinct literal is looked up once, OOV n-gram hashing included
+    index, uniques = pd.factorize(literals)
+    matrix = np.empty((len(uniques), ft.wv.vector_size), dtype=np.float32)
+    if len(uniques) > 0:
+      matrix[:] = ft.wv[list(uniques)]
+    return matrix, index
+
   @staticmethod
-  def listify_names(lst: list) -> list[list]:
-    """Transforms `list[numpy.array]` into a `list[list[any]]`."""
-    result = []
-    for elem in lst:
-      result.append([elem.tolist()])
-    return result
+  def feature_matrix(df: pd.DataFrame, columns: list, matrix: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """Returns a contiguous `float32` feature matrix with the given structural columns followed by the embedded token literal
+    (`matrix` and `index` from `embed_literals`, no columns for the names classifier)."""
+    features = np.empty((len(df), len(columns) + matrix.shape[1]), dtype=np.float32)
+    features[:, :len(columns)] = df[columns].to_numpy(dtype=np.float32)
+    features[:, len(columns):] = matrix[index]
+    return features
 
   @staticmethod
   def group_in_funcs(df: pd.DataFrame) -> dict:
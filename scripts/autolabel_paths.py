@@ -1,7 +1,9 @@
 import os, sys, getopt
 import sqlite3
 from datetime import datetime
-from utils.db import DbException
+from utils.db import DbException, execute_chunked, iter_rows
+from utils.schema import ensure_indexes
+from utils.search import AhoCorasick
 
 
 HELP = 'Usage:\npython autolabel_paths.py --dbpath=<database path>\n'
@@ -14,49 +16,40 @@ def autolabel(conn: sqlite3.Connection):
   c = conn.cursor()
 
   try:
-    c.execute("SELECT * FROM tokens WHERE is_name = 1")
+    c.execute("SELECT string_addr, literal FROM tokens WHERE is_name = 1 AND literal IS NOT NULL")
   # 'no such table: tokens'
   except sqlite3.OperationalError as ex:
     print(ex)
     sys.exit()
 
   tokens = c.fetchall()
-  tkn_cnt = 0
+  # case-insensitive for ASCII letters like `LIKE '%<token>%'`
+  automaton = AhoCorasick((token[1] for token in tokens), ignore_case=True)
+  print(f"Searching {len(tokens)} positive tokens in pdb functions")
 
-  # for every positive token
-  for token in tokens:
-    tkn_cnt += 1
-    string_addr = token[0]
-    token_literal = token[1]
-    print(f"{tkn_cnt} - {token_literal}")
-    try:
-      c.execute(f"SELECT * FROM pdb WHERE literal LIKE '%{token_literal}%'")
-    # 'no such table: pdb'
-    except sqlite3.OperationalError as ex:
-      print(ex)
-      sys.exit()
-    funcs = c.fetchall()
-    
-    # for every function including the token
-    for func in funcs:
-      func_addr = func[0]
-      try:
-        c.execute("SELECT * FROM paths WHERE func_addr = ? AND string_addr = ?", (func_addr, string_addr))
-      # 'no such table: paths'
-      except sqlite3.OperationalError as ex:
-        print(ex)
-        sys.exit()
-      paths = c.fetchall()
+  try:
+    c.execute("SELECT func_addr, literal FROM pdb WHERE literal IS NOT NULL")
+  # 'no such table: pdb'
+  except sqlite3.OperationalError as ex:
+    print(ex)
+    sys.exit()
 
-      # label found paths positive
-      for path in paths:
-        try:
-          c.execute("UPDATE paths SET to_name = 1 WHERE id = ?", (path[0],))
-        # 'no such table: paths'
-        except sqlite3.OperationalError as ex:
-          print(ex)
-          sys.exit()
+  # (func_addr, string_addr) of every function including a token
+  func_strings = {}
+  for func_addr, literal in iter_rows(c):
+    for idx in automaton.find(literal):
+      func_strings[(func_addr, tokens[idx][0])] = None
+
+  # label found paths positive
+  changes = conn.total_changes
+  try:
+    execute_chunked(c, "UPDATE paths SET to_name = 1 WHERE func_addr = ? AND string_addr = ?", func_strings)
+  # 'no such table: paths'
+  except sqlite3.OperationalError as ex:
+    print(ex)
+    sys.exit()
 
+  print(f"Labelled {conn.total_changes - changes} paths of {len(func_strings)} function-token matches")
   print(f"end:\t{datetime.now()}")
 
   conn.commit()
@@ -78,6 +71,7 @@ def main(argv):
     raise DbException(f"Database not found at {db_path}")
   
   conn = sqlite3.connect(db_path)
+  ensure_indexes(conn)
   autolabel(conn)
   conn.close()
   
@@ -0,0 +1,81 @@
+import os, sys, getopt
+import random, timeit
+from typing import Callable, List
+from demangler.demangler import Demangler, _qualification
+from demangler.reference import ReferenceDemangler
+from utils.corpus import make_function_name, make_mangled_name
+from utils.db import DbException
+from utils.jsonstream import iter_array
+
+
+HELP = 'Usage:\npython bench_demangler.py [--json=<PDB JSON file path>] [--size=<synthetic symbol list size>] [--repeat=<repetitions>]\n'
+
+def load_symbols(file_path: str) -> List[str]:
+  """Returns all function names of a PDB JSON file."""
+  with open(file_path) as file:
+    return [func["name"] for func in iter_array(file)]
+
+def make_symbols(size: int, seed: int = 0) -> List[str]:
+  """Returns a reproducible list of mostly mangled symbols."""
+  rand = random.Random(seed)
+  symbols = []
+  for _ in range(size):
+    if rand.random() < 0.8:
+      symbols.append(make_mangled_name(rand))
+    else:
+      symbols.append(make_function_name(rand) + rand.choice(["", "@4", "@12", "$thunk"]))
+  return symbols
+
+def demangle(demangler) -> Callable[[str], str]:
+  """Returns the demangling function of `pdb.py` using the given implementation."""
+  def run(name: str) -> str:
+    return demangler.process_mangled(name) if name[0] == "?" else demangler.process_unmangled(name)
+  return run
+
+def count_changed(symbols: List[str]) -> int:
+  """Returns the number of symbols demangled differently by the reference and current implementation
+  (templates, back-references and special names decoded by `SymbolDecoder`)."""
+  reference, current = demangle(ReferenceDemangler), demangle(Demangler)
+  return sum(1 for name in symbols if reference(name) != current(name))
+
+def run_benchmark(symbols: List[str], repeat: int):
+  """Prints the best timings and throughput of the reference and current implementation."""
+  print(f"symbols:\t{len(symbols)} ({sum(1 for name in symbols if name[0] == '?')} mangled)")
+  print(f"changed:\t{count_changed(symbols)}")
+  times = []
+  for demangler in (ReferenceDemangler, Demangler):
+    run = demangle(demangler)
+    _qualification.cache_clear()
+    times.append(min(timeit.repeat(lambda: [run(name) for name in symbols], number=1, repeat=repeat)))
+  ref_time, cur_time = times
+  print(f"reference:\t{ref_time:.3f}s\t{len(symbols) / ref_time:.0f} symbols/s")
+  print(f"current:\t{cur_time:.3f}s\t{len(symbols) / cur_time:.0f} symbols/s")
+  print(f"speedup:\t{ref_time / cur_time:.2f}x")
+  print(f"scopes:\t{_qualification.cache_info()}")
+
+def main(argv):
+  file_path = ""
+  size = 100000
+  repeat = 3
+  opts, args = getopt.getopt(argv,"hj:s:r:",["json=", "size=", "repeat="])
+  for opt, arg in opts:
+    if opt == '-h':
+      print(HELP)
+      sys.exit()
+    elif opt in ("-j", "--json"):
+      file_path = arg
+    elif opt in ("-s", "--size"):
+      size = int(arg)
+    elif opt in ("-r", "--repeat"):
+      repeat = int(arg)
+
+  if file_path != "":
+    if not os.path.isfile(file_path):
+      raise DbException(f"JSON file not found at {file_path}")
+    symbols = [name for name in load_symbols(file_path) if name != ""]
+  else:
+    symbols = make_symbols(size)
+  run_benchmark(symbols, repeat)
+
+if __name__ == "__main__":
+  main(sys.argv[1:])
@@ -0,0 +1,324 @@
+import os, sys, getopt
+import json, platform, random, sqlite3
+import time, timeit, tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+from tokens.lexer import Lexer, MetaToken
+from tokens.preparser import PreParser
+from tokens.tokenizer import Tokenizer, tokenize
+from tokens.reference import ReferenceLexer, ReferenceMetaToken, ReferencePreParser, ReferenceTokenizer
+from utils.corpus import CORPORA, make_corpus, make_function_name, make_named_corpus, make_operator_name, make_template
+from utils.db import DbException
+
+
+HELP = 'Usage:\npython bench_tokens.py [--dbpath=<database path>] [--size=<synthetic corpus size>] [--repeat=<repetitions>] [--stages [--corpus=<names>] [--json=<results path>] [--compare=<baseline results path>]]\n'
+
+STAGES = ["metatokens", "make_operator_ids", "make_templates", "match_patterns", "make_paths", "split"]
+"""`tokenize` stages measured by the stage suite."""
+
+RESULTS_FORMAT = 1
+"""Version of the stage suite JSON results, bump on incompatible changes."""
+
+REGRESSION_THRESHOLD = 0.1
+"""Relative slowdown of a stage against the baseline reported as a regression."""
+
+def load_corpus(db_path: str) -> List[str]:
+  """Returns all string literals of a database."""
+  conn = sqlite3.connect(db_path)
+  c = conn.cursor()
+  try:
+    c.execute("SELECT literal FROM strings")
+  # 'no such table: strings'
+  except sqlite3.OperationalError as ex:
+    print(ex)
+    sys.exit()
+  corpus = [row[0] for row in c.fetchall()]
+  conn.close()
+  return corpus
+
+def bench_lexer(corpus: List[str]) -> tuple[Callable, Callable]:
+  """Reference vs. single-pass `Lexer.metatokens`."""
+  def run(lexer: Lexer) -> Callable:
+    def body():
+      for string in corpus:
+        lexer.reset(string)
+        lexer.metatokens()
+    return body
+  return run(ReferenceLexer("")), run(Lexer(""))
+
+def bench_operators(corpus: List[str]) -> tuple[Callable, Callable]:
+  """Reference vs. table-driven `PreParser.make_operator_ids` on operator names (the corpus only sets the count)."""
+  rand = random.Random(0)
+  lexer = Lexer("")
+  inputs = []
+  for _ in range(max(len(corpus) // 2, 1)):
+    lexer.reset(make_operator_name(rand))
+    inputs.append(lexer.metatokens())
+
+  def run(preparser: PreParser) -> Callable:
+    def body():
+      for metatokens in inputs:
+        # keywords of unknown operators are modified in place
+        preparser.reset([MetaToken(mt.token, mt.type) for mt in metatokens])
+        preparser.make_operator_ids()
+    return body
+  return run(ReferencePreParser([])), run(PreParser([]))
+
+def bench_templates(corpus: List[str]) -> tuple[Callable, Callable]:
+  """Reference vs. stack-based `PreParser.make_templates` on deeply nested template names (the corpus only sets the count)."""
+  rand = random.Random(0)
+  strings = [make_template(rand, 8, 2) for _ in range(max(len(corpus) // 100, 1))]
+  lexer = Lexer("")
+  preparser = PreParser([])
+  inputs = []
+  for string in strings:
+    lexer.reset(string)
+    preparser.reset(lexer.metatokens())
+    inputs.append(preparser.make_operator_ids())
+
+  def run(preparser: PreParser) -> Callable:
+    def body():
+      for metatokens in inputs:
+        # the reference modifies the list in place
+        preparser.reset(list(metatokens))
+        preparser.make_templates()
+    return body
+  return run(ReferencePreParser([])), run(PreParser([]))
+
+def bench_patterns(corpus: List[str]) -> tuple[Callable, Callable]:
+  """Reference vs. linear-sweep `Tokenizer.match_patterns`, extended with qualified function names."""
+  rand = random.Random(0)
+  strings = corpus + [make_function_name(rand, 8) for _ in range(max(len(corpus) // 10, 1))]
+  lexer = Lexer("")
+  preparser = PreParser([])
+  inputs = []
+  for string in strings:
+    lexer.reset(string)
+    preparser.reset(lexer.metatokens())
+    preparser.reset(preparser.make_operator_ids())
+    inputs.append(preparser.make_templates())
+
+  def run(tokenizer: Tokenizer) -> Callable:
+    def body():
+      for metatokens in inputs:
+        # the reference modifies the list in place
+        tokenizer.reset(list(metatokens))
+        tokenizer.match_patterns()
+    return body
+  return run(ReferenceTokenizer([])), run(Tokenizer([]))
+
+def bench_pipeline(corpus: List[str]) -> tuple[Callable, Callable]:
+  """Reference vs. current stages of the full `tokenize` pipeline."""
+  def run(lexer: Lexer, preparser: PreParser, tokenizer: Tokenizer) -> Callable:
+    def body():
+      for string in corpus:
+        tokenize(string, lexer, preparser, tokenizer)
+    return body
+  return run(ReferenceLexer(""), ReferencePreParser([]), ReferenceTokenizer([])), run(Lexer(""), PreParser([]), Tokenizer([]))
+
+BENCHMARKS = {
+  "lexer": bench_lexer,
+  "operators": bench_operators,
+  "templates": bench_templates,
+  "patterns": bench_patterns,
+  "pipeline": bench_pipeline,
+}
+"""Micro-benchmarks comparing the reference and current implementation of a stage."""
+
+def run_benchmarks(corpus: List[str], repeat: int):
+  """Runs all micro-benchmarks and prints the best timings."""
+  print(f"corpus:\t{len(corpus)} strings")
+  for name, bench in BENCHMARKS.items():
+    reference, current = bench(corpus)
+    ref_time = min(timeit.repeat(reference, number=1, repeat=repeat))
+    cur_time = min(timeit.repeat(current, number=1, repeat=repeat))
+    print(f"{name}:\treference {ref_time:.3f}s\tcurrent {cur_time:.3f}s\tspeedup {ref_time / cur_time:.2f}x")
+
+def measure_memory(corpus: List[str]):
+  """Prints the peak memory of tokenizing the corpus with all tokens retained and the size of token objects in the current and original `MetaToken` layouts."""
+  lexer, preparser, tokenizer = Lexer(""), PreParser([]), Tokenizer([])
+  tracemalloc.start()
+  tokens = [tokenize(string, lexer, preparser, tokenizer) for string in corpus]
+  peak = tracemalloc.get_traced_memory()[1]
+  tracemalloc.stop()
+
+  # token objects only, the token strings are shared
+  sizes = []
+  for token_class in (MetaToken, ReferenceMetaToken):
+    tracemalloc.start()
+    copies = [[token_class(mt.token, mt.type) for mt in mtokens] for mtokens in tokens]
+    sizes.append(tracemalloc.get_traced_memory()[0])
+    tracemalloc.stop()
+    del copies
+
+  count = max(sum(len(mtokens) for mtokens in tokens), 1)
+  print(f"memory:\t{count} tokens\tpeak {peak / 1024 / 1024:.1f}MiB\tobjects: reference {sizes[1] / count:.0f}B/token\tcurrent {sizes[0] / count:.0f}B/token")
+
+def measure_stages(corpus: List[str], repeat: int) -> Dict[str, dict]:
+  """Returns the best time, throughput and number of produced mtokens of every `tokenize` stage over the corpus."""
+  lexer, preparser, tokenizer = Lexer(""), PreParser([]), Tokenizer([])
+  clock = time.perf_counter
+  best = dict.fromkeys(STAGES, float("inf"))
+  tokens = dict.fromkeys(STAGES, 0)
+
+  for run in range(repeat):
+    times = dict.fromkeys(STAGES, 0.0)
+    counts = dict.fromkeys(STAGES, 0)
+    for string in corpus:
+      # same sequence as `tokenize`
+      start = clock()
+      lexer.reset(string)
+      metatokens = lexer.metatokens()
+      end = clock()
+      times["metatokens"] += end - start
+      counts["metatokens"] += len(metatokens)
+
+      start = clock()
+      preparser.reset(metatokens)
+      metatokens = preparser.make_operator_ids()
+      end = clock()
+      times["make_operator_ids"] += end - start
+      counts["make_operator_ids"] += len(metatokens)
+
+      start = clock()
+      preparser.reset(metatokens)
+      metatokens = preparser.make_templates()
+      end = clock()
+      times["make_templates"] += end - start
+      counts["make_templates"] += len(metatokens)
+
+      start = clock()
+      tokenizer.reset(metatokens)
+      metatokens = tokenizer.match_patterns()
+      end = clock()
+      times["match_patterns"] += end - start
+      counts["match_patterns"] += len(metatokens)
+
+      start = clock()
+      tokenizer.reset(metatokens)
+      metatokens = tokenizer.make_paths()
+      end = clock()
+      times["make_paths"] += end - start
+      counts["make_paths"] += len(metatokens)
+
+      start = clock()
+      tokenizer.reset(metatokens)
+      metatokens = tokenizer.split()
+      end = clock()
+      times["split"] += end - start
+      counts["split"] += len(metatokens)
+
+    for stage in STAGES:
+      best[stage] = min(best[stage], times[stage])
+    tokens = counts
+
+  results = {}
+  for stage in STAGES + ["total"]:
+    seconds = max(best[stage] if stage != "total" else sum(best.values()), 1e-9)
+    produced = tokens[stage] if stage != "total" else tokens["split"]
+    results[stage] = {
+      "seconds": seconds,
+      "tokens": produced,
+      "strings_per_sec": len(corpus) / seconds,
+      "tokens_per_sec": produced / seconds,
+    }
+  return results
+
+def run_stages(corpora: Dict[str, List[str]], repeat: int) -> dict:
+  """Runs the stage suite over named corpora, prints and returns the results."""
+  results = {
+    "format": RESULTS_FORMAT,
+    "date": datetime.now().isoformat(timespec="seconds"),
+    "python": platform.python_version(),
+    "platform": platform.platform(),
+    "repeat": repeat,
+    "corpora": {},
+  }
+  for name, corpus in corpora.items():
+    stages = measure_stages(corpus, repeat)
+    results["corpora"][name] = {"strings": len(corpus), "stages": stages}
+    print(f"{name}:\t{len(corpus)} strings")
+    for stage, result in stages.items():
+      print(f"  {stage:<18}{result['seconds']:.3f}s\t{result['strings_per_sec']:.0f} strings/s\t{result['tokens_per_sec']:.0f} tokens/s")
+  return results
+
+def compare_stages(results: dict, baseline: dict) -> int:
+  """Prints per-stage speedups against baseline results, returns the number of regressions."""
+  if baseline.get("format") != RESULTS_FORMAT:
+    raise ValueError(f"Incompatible baseline results format: {baseline.get('format')}, required: {RESULTS_FORMAT}")
+
+  regressions = 0
+  print(f"baseline:\t{baseline['date']}, Python {baseline['python']}")
+  for name, corpus in results["corpora"].items():
+    base = baseline["corpora"].get(name)
+    # corpora of different sizes are not comparable
+    if base is None or base["strings"] != corpus["strings"]:
+      print(f"{name}:\tno comparable baseline")
+      continue
+    for stage, result in corpus["stages"].items():
+      if stage not in base["stages"]:
+        continue
+      ratio = base["stages"][stage]["seconds"] / result["seconds"]
+      regression = ratio < 1 / (1 + REGRESSION_THRESHOLD)
+      regressions += regression
+      print(f"{name}.{stage}:\tspeedup {ratio:.2f}x" + ("\tREGRESSION" if regression else ""))
+  return regressions
+
+def main(argv):
+  db_path = ""
+  size = 20000
+  repeat = 3
+  stages = False
+  names = list(CORPORA)
+  json_path = ""
+  compare_path = ""
+  opts, args = getopt.getopt(argv,"hd:s:r:",["dbpath=", "size=", "repeat=", "stages", "corpus=", "json=", "compare="])
+  for opt, arg in opts:
+    if opt == '-h':
+      print(HELP)
+      sys.exit()
+    elif opt in ("-d", "--dbpath"):
+      db_path = arg
+    elif opt in ("-s", "--size"):
+      size = int(arg)
+    elif opt in ("-r", "--repeat"):
+      repeat = int(arg)
+    elif opt == "--stages":
+      stages = True
+    elif opt == "--corpus":
+      names = arg.split(",")
+    elif opt == "--json":
+      json_path = arg
+    elif opt == "--compare":
+      compare_path = arg
+
+  if db_path != "":
+    if not os.path.isfile(db_path):
+      raise DbException(f"Database not found at {db_path}")
+
+  if not stages:
+    corpus = load_corpus(db_path) if db_path != "" else make_corpus(size)
+    run_benchmarks(corpus, repeat)
+    measure_memory(corpus)
+    return
+
+  if db_path != "":
+    corpora = {"strings": load_corpus(db_path)}
+  else:
+    for name in names:
+      if name not in CORPORA:
+        raise ValueError(f"Unknown corpus: {name}, available: {', '.join(CORPORA)}")
+    corpora = {name: make_named_corpus(name, size) for name in names}
+
+  results = run_stages(corpora, repeat)
+  if json_path != "":
+    with open(json_path, "w") as file:
+      json.dump(results, file, indent=2)
+  if compare_path != "":
+    with open(compare_path) as file:
+      baseline = json.load(file)
+    if compare_stages(results, baseline) > 0:
+      sys.exit(1)
+
+if __name__ == "__main__":
+  main(sys.argv[1:])
@@ -0,0 +1,224 @@
+import os, sys, getopt
+import sqlite3, json
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import datetime
+from hashlib import blake2b
+from typing import Callable, Dict, List, Tuple
+from utils.db import DbException
+from utils.schema import ensure_indexes
+from tokens.parallel import get_jobs
+from tokens.cache import TokenCache
+import autolabel_paths, mergedb, pdb, tokenize, tpaths, tpaths_add_missing_pos, tpaths_cleanse, tpaths_label_neg, tpaths_neg
+
+
+HELP = 'Usage:\npython build.py --config=<JSON file path> [--jobs=<worker processes, 0 for all CPUs>] [--cache=<token cache db path>] [--force]\n'
+
+class Stage:
+  """Build stage of a single-binary database with declared table inputs and outputs."""
+  def __init__(self, name: str, inputs: Tuple[str, ...], outputs: Tuple[str, ...], run: Callable, files: Tuple[str, ...] = (), once: bool = False) -> None:
+    self.name = name
+    self.inputs = inputs
+    self.outputs = outputs
+    # `run(conn, binary, jobs, cache)`, `binary` is the config entry
+    self.run = run
+    # config entry keys of input files
+    self.files = files
+    # appends rows, never repeated (also with `--force`)
+    self.once = once
+
+def _run_pdb(conn: sqlite3.Connection, binary: dict, jobs: int, cache: TokenCache):
+  with open(binary["pdb"]) as file:
+    pdb.process_pdb_stream(conn, file, jobs)
+
+STAGES = [
+  Stage("pdb", (), ("pdb",), _run_pdb, files=("pdb",)),
+  Stage("tokenize", ("strings",), ("tokens",), lambda conn, binary, jobs, cache: tokenize.make_tokens_bulk(conn, jobs, cache)),
+  Stage("autolabel_paths", ("tokens", "pdb", "paths"), ("paths",), lambda conn, binary, jobs, cache: autolabel_paths.autolabel(conn)),
+  Stage("tpaths", ("tokens", "paths", "strings"), ("token_paths",), lambda conn, binary, jobs, cache: tpaths.make_token_paths_bulk(conn, jobs, cache), once=True),
+  Stage("tpaths_neg", ("paths", "strings", "token_paths"), ("token_paths",), lambda conn, binary, jobs, cache: tpaths_neg.make_token_paths_negative(conn, jobs, cache, quiet=True)),
+  Stage("tpaths_add_missing_pos", ("paths", "strings", "token_paths"), ("token_paths_positive",), lambda conn, binary, jobs, cache: tpaths_add_missing_pos.add_missing_positives(conn, jobs, cache), once=True),
+  Stage("tpaths_label_neg", ("paths", "token_paths"), ("token_paths",), lambda conn, binary, jobs, cache: tpaths_label_neg.label_negative(conn, quiet=True)),
+  Stage("tpaths_cleanse", ("paths", "token_paths"), ("token_paths",), lambda conn, binary, jobs, cache: tpaths_cleanse.cleanse(conn, quiet=True)),
+]
+"""Stages of a single-binary database, in the order of `Dataset preparation`."""
+
+def get_dependencies(stages: List[Stage]) -> Dict[str, List[str]]:
+  """Returns the names of the stages each stage depends on, the earlier stages writing any of its tables."""
+  dependencies = {}
+  for idx, stage in enumerate(stages):
+    tables = set(stage.inputs) | set(stage.outputs)
+    dependencies[stage.name] = [prev.name for prev in stages[:idx] if not tables.isdisjoint(prev.outputs)]
+  return dependencies
+
+def get_tables(conn: sqlite3.Connection) -> List[str]:
+  """Returns the table names of a database."""
+  return [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+
+def get_table_fingerprint(conn: sqlite3.Connection, table: str) -> str:
+  """Returns the row count and content hash of a table."""
+  digest = blake2b(digest_size=16)
+  count = 0
+  for row in conn.execute(f"SELECT * FROM {table} ORDER BY rowid"):
+    digest.update(repr(row).encode("utf-8", "surrogatepass"))
+    count += 1
+  return f"{count}:{digest.hexdigest()}"
+
+def get_stage_fingerprint(conn: sqlite3.Connection, stage: Stage, binary: dict, tables: Dict[str, str]) -> str:
+  """Returns the fingerprint of stage inputs, table fingerprints are memoized in `tables`."""
+  parts = [stage.name]
+  for table in stage.inputs:
+    if table not in tables:
+      tables[table] = get_table_fingerprint(conn, table)
+    parts.append(f"{table}={tables[table]}")
+  for key in stage.files:
+    parts.append(f"{key}={mergedb.get_file_hash(binary[key])}")
+  return "\n".join(parts)
+
+def save_fingerprint(conn: sqlite3.Connection, stage: str, fingerprint: str):
+  """Records the input fingerprint of a finished stage."""
+  conn.execute("INSERT OR REPLACE INTO build_stages VALUES (?,?,?)", (stage, fingerprint, datetime.now().isoformat()))
+  conn.commit()
+
+def build_binary(binary: dict, jobs: int = 1, cache_path: str = "", force: bool = False) -> List[Tuple[str, str]]:
+  """Runs the stages of one binary database, returns `(stage, status)` pairs.
+
+  Stage output goes to `<database path>.build.log`."""
+  db_path = binary["path"]
+  conn = sqlite3.connect(db_path)
+  conn.execute('''CREATE TABLE IF NOT EXISTS build_stages (
+              stage TEXT PRIMARY KEY,
+              fingerprint TEXT NOT NULL,
+              finished_at TEXT NOT NULL)''')
+  conn.commit()
+  fingerprints = dict(conn.execute("SELECT stage, fingerprint FROM build_stages").fetchall())
+
+  cache = TokenCache(cache_path)
+  dependencies = get_dependencies(STAGES)
+  # table fingerprints of the current state
+  tables = {}
+  statuses = {}
+  with open(f"{db_path}.build.log", "a") as log, redirect_stdout(log), redirect_stderr(log):
+    ensure_indexes(conn)
+    for stage in STAGES:
+      print(f"[{stage.name}]\t{datetime.now()}")
+      existing = get_tables(conn)
+      failed = [name for name in dependencies[stage.name] if statuses[name] == "failed"]
+      if len(failed) > 0:
+        statuses[stage.name] = "skipped (failed dependency)"
+        continue
+      if any(table not in existing for table in stage.inputs) or any(key not in binary for key in stage.files):
+        statuses[stage.name] = "skipped (missing input)"
+        continue
+
+      fingerprint = get_stage_fingerprint(conn, stage, binary, tables)
+      unchanged = fingerprints.get(stage.name) == fingerprint
+      if stage.once and stage.name in fingerprints:
+        statuses[stage.name] = "unchanged" if unchanged else "skipped (inputs changed, outputs must be recreated manually)"
+        continue
+      if unchanged and not force:
+        statuses[stage.name] = "unchanged"
+        continue
+
+      # some stages close the connection
+      stage_conn = sqlite3.connect(db_path)
+      try:
+        stage.run(stage_conn, binary, jobs, cache)
+      except (Exception, SystemExit) as ex:
+        print(ex)
+        statuses[stage.name] = "failed"
+        continue
+      finally:
+        stage_conn.close()
+
+      # inputs written by the stage itself are fingerprinted after the run
+      for table in stage.outputs:
+        tables.pop(table, None)
+      save_fingerprint(conn, stage.name, get_stage_fingerprint(conn, stage, binary, tables))
+      statuses[stage.name] = "done"
+
+    # later stages write tables read by the earlier ones, inputs are recorded in their final state
+    for stage in STAGES:
+      if statuses[stage.name] in ("done", "unchanged"):
+        fingerprint = get_stage_fingerprint(conn, stage, binary, tables)
+        if fingerprints.get(stage.name) != fingerprint:
+          save_fingerprint(conn, stage.name, fingerprint)
+    # tables created by the stages
+    ensure_indexes(conn)
+
+  cache.close()
+  conn.close()
+  return list(statuses.items())
+
+def build(config: dict, jobs: int = 1, cache_path: str = "", force: bool = False):
+  """Builds all binary databases, in parallel processes, and merges them incrementally if an output is configured."""
+  print(f"start:\t{datetime.now()}")
+
+  files = config["files"]
+  for binary in files:
+    if not os.path.isfile(binary["path"]):
+      raise DbException(f"Input database not found at {binary['path']}")
+
+  # binaries in parallel, the rest of the workers tokenize
+  workers = max(min(jobs, len(files)), 1)
+  stage_jobs = max(jobs // workers, 1)
+  failed = False
+  if workers == 1:
+    results = (build_binary(binary, stage_jobs, cache_path, force) for binary in files)
+    failed = report(files, results)
+  else:
+    # deferred, `concurrent.futures` indirectly imports the standard `tokenize` module
+    # which is shadowed by `tokenize.py` script
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+      futures = [executor.submit(build_binary, binary, stage_jobs, cache_path, force) for binary in files]
+      failed = report(files, (future.result() for future in futures))
+
+  if "outputFile" in config:
+    if failed:
+      print("Merge skipped, some stages failed")
+    else:
+      mergedb.merge(config, incremental=True)
+
+  print(f"end:\t{datetime.now()}")
+
+def report(files: List[dict], results) -> bool:
+  """Prints stage statuses of the binaries, returns whether any stage failed."""
+  failed = False
+  for binary, statuses in zip(files, results):
+    print(f"{binary['label']}:")
+    for stage, status in statuses:
+      print(f"  {stage}\t{status}")
+      failed = failed or status == "failed"
+  return failed
+
+def main(argv):
+  config_path = ""
+  jobs = 1
+  cache_path = ""
+  force = False
+  opts, args = getopt.getopt(argv,"hc:j:f",["config=", "jobs=", "cache=", "force"])
+  for opt, arg in opts:
+    if opt == '-h':
+      print(HELP)
+      sys.exit()
+    elif opt in ("-c", "--config"):
+      config_path = arg
+    elif opt in ("-j", "--jobs"):
+      jobs = get_jobs(arg)
+    elif opt == "--cache":
+      cache_path = arg
+    elif opt in ("-f", "--force"):
+      force = True
+
+  if config_path == "":
+    raise DbException(f"Config JSON file path required\n{HELP}")
+  if not os.path.isfile(config_path):
+    raise DbException(f"Config JSON file not found at {config_path}")
+
+  with open(config_path) as config_file:
+    config = json.load(config_file)
+  build(config, jobs, cache_path, force)
+
+
+if __name__ == "__main__":
+  main(sys.argv[1:])
@@ -1,4 +1,6 @@
-from typing import Tuple
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 
 SPECIAL_NAME_CODES = {
@@ -13,6 +15,7 @@ SPECIAL_NAME_CODES = {
   "8": "operator ==",
   "9": "operator !=",
   "A": "operator[]",
+  # conversion operator, named after the return type
   "B": "",
   "C": "operator ->",
   "D": "operator *",
@@ -45,106 +48,672 @@ SPECIAL_NAME_CODES = {
   "_4": "operator &=",
   "_5": "operator |=",
   "_6": "operator ^=",
+  # tables, RTTI, guards and string literals are data
   "_7": "",
   "_8": "",
   "_9": "",
   "_A": "",
   "_B": "",
   "_C": "",
-  "_D": "",
-  "_E": "",
-  "_F": "",
-  "_G": "",
-  "_H": "",
-  "_I": "",
-  "_J": "",
-  "_K": "",
-  "_L": "",
-  "_M": "",
-  "_N": "",
-  "_O": "",
+  "_D": "`vbase destructor'",
+  "_E": "`vector deleting destructor'",
+  "_F": "`default constructor closure'",
+  "_G": "`scalar deleting destructor'",
+  "_H": "`vector constructor iterator'",
+  "_I": "`vector destructor iterator'",
+  "_J": "`vector vbase constructor iterator'",
+  "_K": "`virtual displacement map'",
+  "_L": "`eh vector constructor iterator'",
+  "_M": "`eh vector destructor iterator'",
+  "_N": "`eh vector vbase constructor iterator'",
+  "_O": "`copy constructor closure'",
   "_P": "",
   "_Q": "",
   "_R": "",
   "_S": "",
-  "_T": "",
+  "_T": "`local vftable constructor closure'",
   "_U": "operator new[]",
   "_V": "operator delete[]",
   "_W": "",
-  "_X": "",
-  "_Y": "",
+  "_X": "`placement delete closure'",
+  "_Y": "`placement delete[] closure'",
   "_Z": "",
-  # __X codes are ignored
+  # __X codes are decoded by `SymbolDecoder`
 }
 """Special name code mapping (empty are ignored)."""
 
+PRIMITIVE_TYPES = {
+  "C": "signed char",
+  "D": "char",
+  "E": "unsigned char",
+  "F": "short",
+  "G": "unsigned short",
+  "H": "int",
+  "I": "unsigned int",
+  "J": "long",
+  "K": "unsigned long",
+  "M": "float",
+  "N": "double",
+  "O": "long double",
+  "X": "void",
+  "_D": "__int8",
+  "_E": "unsigned __int8",
+  "_F": "__int16",
+  "_G": "unsigned __int16",
+  "_H": "__int32",
+  "_I": "unsigned __int32",
+  "_J": "__int64",
+  "_K": "unsigned __int64",
+  "_L": "__int128",
+  "_M": "unsigned __int128",
+  "_N": "bool",
+  "_Q": "char8_t",
+  "_S": "char16_t",
+  "_U": "char32_t",
+  "_W": "wchar_t",
+}
+"""Primitive type codes."""
+
+CALLING_CONVENTIONS = {
+  "A": "__cdecl",
+  "B": "__cdecl",
+  "C": "__pascal",
+  "D": "__pascal",
+  "E": "__thiscall",
+  "F": "__thiscall",
+  "G": "__stdcall",
+  "H": "__stdcall",
+  "I": "__fastcall",
+  "J": "__fastcall",
+  "M": "__clrcall",
+  "N": "__clrcall",
+  "O": "__eabi",
+  "P": "__eabi",
+  "Q": "__vectorcall",
+}
+"""Calling convention codes of function types."""
+
+_IDENTIFIER = re.compile(r"[0-9A-Za-z_]*")
+"""ASCII run of identifier characters, other characters are checked one by one."""
+
+_NAME = re.compile(r"([0-9A-Za-z_]+)@((?:[0-9A-Za-z_]+@)*)")
+"""ASCII core name and scopes of a mangled symbol, each terminated by a single @."""
+
+_SIMPLE_SYMBOL = re.compile(r"\?([A-Za-z_][0-9A-Za-z_]*)@((?:[A-Za-z_][0-9A-Za-z_]*@)*)@")
+"""Symbol qualified by plain names only (no templates, back-references or special names)."""
+
+_SIMPLE_SPECIAL = re.compile(r"\?\?(_?[0-9A-Z])([A-Za-z_][0-9A-Za-z_]*)@((?:[A-Za-z_][0-9A-Za-z_]*@)*)@")
+"""Special name symbol of a class qualified by plain names only."""
+
+_UNMANGLED = re.compile(r"[^@$]*")
+"""Core name of an unmangled signature."""
+
+# special name codes followed by a name
+_NAMED_CODES = frozenset(code for code, name in SPECIAL_NAME_CODES.items() if name != "")
+
+# pointer and reference kinds, `(code, declarator)`
+_POINTERS = {"P": "*", "Q": "* const", "R": "* volatile", "S": "* const volatile", "A": "&", "B": "& volatile"}
+
+# cv-qualifier codes, `(qualifiers, member pointer)`
+_QUALIFIERS = {
+  "A": ("", False), "B": ("const", False), "C": ("volatile", False), "D": ("const volatile", False),
+  "Q": ("", True), "R": ("const", True), "S": ("volatile", True), "T": ("const volatile", True),
+}
+
+# function class codes, `(has this pointer, this adjustment numbers)`
+_FUNCTION_CLASSES = {code: (True, 0) for code in "ABEFIJMNQRUV"}
+_FUNCTION_CLASSES.update({code: (False, 0) for code in "CDKLSTYZ"})
+_FUNCTION_CLASSES.update({code: (True, 1) for code in "GHOPWX"})
+
+def _isident(char: str) -> bool:
+  """Returns whether a character can be a part of a name (accepts non-ASCII letters and numerics)."""
+  return char.isidentifier() or char.isnumeric()
+
+def _ident_end(name: str, idx: int) -> int:
+  """Returns the end of the identifier character run starting at `idx`."""
+  end = _IDENTIFIER.match(name, idx).end()
+  while end < len(name) and not name[end].isascii() and _isident(name[end]):
+    end = _IDENTIFIER.match(name, end + 1).end()
+  return end
+
+@lru_cache(maxsize=65536)
+def _qualification(scopes: str) -> str:
+  """Returns the qualification of `@`-terminated mangled scopes (innermost first), memoized as PDBs repeat them."""
+  if scopes == "":
+    return ""
+  return "::".join(reversed(scopes[:-1].split("@"))) + "::"
+
+def _qualify(type: str, qualifiers: str) -> str:
+  """Appends cv-qualifiers to a type."""
+  return f"{type} {qualifiers}" if qualifiers != "" else type
+
+class DemanglerException(Exception):
+  """Symbol encoding not covered by the decoder."""
+  def __init__(self, message):
+    super().__init__(message)
+
+class SymbolDecoder:
+  """Recursive descent decoder of MSVC symbol names, in one pass over the symbol.
+
+  Decodes qualified names with operators and special member functions, template argument lists,
+  name and type back-references, anonymous namespaces and locally scoped names. Function signatures
+  are read only as far as the name depends on them (conversion operators, nested symbols)."""
+  def __init__(self, symbol: str) -> None:
+    self.symbol = symbol
+    self.pos = 0
+    # back-references, memorized names by key and function parameter types
+    self.names: Dict[str, str] = {}
+    self.params: List[str] = []
+
+  def function_name(self) -> str:
+    """Returns the qualified name of a mangled function symbol, empty for ignored special names."""
+    self.expect("?")
+    # hashed names of too long symbols
+    if self.consume("?@"):
+      return ""
+    if self.peek() == "?" and self.peek(1) == "_":
+      if self.peek(2) == "_":
+        code = self.symbol[self.pos + 1:self.pos + 4]
+        if code in ("__E", "__F"):
+          self.pos += 4
+          return self.__init_stub(code)
+        if code not in ("__K", "__L", "__M"):
+          return ""
+      elif SPECIAL_NAME_CODES.get(self.symbol[self.pos + 1:self.pos + 3]) == "":
+        return ""
+    return self.symbol_name()
+
+  def symbol_name(self) -> str:
+    """Reads the qualified name of a symbol."""
+    name, kind = self.unqualified_symbol_name()
+    scopes = self.scopes()
+    if kind is not None:
+      if kind == "conversion":
+        name = f"operator {self.conversion_type()}{name}"
+      elif len(scopes) == 0:
+        self.error("Special member function without a class")
+      elif kind == "constructor":
+        name = scopes[0] + name
+      else:
+        name = f"~{scopes[0]}{name}"
+    scopes.reverse()
+    scopes.append(name)
+    return "::".join(scopes)
+
+  def nested_symbol(self) -> str:
+    """Reads a whole symbol nested in a name or a template argument, returns its qualified name."""
+    self.expect("?")
+    name = self.symbol_name()
+    char = self.peek()
+    # variable
+    if char in ("0", "1", "2", "3", "4"):
+      self.pos += 1
+      pointer = self.peek() in _POINTERS or self.symbol.startswith(("$$Q", "$$R"), self.pos)
+      self.type()
+      if pointer:
+        self.pointer_ext_qualifiers()
+        _, member = self.qualifiers()
+        if member:
+          self.qualified_type_name()
+      else:
+        self.qualifiers()
+    else:
+      self.function_encoding()
+    return name
+
+  def unqualified_symbol_name(self) -> Tuple[str, str | None]:
+    """Reads the leaf name of a symbol, returns `(name, special member kind)`."""
+    char = self.peek()
+    if char.isdigit():
+      return (self.backref(), None)
+    if char == "?":
+      if self.peek(1) == "$":
+        self.pos += 2
+        return self.template_name(False)
+      return self.function_identifier()
+    return (self.simple_name(True), None)
+
+  def unqualified_type_name(self) -> str:
+    """Reads the leaf name of a type."""
+    char = self.peek()
+    if char.isdigit():
+      return self.backref()
+    if self.consume("?$"):
+      return self.template_name(True)[0]
+    return self.simple_name(True)
+
+  def qualified_type_name(self) -> str:
+    """Reads the qualified name of a type."""
+    name = self.unqualified_type_name()
+    scopes = self.scopes()
+    scopes.reverse()
+    scopes.append(name)
+    return "::".join(scopes)
+
+  def scopes(self) -> List[str]:
+    """Reads the `@`-terminated enclosing scopes of a name, innermost first."""
+    scopes = []
+    symbol = self.symbol
+    while True:
+      if self.pos >= len(symbol):
+        self.error("Unterminated name")
+      char = symbol[self.pos]
+      if char == "@":
+        self.pos += 1
+        return scopes
+      if char.isdigit():
+        scopes.append(self.backref())
+      elif char != "?":
+        scopes.append(self.simple_name(True))
+      elif self.consume("?$"):
+        scopes.append(self.template_name(True)[0])
+      elif self.consume("?A"):
+        scopes.append(self.anonymous_namespace())
+      else:
+        scopes.append(self.local_scope())
+
+  def simple_name(self, memorize: bool) -> str:
+    """Reads an `@`-terminated name."""
+    end = self.symbol.find("@", self.pos)
+    if end <= self.pos:
+      self.error("Expected a name")
+    name = self.symbol[self.pos:end]
+    self.pos = end + 1
+    if memorize:
+      self.memorize(name, name)
+    return name
+
+  def memorize(self, key: str, name: str) -> None:
+    """Adds a name to the back-references, at most 10 distinct ones."""
+    if len(self.names) < 10 and key not in self.names:
+      self.names[key] = name
+
+  def backref(self) -> str:
+    """Reads a name back-reference."""
+    idx = ord(self.symbol[self.pos]) - ord("0")
+    if idx >= len(self.names):
+      self.error(f"Invalid name back-reference {idx}")
+    self.pos += 1
+    return list(self.names.values())[idx]
+
+  def template_name(self, memorize: bool) -> Tuple[str, str | None]:
+    """Reads a template instantiation name (after `?$`), its arguments have their own back-references."""
+    outer = (self.names, self.params)
+    self.names, self.params = {}, []
+    name, kind = self.unqualified_symbol_name()
+    name += self.template_args()
+    self.names, self.params = outer
+    if memorize:
+      if kind is not None:
+        self.error("Special member function in a scope")
+      self.memorize(name, name)
+    return (name, kind)
+
+  def template_args(self) -> str:
+    """Reads an `@`-terminated template argument list."""
+    args = []
+    while not self.consume("@"):
+      if self.peek() == "":
+        self.error("Unterminated template argument list")
+      arg = self.template_arg()
+      if arg is not None:
+        args.append(arg)
+    joined = ",".join(args)
+    # "> >" as in the original names
+    return f"<{joined} >" if joined.endswith(">") else f"<{joined}>"
+
+  def template_arg(self) -> str | None:
+    """Reads a template argument, `None` for empty packs."""
+    if self.consume("$$V") or self.consume("$$Z") or self.consume("$S") or self.consume("$$$V"):
+      return None
+    if self.consume("$$Y"):
+      return self.qualified_type_name()
+    if self.consume("$$B"):
+      return self.type()
+    if self.consume("$1"):
+      return "&" + self.nested_symbol()
+    if self.consume("$E"):
+      return self.nested_symbol()
+    if self.consume("$0"):
+      return str(self.signed_number())
+    if self.consume("$D") or self.consume("$Q"):
+      return f"`template-parameter{self.signed_number()}'"
+    if self.peek() == "$" and not self.symbol.startswith(("$$Q", "$$R", "$$A", "$$C", "$$T"), self.pos):
+      self.error(f"Unsupported template argument {self.symbol[self.pos:self.pos + 2]}")
+    return self.type()
+
+  def anonymous_namespace(self) -> str:
+    """Reads an anonymous namespace name (after `?A`), memorized by its key."""
+    end = self.symbol.find("@", self.pos)
+    if end < 0:
+      self.error("Unterminated anonymous namespace")
+    self.memorize(self.symbol[self.pos:end], "`anonymous namespace'")
+    self.pos = end + 1
+    return "`anonymous namespace'"
+
+  def local_scope(self) -> str:
+    """Reads a scope local to a function, `?<number>?<function symbol>`."""
+    self.expect("?")
+    number = self.number()
+    self.expect("?")
+    outer = (self.names, self.params)
+    self.names, self.params = {}, []
+    function = self.nested_symbol()
+    self.names, self.params = outer
+    return f"`{function}'::`{number}'"
+
+  def function_identifier(self) -> Tuple[str, str | None]:
+    """Reads an operator or a special member function name (after `?`)."""
+    self.expect("?")
+    code = self.peek()
+    if code == "_":
+      code = self.symbol[self.pos:self.pos + 2]
+      if code == "__":
+        code = self.symbol[self.pos:self.pos + 3]
+    self.pos += len(code)
+    match code:
+      case "0":
+        return ("", "constructor")
+      case "1":
+        return ("", "destructor")
+      case "B":
+        return ("", "conversion")
+      case "__K":
+        return ('operator ""' + self.simple_name(False), None)
+      case "__L":
+        return ("operator co_await", None)
+      case "__M":
+        return ("operator <=>", None)
+    if SPECIAL_NAME_CODES.get(code, "") == "":
+      self.error(f"Unsupported special name code: {code}")
+    return (SPECIAL_NAME_CODES[code], None)
+
+  def conversion_type(self) -> str:
+    """Reads the function encoding of a conversion operator up to its return type."""
+    this = self.function_class()
+    return self.function_type(this, return_only=True)[0]
+
+  def function_encoding(self) -> None:
+    """Reads the function encoding following the name of a nested function symbol."""
+    self.function_type(self.function_class())
+
+  def function_class(self) -> bool:
+    """Reads a function class and its this adjustments, returns whether the function has this qualifiers."""
+    char = self.peek()
+    self.pos += 1
+    if char == "$":
+      # virtual this adjustments
+      extended = self.consume("R")
+      if self.peek() not in ("0", "1", "2", "3", "4", "5"):
+        self.error("Unsupported function class")
+      self.pos += 1
+      for _ in range(4 if extended else 2):
+        self.signed_number()
+      return True
+    if char not in _FUNCTION_CLASSES:
+      self.error(f"Unsupported function class {char!r}")
+    this, adjustments = _FUNCTION_CLASSES[char]
+    for _ in range(adjustments):
+      self.signed_number()
+    return this
+
+  def function_type(self, this: bool, return_only: bool = False) -> Tuple[str, str, str]:
+    """Reads a function type, returns `(return type, calling convention, parameters)`."""
+    if this:
+      self.pointer_ext_qualifiers()
+      # ref-qualifiers
+      if self.peek() in ("G", "H"):
+        self.pos += 1
+      self.qualifiers()
+    convention = CALLING_CONVENTIONS.get(self.peek())
+    if convention is None:
+      self.error("Unsupported calling convention")
+    self.pos += 1
+    # constructors and destructors have no return type
+    result = "" if self.consume("@") else self.type("result")
+    if return_only:
+      return (result, convention, "")
+    params = self.parameters()
+    # throw specification
+    if not self.consume("_E") and not self.consume("Z"):
+      self.error("Expected a throw specification")
+    return (result, convention, params)
+
+  def parameters(self) -> str:
+    """Reads a function parameter list."""
+    if self.consume("X"):
+      return "void"
+    params = []
+    while True:
+      char = self.peek()
+      if char == "@":
+        self.pos += 1
+        break
+      if char == "Z":
+        self.pos += 1
+        params.append("...")
+        break
+      if char == "":
+        self.error("Unterminated parameter list")
+      if char.isdigit():
+        idx = ord(char) - ord("0")
+        if idx >= len(self.params):
+          self.error(f"Invalid parameter back-reference {idx}")
+        self.pos += 1
+        params.append(self.params[idx])
+        continue
+      start = self.pos
+      param = self.type()
+      # single character types are not memorized
+      if self.pos - start > 1 and len(self.params) < 10:
+        self.params.append(param)
+      params.append(param)
+    return ",".join(params)
+
+  def type(self, mode: str = "drop") -> str:
+    """Reads a type; `mangle` mode reads leading cv-qualifiers, `result` mode reads them after `?`."""
+    qualifiers = ""
+    if mode == "mangle" or (mode == "result" and self.consume("?")):
+      qualifiers, _ = self.qualifiers()
+    char = self.peek()
+    if char in ("T", "U", "V"):
+      self.pos += 1
+      return _qualify(self.qualified_type_name(), qualifiers)
+    if char == "W":
+      self.pos += 2
+      return _qualify(self.qualified_type_name(), qualifiers)
+    if char in _POINTERS or self.symbol.startswith(("$$Q", "$$R"), self.pos):
+      return self.pointer_type()
+    if char == "Y":
+      self.pos += 1
+      dimensions = [self.number() for _ in range(self.number())]
+      element = self.type()
+      return element + "".join(f"[{dimension}]" for dimension in dimensions)
+    if self.consume("$$A6"):
+      result, convention, params = self.function_type(False)
+      return f"{result} {convention}({params})"
+    if self.consume("$$C"):
+      cv, _ = self.qualifiers()
+      return _qualify(self.type(), cv)
+    if self.consume("$$T"):
+      return _qualify("std::nullptr_t", qualifiers)
+    code = self.symbol[self.pos:self.pos + 2] if char == "_" else char
+    if code not in PRIMITIVE_TYPES:
+      self.error(f"Unsupported type {code!r}")
+    self.pos += len(code)
+    return _qualify(PRIMITIVE_TYPES[code], qualifiers)
+
+  def pointer_type(self) -> str:
+    """Reads a pointer, reference or member pointer type."""
+    if self.consume("$$Q"):
+      declarator = "&&"
+    elif self.consume("$$R"):
+      declarator = "&& volatile"
+    else:
+      declarator = _POINTERS[self.peek()]
+      self.pos += 1
+
+    # function pointer
+    if self.consume("6"):
+      result, convention, params = self.function_type(False)
+      return f"{result} ({convention}{declarator})({params})"
+    self.pointer_ext_qualifiers()
+    # member function pointer
+    if self.consume("8"):
+      parent = self.qualified_type_name()
+      result, convention, params = self.function_type(True)
+      return f"{result} ({convention} {parent}::{declarator})({params})"
+    cv, member = self.qualifiers()
+    if member:
+      parent = self.qualified_type_name()
+      return f"{_qualify(self.type(), cv)} {parent}::{declarator}"
+    return f"{_qualify(self.type(), cv)} {declarator}"
+
+  def pointer_ext_qualifiers(self) -> None:
+    """Skips `__ptr64`, `__restrict` and `__unaligned` qualifiers."""
+    while self.peek() in ("E", "I", "F"):
+      self.pos += 1
+
+  def qualifiers(self) -> Tuple[str, bool]:
+    """Reads a cv-qualifier code, returns `(qualifiers, member pointer)`."""
+    qualifiers = _QUALIFIERS.get(self.peek())
+    if qualifiers is None:
+      self.error("Expected cv-qualifiers")
+    self.pos += 1
+    return qualifiers
+
+  def number(self) -> int:
+    """Reads an encoded non-negative number, a digit (`0` is 1) or `@`-terminated hex digits `A`-`P`."""
+    char = self.peek()
+    if char.isdigit():
+      self.pos += 1
+      return ord(char) - ord("0") + 1
+    value = 0
+    while True:
+      char = self.peek()
+      self.pos += 1
+      if char == "@":
+        return value
+      if not "A" <= char <= "P":
+        self.error("Invalid number")
+      value = value * 16 + ord(char) - ord("A")
+
+  def signed_number(self) -> int:
+    """Reads an encoded number, negative after `?`."""
+    return -self.number() if self.consume("?") else self.number()
+
+  def peek(self, offset: int = 0) -> str:
+    """Returns a character ahead of the position, empty at the end of the symbol."""
+    idx = self.pos + offset
+    return self.symbol[idx] if idx < len(self.symbol) else ""
+
+  def consume(self, prefix: str) -> bool:
+    """Skips a prefix at the position, returns whether it was there."""
+    if self.symbol.startswith(prefix, self.pos):
+      self.pos += len(prefix)
+      return True
+    return False
+
+  def expect(self, prefix: str) -> None:
+    """Skips a required prefix."""
+    if not self.consume(prefix):
+      self.error(f"Expected {prefix!r}")
+
+  def error(self, message: str):
+    """Raises a decoding error at the position."""
+    raise DemanglerException(f"{message} at {self.pos} in {self.symbol}")
+
+  def __init_stub(self, code: str) -> str:
+    """Reads the name of a dynamic initializer or atexit destructor of a variable (after `?__E` or `?__F`)."""
+    # static data member, a whole nested symbol
+    if self.peek() == "?":
+      name = self.nested_symbol()
+    else:
+      name = self.symbol_name()
+    kind = "initializer" if code == "__E" else "atexit destructor"
+    return f"`dynamic {kind} for '{name}''"
+
 class Demangler:
   @staticmethod
   def process_unmangled(name: str) -> str:
     """Returns the core name of a function from unmangled signature."""
-    result = ""
-    for char in name:
-      if char in ["@", "$"]:
-        return result
-      result += char
-    return result
-  
+    return _UNMANGLED.match(name).group()
+
   @staticmethod
   def process_mangled(name: str) -> str:
-    """Returns the core name of a function from mangled signature."""
-    result = ""
-    match name[1]:
-      case "?":
-        if name[2] == "$":
-          # ignore "??$?<...>"
-          if name[3] == "?":
-            return result
-          else:
-            result = Demangler.__read_template(name)  
-        else:
-          result = Demangler.__read_special(name)
-      case _:
-        result = Demangler.__read_mangled(name)
-    
-    return result
-  
+    """Returns the qualified name of a function from mangled signature, with template arguments.
+
+    Data symbols (tables, RTTI, string literals) are ignored (empty)."""
+    match = _SIMPLE_SYMBOL.match(name)
+    if match is not None:
+      return _qualification(match[2]) + match[1]
+    match = _SIMPLE_SPECIAL.match(name)
+    if match is not None and match[1] in SPECIAL_NAME_CODES and match[1] != "B":
+      return Demangler.__simple_special(match[1], _qualification(match[3]), match[2])
+    try:
+      return SymbolDecoder(name).function_name()
+    # encodings not covered by the decoder keep the core name
+    except DemanglerException:
+      return Demangler.__read_core(name)
+
+  @staticmethod
+  def __simple_special(code: str, qualif: str, core: str) -> str:
+    """Returns the name of a special member function of a plainly qualified class."""
+    match code:
+      case "0":
+        return f"{qualif}{core}::{core}"
+      case "1":
+        return f"{qualif}{core}::~{core}"
+    operator = SPECIAL_NAME_CODES[code]
+    return f"{qualif}{core}::{operator}" if operator != "" else ""
+
+  @staticmethod
+  def __read_core(name: str) -> str:
+    """Returns the core name and plain scopes of a function from mangled signature, skipping templates and back-references."""
+    if name[1] != "?":
+      return Demangler.__read_mangled(name)
+    if name[2] != "$":
+      return Demangler.__read_special(name)
+    # ignore "??$?<...>"
+    if name[3] == "?":
+      return ""
+    return Demangler.__read_template(name)
+
   @staticmethod
   def __read(name: str, offset: int) -> Tuple[(str, str)]:
     """Reads name and basic qualification of a mangled symbol."""
+    if name.isascii():
+      match = _NAME.match(name, offset)
+      if match is not None:
+        return (_qualification(match[2]), match[1])
+
+    # non-ASCII names and no core name
+    size = len(name)
+    # core name - the first identifier terminated by a single @
     core = ""
-    qualification = ""
-    namespaces = []
-    
-    current = ""
-    for idx in range(offset, len(name)):
-      # identifier
-      if name[idx].isidentifier() or name[idx].isnumeric():
-        current += name[idx]
-      # single @ - simple qualification separator
-      elif name[idx] == "@" and (name[idx - 1].isidentifier() or name[idx - 1].isnumeric()):
-        if core == "":
-          
-          core = current
-        else:
-          # reverses order
-          namespaces.insert(0, current)
-
-        current = ""
-      # special character - end
-      else:
-        break
-    
-    for ns in namespaces:
-      qualification += ns + "::"
+    idx = offset
+    while core == "":
+      end = _ident_end(name, idx)
+      if end == size or name[end] != "@" or (end == idx and not _isident(name[end - 1])):
+        return ("", "")
+      core = name[idx:end]
+      idx = end + 1
 
-    return (qualification, core)
+    # scopes - following identifiers terminated by a single @, an unterminated one is dropped
+    start = idx
+    while True:
+      end = _ident_end(name, idx)
+      if end == idx or end == size or name[end] != "@":
+        break
+      idx = end + 1
+    return (_qualification(name[start:idx]), core)
 
   @staticmethod
   def __read_mangled(name: str) -> str:
     """Reads a simply mangled or nested name function symbol."""
     (qualif, core) = Demangler.__read(name, 1)
     return qualif + core
-  
+
   @staticmethod
   def __read_special(name: str) -> str:
     """Reads a special name function symbol."""
@@ -156,78 +725,28 @@ class Demangler:
     # the name should be ignored
     if code == "__" or SPECIAL_NAME_CODES[code] == "":
       return ""
-    
-    # ignore "??X@<...>" and "??XX@<...>"
-    if name[2 + len(code)] == "@":
+
+    # ignore "??X@<...>" and "??XX@<...>" (and truncated names)
+    if len(name) <= 2 + len(code) or name[2 + len(code)] == "@":
       return ""
-    
+
+    if code not in _NAMED_CODES:
+      raise Exception(f"Unknown special name code: {code}")
+
+    # name offset, skips template name prefix "?$"
+    offset = 2 + len(code)
+    if name[offset] == "?" and name[offset + 1] == "$":
+      offset += 2
+    (qualif, core) = Demangler.__read(name, offset)
+
     match code:
       case "0":
-        offset = 5 if name[3] == "?" and name[4] == "$" else 3
-        (qualif, core) = Demangler.__read(name, offset)
-
         return f"{qualif}{core}::{core}"
-
       case "1":
-        offset = 5 if name[3] == "?" and name[4] == "$" else 3
-        (qualif, core) = Demangler.__read(name, offset)
-
         return f"{qualif}{core}::~{core}"
-      
-      case (
-      "2" |
-      "3" |
-      "4" |
-      "5" |
-      "6" |
-      "7" |
-      "8" |
-      "9" |
-      "A" |
-      "C" |
-      "D" |
-      "E" |
-      "F" |
-      "G" |
-      "H" |
-      "I" |
-      "J" |
-      "K" |
-      "L" |
-      "M" |
-      "N" |
-      "O" |
-      "P" |
-      "Q" |
-      "R" |
-      "S" |
-      "T" |
-      "U" |
-      "V" |
-      "W" |
-      "X" |
-      "Y" |
-      "Z"):
-        offset = 5 if name[3] == "?" and name[4] == "$" else 3
-        (qualif, core) = Demangler.__read(name, offset)
-
-        return f"{qualif}{core}::{SPECIAL_NAME_CODES[code]}"
-      case (
-      "_0" |
-      "_1" |
-      "_2" |
-      "_3" |
-      "_4" |
-      "_5" |
-      "_6" |
-      "_U" |
-      "_V"):
-        offset = 6 if name[4] == "?" and name[5] == "$" else 4
-        (qualif, core) = Demangler.__read(name, offset)
-        return f"{qualif}{core}::{SPECIAL_NAME_CODES[code]}"
       case _:
-        raise Exception(f"Unknown special name code: {code}")
-    
+        return f"{qualif}{core}::{SPECIAL_NAME_CODES[code]}"
+
   @staticmethod
   def __read_template(name: str) -> str:
     """Reads a templated args function symbol."""
@@ -0,0 +1,31 @@
+import os, sys, getopt
+import sqlite3
+from utils.db import DbException
+from utils.schema import ensure_indexes, print_report
+
+
+HELP = 'Usage:\npython indexdb.py --dbpath="<database path>"\n'
+
+def main(argv):
+  db_path = ""
+  opts, args = getopt.getopt(argv,"hd:",["dbpath="])
+  for opt, arg in opts:
+    if opt == '-h':
+      print(HELP)
+      sys.exit()
+    elif opt in ("-d", "--dbpath"):
+      db_path = arg
+
+  if db_path == "":
+    raise DbException(f"SQLite database path required\n{HELP}")
+  if not os.path.isfile(db_path):
+    raise DbException(f"Database not found at {db_path}")
+
+  conn = sqlite3.connect(db_path)
+  ensure_indexes(conn)
+  print_report(conn)
+  conn.close()
+
+
+if __name__ == "__main__":
+  main(sys.argv[1:])
@@ -2,155 +2,113 @@ import os, sys, getopt
 import sqlite3, json
 from io import TextIOWrapper
 from datetime import datetime
-from utils.db import DbException
-
-
-HELP = 'Usage:\npython mergedb.py --config=<JSON file path>\n'
-
-def add_db(in_cur: sqlite3.Cursor, out_conn: sqlite3.Connection, label: str):
-  """Adds one database to the dataset."""
+from hashlib import blake2b
+from typing import Dict, Tuple
+from utils.db import DbException, bulk_load
+from utils.schema import ensure_indexes
+
+
+HELP = 'Usage:\npython mergedb.py --config=<JSON file path> [--incremental]\n'
+
+MERGE_STATEMENTS = [
+  # binary name column added
+  ("pdb", "INSERT INTO main.pdb SELECT ?, * FROM src.pdb ORDER BY rowid"),
+  # id column swapped out for binary name
+  ("funcs", "INSERT INTO main.funcs SELECT ?, func_addr, nb_referrers, nb_strings, nb_referees, instructions FROM src.funcs ORDER BY rowid"),
+  # binary name column added
+  ("strings", "INSERT INTO main.strings SELECT ?, * FROM src.strings ORDER BY rowid"),
+  # binary name column added
+  ("tokens", "INSERT INTO main.tokens SELECT ?, * FROM src.tokens ORDER BY rowid"),
+  # (global) id added (autoincremented primary key)
+  # binary name added
+  # id renamed to local_id (unique in a binary)
+  ("paths", """INSERT INTO main.paths (binary,local_id,func_addr,string_addr,path_func1,path_func2,path_func3,ref_depth,is_upward,to_name)
+            SELECT ?, * FROM src.paths ORDER BY rowid"""),
+  # binary name added
+  # path_id renamed to local_path_id (unique in a binary)
+  # the primary key is binary + local_path_id + token_literal
+  ("token_paths", "INSERT INTO main.token_paths SELECT ?, * FROM src.token_paths ORDER BY rowid"),
+]
+"""Per-table statements copying the rows of an attached input database (includes unlabelled samples)."""
+
+CACHE_SIZE = -262144
+"""Page cache size of the output database during the merge (in KiB when negative)."""
+
+HASH_CHUNK_SIZE = 1 << 20
+"""Number of bytes read at once when hashing input databases."""
+
+def get_file_hash(path: str) -> str:
+  """Returns the content hash of a file."""
+  digest = blake2b(digest_size=16)
+  with open(path, "rb") as file:
+    for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+      digest.update(chunk)
+  return digest.hexdigest()
+
+def get_manifest(out_cur: sqlite3.Cursor) -> Dict[str, tuple]:
+  """Returns `(path, size, mtime, hash)` of the merged binaries by label."""
+  out_cur.execute("SELECT label, path, size, mtime, hash FROM merge_manifest")
+  return {row[0]: row[1:] for row in out_cur.fetchall()}
+
+def delete_db(out_cur: sqlite3.Cursor, label: str):
+  """Deletes all rows of one binary from the dataset and its manifest."""
+  for table, _ in MERGE_STATEMENTS:
+    out_cur.execute(f"DELETE FROM main.{table} WHERE binary = ?", (label,))
+  out_cur.execute("DELETE FROM main.merge_manifest WHERE label = ?", (label,))
+
+def add_db(out_conn: sqlite3.Connection, input_path: str, label: str, source: Tuple[int, int, str] | None = None):
+  """Adds one database to the dataset, the rows are copied by SQLite in one transaction.
+
+  With `(size, mtime, hash)` of the input the binary replaces its previous rows and is recorded in the manifest."""
   out_cur = out_conn.cursor()
-
-  pdb_funcs = []
-  funcs = []
-  strings = []
-  tokens = []
-  paths =[]
-  tpaths = []
-
-  # Query the data (includes unlabelled samples)
-
-  try:
-    in_cur.execute("SELECT * FROM pdb")
-    pdb_funcs = in_cur.fetchall()
-  except Exception as ex:
-    print(ex)
-    sys.exit()
-
-  try:
-    in_cur.execute("SELECT * FROM funcs")
-    funcs = in_cur.fetchall()
-  except Exception as ex:
-    print(ex)
-    sys.exit()
-
-  try:
-    in_cur.execute("SELECT * FROM strings")
-    strings = in_cur.fetchall()
-  except Exception as ex:
-    print(ex)
-    sys.exit()
-  
-  try:
-    in_cur.execute("SELECT * FROM tokens")
-    tokens = in_cur.fetchall()
-  except Exception as ex:
-    print(ex)
-    sys.exit()
-
+  # cannot be attached inside of a transaction
+  out_conn.commit()
+  out_cur.execute("ATTACH DATABASE ? AS src", (input_path,))
   try:
-    in_cur.execute("SELECT * FROM paths")
-    paths = in_cur.fetchall()
-  except Exception as ex:
-    print(ex)
-    sys.exit()
-
-  try:
-    in_cur.execute("SELECT * FROM token_paths")
-    tpaths = in_cur.fetchall()
-  except Exception as ex:
-    print(ex)
-    sys.exit()
-
-  # Insert the data with transformed primary keys
-
-  for pdbf in pdb_funcs:
-    try:
-      # binary name column added
-      out_cur.execute(
-        "INSERT INTO pdb VALUES (?,?,?,?)", (label, pdbf[0], pdbf[1], pdbf[2])
-      )
-    except Exception as ex:
-      print(ex)
-      break
-    
-  print(f"Merged `pdb` of {label}")
-    
-  for func in funcs:
-    try:
-      # id column swapped out for binary name
-      out_cur.execute(
-        "INSERT INTO funcs VALUES (?,?,?,?,?,?)", (label, func[1], func[2], func[3], func[4], func[5])
-      )
-    except Exception as ex:
-      print(ex)
-      break
-    
-  print(f"Merged `funcs` of {label}")
-    
-  for string in strings:
-    try:
-      # binary name column added
-      out_cur.execute(
-        "INSERT INTO strings VALUES (?,?,?)", (label, string[0], string[1])
-      )
-    except Exception as ex:
-      print(ex)
-      break
-    
-  print(f"Merged `strings` of {label}")
-    
-  for tkn in tokens:
-    # skip unlabelled tokens
-    # if tkn[2] is None:
-    #   continue
-    try:
-      # binary name column added
-      out_cur.execute(
-        "INSERT INTO tokens VALUES (?,?,?,?)", (label, tkn[0], tkn[1], tkn[2])
-      )
-    except Exception as ex:
-      print(ex)
-      break
-  
-  print(f"Merged `tokens` of {label}")
-    
-  for path in paths:
-    try:
-      # (global) id added (autoincremented primary key)
-      # binary name added
-      # id renamed to local_id (unique in a binary)
-      out_cur.execute(
-        "INSERT INTO paths (binary,local_id,func_addr,string_addr,path_func1,path_func2,path_func3,ref_depth,is_upward,to_name) VALUES (?,?,?,?,?,?,?,?,?,?)",
-        (label, path[0], path[1], path[2], path[3], path[4], path[5], path[6], path[7], path[8])
-      )
-    except Exception as ex:
-      print(ex)
-      break
-    
-  print(f"Merged `paths` of {label}")
-    
-  for tpath in tpaths:
-    try:
-      # binary name added
-      # path_id renamed to local_path_id (unique in a binary)
-      # the primary key is binary + local_path_id + token_literal
-      out_cur.execute(
-        "INSERT INTO token_paths VALUES (?,?,?,?,?,?)",
-        (label, tpath[0], tpath[1], tpath[2], tpath[3], tpath[4])
-      )
-    except Exception as ex:
-      print(ex)
-      break
-
-  print(f"Merged `token_paths` of {label}")
-
-def merge_db(config_file: TextIOWrapper):
-  """Merges single-binary databases into one dataset."""
+    if source is not None:
+      delete_db(out_cur, label)
+
+    row_counts = {}
+    failed = []
+    for table, statement in MERGE_STATEMENTS:
+      try:
+        out_cur.execute(statement, (label,))
+      # 'no such table: src.x'
+      except sqlite3.OperationalError as ex:
+        print(ex)
+        sys.exit()
+      except sqlite3.IntegrityError as ex:
+        print(ex)
+        row_counts[table] = 0
+        failed.append(table)
+        continue
+      row_counts[table] = out_cur.rowcount
+      print(f"Merged `{table}` of {label}")
+
+    # left out of the manifest, the next incremental merge retries the binary
+    if source is not None and len(failed) > 0:
+      print(f"Not recorded in the manifest, failed tables of {label}: {', '.join(failed)}")
+    elif source is not None:
+      size, mtime, digest = source
+      out_cur.execute("INSERT INTO main.merge_manifest VALUES (?,?,?,?,?,?,?)",
+                      (label, input_path, size, mtime, digest, json.dumps(row_counts), datetime.now().isoformat()))
+    out_conn.commit()
+  finally:
+    out_conn.rollback()
+    out_cur.execute("DETACH DATABASE src")
+
+def merge_db(config_file: TextIOWrapper, incremental: bool = False):
+  """Merges single-binary databases listed in a JSON config file into one dataset."""
+  merge(json.load(config_file), incremental)
+
+def merge(config: dict, incremental: bool = False):
+  """Merges single-binary databases into one dataset.
+
+  Incremental merge only replaces the binaries which are new or changed since the last merge and removes the ones
+  missing from the config."""
   
   print(f"start:\t{datetime.now()}")
 
-  config = json.load(config_file)
   output_file = config["outputFile"]
   files = config["files"]
 
@@ -204,38 +162,79 @@ def merge_db(config_file: TextIOWrapper):
               string_addr INTEGER NOT NULL,
               token_literal TEXT NOT NULL,
               names_func INTEGER)''')
+
+  # merged binaries, kept by incremental merges
+  if incremental:
+    output_cur.execute('''CREATE TABLE IF NOT EXISTS merge_manifest (
+                label TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime INTEGER NOT NULL,
+                hash TEXT NOT NULL,
+                row_counts TEXT NOT NULL,
+                merged_at TEXT NOT NULL)''')
   
   output_conn.commit()
   print(f"Tables created")
 
-  for file in files:
-    label = file["label"]
-    input_path = file["path"]
-
-    if not os.path.isfile(input_path):
-      raise DbException(f"Input database not found at {input_path}")
-
-    input_conn = sqlite3.connect(input_path)
-    input_cur = input_conn.cursor()
-
-    add_db(input_cur, output_conn, label)
-    input_conn.close()
-    output_conn.commit()
-    print(f"Committed {label}")
-
+  output_cur.execute(f"PRAGMA cache_size={CACHE_SIZE}")
+
+  with bulk_load(output_conn):
+    manifest = get_manifest(output_cur) if incremental else {}
+    labels = set(file["label"] for file in files)
+    for label in manifest:
+      if label not in labels:
+        delete_db(output_cur, label)
+        output_conn.commit()
+        print(f"Removed {label}")
+
+    for file in files:
+      label = file["label"]
+      input_path = file["path"]
+
+      if not os.path.isfile(input_path):
+        raise DbException(f"Input database not found at {input_path}")
+
+      if not incremental:
+        add_db(output_conn, input_path, label)
+        print(f"Committed {label}")
+        continue
+
+      stat = os.stat(input_path)
+      entry = manifest.get(label)
+      if entry is not None and entry[:3] == (input_path, stat.st_size, stat.st_mtime_ns):
+        print(f"Skipped unchanged {label}")
+        continue
+
+      # touched or moved files are compared by content
+      digest = get_file_hash(input_path)
+      if entry is not None and entry[3] == digest:
+        output_cur.execute("UPDATE merge_manifest SET path = ?, size = ?, mtime = ? WHERE label = ?", (input_path, stat.st_size, stat.st_mtime_ns, label))
+        output_conn.commit()
+        print(f"Skipped unchanged {label}")
+        continue
+
+      add_db(output_conn, input_path, label, (stat.st_size, stat.st_mtime_ns, digest))
+      print(f"Committed {label}")
+
+  # created after the data is loaded
+  ensure_indexes(output_conn)
   output_conn.close()
   print(f"end:\t{datetime.now()}")
 
 
 def main(argv):
   config_path = ""
-  opts, args = getopt.getopt(argv,"hc:",["config="])
+  incremental = False
+  opts, args = getopt.getopt(argv,"hc:i",["config=", "incremental"])
   for opt, arg in opts:
     if opt == '-h':
       print(HELP)
       sys.exit()
     elif opt in ("-c", "--config"):
       config_path = arg
+    elif opt in ("-i", "--incremental"):
+      incremental = True
 
   if config_path == "":
     raise DbException(f"Config JSON file path required\n{HELP}")
@@ -243,7 +242,7 @@ def main(argv):
     raise DbException(f"Config JSON file not found at {config_path}")
   
   config_file = open(config_path)
-  merge_db(config_file)
+  merge_db(config_file, incremental)
   config_file.close()
   
 
@@ -1,12 +1,78 @@
 import os, sys, getopt
 import sqlite3, json
+from collections import deque
 from io import TextIOWrapper
 from datetime import datetime
-from utils.db import DbException
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+from utils.db import DbException, bulk_load, execute_chunked
+from utils.jsonstream import iter_array
+from utils.schema import ensure_indexes
 from demangler.demangler import Demangler
+from tokens.parallel import BATCHES_PER_JOB, get_jobs
 
 
-HELP = 'Usage:\npython pdb.py --dbpath=<database path> --json=<JSON file path>\n'
+HELP = 'Usage:\npython pdb.py --dbpath=<database path> --json=<JSON file path> [--stream] [--jobs=<worker processes, 0 for all CPUs>]\n'
+
+BATCH_SIZE = 2048
+"""Number of functions sent to a demangling worker at once."""
+
+def is_irrelevant(name: str) -> bool:
+  """Returns whether a function name is compiler-generated, anonymous or local (quoted by the compiler or the demangler)."""
+  return "`" in name or "'" in name or "<lambda_" in name or "<unnamed-type-" in name
+
+def get_pdb_row(address: int, name: str) -> Tuple[int, str, int] | None:
+  """Returns the `pdb` row of a function, `None` for irrelevant functions and ignored special names."""
+  if is_irrelevant(name):
+    return None
+
+  if name[0] == "?":
+    name = Demangler.process_mangled(name)
+    # ignored special name, or compiler-generated and local names decoded from the mangling
+    if name == "" or is_irrelevant(name):
+      return None
+    return (address, name, 1)
+  return (address, Demangler.process_unmangled(name), 0)
+
+def _demangle_batch(funcs: List[Tuple[int, str]]) -> List[Tuple[int, str, int] | None]:
+  """Demangles a batch of `(address, name)` pairs in a worker process."""
+  return [get_pdb_row(address, name) for address, name in funcs]
+
+def demangle_all(funcs: Iterable[dict], jobs: int = 1, batch_size: int = BATCH_SIZE) -> Iterator[Tuple[int, str, int] | None]:
+  """Demangles PDB functions with `jobs` worker processes, yields their `pdb` rows (or `None`) in input order."""
+  pairs = ((func["address"], func["name"]) for func in funcs)
+  # no pool overhead for serial runs
+  if jobs <= 1:
+    for address, name in pairs:
+      yield get_pdb_row(address, name)
+    return
+
+  # deferred, `concurrent.futures` indirectly imports the standard `tokenize` module
+  # which is shadowed by `tokenize.py` script
+  from concurrent.futures import ProcessPoolExecutor
+
+  pending = deque()
+  with ProcessPoolExecutor(max_workers=jobs) as executor:
+    while True:
+      # keep the workers busy, the number of queued batches bounds the memory
+      while len(pending) < jobs * BATCHES_PER_JOB:
+        batch = list(islice(pairs, batch_size))
+        if len(batch) == 0:
+          break
+        pending.append(executor.submit(_demangle_batch, batch))
+
+      if len(pending) == 0:
+        return
+      yield from pending.popleft().result()
+
+def get_unique_rows(rows: Iterable[Tuple[int, str, int] | None]) -> Iterator[Tuple[int, str, int]]:
+  """Yields the rows with names not seen before, first occurrence wins (same as the UNIQUE constraint)."""
+  seen = set()
+  for row in rows:
+    if row is None or row[1] in seen:
+      continue
+    seen.add(row[1])
+    yield row
 
 def process_pdb(conn: sqlite3.Connection, file: TextIOWrapper):
   """Demangles and saves PDB functions in the database."""
@@ -18,29 +84,13 @@ def process_pdb(conn: sqlite3.Connection, file: TextIOWrapper):
   
   pdb = json.load(file)
   
-  for func in range(len(pdb)):
-    name = pdb[func]["name"]
-
-    # irrelevant function
-    if "`" in name or "'" in name or "<lambda_" in name or "<unnamed-type-" in name:
+  for func in pdb:
+    row = get_pdb_row(func["address"], func["name"])
+    if row is None:
       continue
-    
-    demangled = 1
-    if name[0] == "?":
-      name = Demangler.process_mangled(name)
-
-      # ignored special name
-      if name == "":
-        continue
-
-      pdb[func]["name"] = name
-    else:
-      name = Demangler.process_unmangled(name)
-      pdb[func]["name"] = name
-      demangled = 0
 
     try:
-      c.execute("INSERT INTO pdb VALUES (?,?,?)", (pdb[func]["address"], name, demangled))
+      c.execute("INSERT INTO pdb VALUES (?,?,?)", row)
     # Skip duplicate errors on UNIQUE db constraint ('UNIQUE constraint failed: pdb.literal')
     except sqlite3.IntegrityError:
       pass
@@ -50,11 +100,41 @@ def process_pdb(conn: sqlite3.Connection, file: TextIOWrapper):
 
   print(f"end:\t{datetime.now()}")
 
+def process_pdb_stream(conn: sqlite3.Connection, file: TextIOWrapper, jobs: int = 1):
+  """Streaming variant of `process_pdb`, reads the JSON file in chunks, demangles in batches
+  with `jobs` worker processes and writes the functions in one WAL-journaled transaction."""
+  start = datetime.now()
+  print(f"start:\t{start}")
+  c = conn.cursor()
+  with bulk_load(conn):
+    # same schema as `process_pdb`
+    c.execute('''CREATE TABLE IF NOT EXISTS pdb
+                (func_addr integer NOT NULL, literal text UNIQUE, demangled integer NOT NULL)''')
+
+    funcs = 0
+    def count(items: Iterable[dict]) -> Iterator[dict]:
+      nonlocal funcs
+      for item in items:
+        funcs += 1
+        yield item
+
+    # OR IGNORE skips names already present in the table
+    changes = conn.total_changes
+    rows = execute_chunked(c, "INSERT OR IGNORE INTO pdb VALUES (?,?,?)", get_unique_rows(demangle_all(count(iter_array(file)), jobs)))
+    inserted = conn.total_changes - changes
+
+  end = datetime.now()
+  elapsed = max((end - start).total_seconds(), 1e-6)
+  print(f"Processed {funcs} functions into {rows} unique names, {inserted} inserted ({funcs / elapsed:.0f} functions/s)")
+  print(f"end:\t{end}")
+
 
 def main(argv):
   db_path = ""
   file_path = ""
-  opts, args = getopt.getopt(argv,"hdj:",["dbpath=", "json="])
+  stream = False
+  jobs = 1
+  opts, args = getopt.getopt(argv,"hdj:s",["dbpath=", "json=", "stream", "jobs="])
   for opt, arg in opts:
     if opt == '-h':
       print(HELP)
@@ -63,6 +143,10 @@ def main(argv):
       db_path = arg
     elif opt in ("-j", "--json"):
       file_path = arg
+    elif opt in ("-s", "--stream"):
+      stream = True
+    elif opt == "--jobs":
+      jobs = get_jobs(arg)
 
   if db_path == "":
     raise DbException(f"SQLite database path required\n{HELP}")
@@ -74,9 +158,13 @@ def main(argv):
     raise DbException(f"JSON file not found at {file_path}")
 
   conn = sqlite3.connect(db_path)
+  ensure_indexes(conn)
   file = open(file_path)
   
-  process_pdb(conn, file)
+  if stream:
+    process_pdb_stream(conn, file, jobs)
+  else:
+    process_pdb(conn, file)
 
   file.close()
   conn.commit()
@@ -0,0 +1,118 @@
+import random, unittest
+from demangler.demangler import Demangler, DemanglerException, SymbolDecoder
+from demangler.reference import ReferenceDemangler
+from pdb import get_pdb_row
+from utils.corpus import MANGLED_SIGNATURES
+
+CORPUS_SIZE = 20000
+"""Number of symbols in differential tests."""
+
+SYMBOLS = [
+  # plain names
+  ("?Read@CFile@MFC@@QAEXXZ", "MFC::CFile::Read"),
+  ("?_Xlength_error@std@@YAXPBD@Z", "std::_Xlength_error"),
+  ("?what@exception@std@@UBEPBDXZ", "std::exception::what"),
+  ("?x@@3HA", "x"),
+  ("??0CFile@@QAE@XZ", "CFile::CFile"),
+  ("??1exception@std@@UAE@XZ", "std::exception::~exception"),
+  ("??_UCFile@@SAPAXI@Z", "CFile::operator new[]"),
+  # templates
+  ("??0?$basic_string@DU?$char_traits@D@std@@V?$allocator@D@2@@std@@QAE@XZ",
+   "std::basic_string<char,std::char_traits<char>,std::allocator<char> >::basic_string<char,std::char_traits<char>,std::allocator<char> >"),
+  ("?push_back@?$vector@HV?$allocator@H@std@@@std@@QAEXABH@Z", "std::vector<int,std::allocator<int> >::push_back"),
+  ("??4?$shared_ptr@VFoo@@@std@@QAEAAV01@ABV01@@Z", "std::shared_ptr<Foo>::operator ="),
+  ("??$Get@H@Foo@@YAHXZ", "Foo::Get<int>"),
+  ("??$?0H@Foo@@QAE@H@Z", "Foo::Foo<int>"),
+  ("??$?6U?$char_traits@D@std@@@std@@YAAAV?$basic_ostream@DU?$char_traits@D@std@@@0@AAV10@PBD@Z", "std::operator <<<std::char_traits<char> >"),
+  ("??$?6H@@YAXXZ", "operator <<<int>"),
+  ("?f@?$A@V?$B@H@@V1@@@QAEXXZ", "A<B<int>,B<int> >::f"),
+  # template arguments
+  ("??0?$array@H$02@std@@QAE@XZ", "std::array<int,3>::array<int,3>"),
+  ("?f@?$A@$0?0@@QAEXXZ", "A<-1>::f"),
+  ("?f@?$A@$0BA@@@QAEXXZ", "A<16>::f"),
+  ("?f@?$A@_N@@QAEXXZ", "A<bool>::f"),
+  ("?f@?$A@PBD@@QAEXXZ", "A<char const *>::f"),
+  ("?f@?$A@PEAUB@@@@QEAAXXZ", "A<B *>::f"),
+  ("?f@?$Holder@P6AXH@Z@@QAEXXZ", "Holder<void (__cdecl*)(int)>::f"),
+  ("?f@?$A@P8B@@AEXH@Z@@QAEXXZ", "A<void (__thiscall B::*)(int)>::f"),
+  ("?f@?$A@PQB@@H@@QAEXXZ", "A<int B::*>::f"),
+  ("?f@?$A@$1?g_x@@3HA@@QAEXXZ", "A<&g_x>::f"),
+  # back-references and nested names
+  ("?g@B@A@1@YAXXZ", "B::A::B::g"),
+  ("?foo@?A0x1b2c3d4e@@YAXXZ", "`anonymous namespace'::foo"),
+  ("?Run@Local@?1??foo@@YAXXZ@QAEXXZ", "`foo'::`2'::Local::Run"),
+  # special names
+  ("??2@YAPAXI@Z", "operator new"),
+  ("??_U@YAPAXI@Z", "operator new[]"),
+  ("??BFoo@@QBEHXZ", "Foo::operator int"),
+  ("??_Gexception@std@@UAEPAXI@Z", "std::exception::`scalar deleting destructor'"),
+  ("??__Eg_table@@YAXXZ", "`dynamic initializer for 'g_table''"),
+  # data
+  ("??_7exception@std@@6B@", ""),
+  ("??_R0?AVFoo@@@8", ""),
+  ("??_C@_05ABCDEF@hello?$AA@", ""),
+]
+"""Real PDB symbols and their decoded names."""
+
+IDENTIFIERS = ["TArray", "FString", "UObject", "vector", "allocator", "oo2", "Update", "Tick", "x64", "_Ptr"]
+"""Names of the plain symbols of differential tests."""
+
+
+def result(function, name: str):
+  """Returns the result of a demangling function or the type of the raised exception."""
+  try:
+    return function(name)
+  except Exception as ex:
+    return type(ex)
+
+
+class TestCase(unittest.TestCase):
+
+  def test_symbols(self):
+    for name, expected in SYMBOLS:
+      self.assertEqual(Demangler.process_mangled(name), expected, name)
+
+  def test_unmangled(self):
+    self.assertEqual(Demangler.process_unmangled("_WinMain@16"), "_WinMain")
+    self.assertEqual(Demangler.process_unmangled("Foo$thunk"), "Foo")
+    self.assertEqual(Demangler.process_unmangled("Foo::Bar"), "Foo::Bar")
+
+  def test_pdb_rows(self):
+    # quoted special, anonymous and local names are not function names
+    for name in ["??_GFoo@@UAEPAXI@Z", "??__Eg_table@@YAXXZ", "?f@?A0x1234@@YAXXZ", "?x@?1??f@@YAXXZ@4HA",
+                 "?f@?$A@V<lambda_1>@@@@QAEXXZ", "??_7exception@std@@6B@", "`string'"]:
+      self.assertIsNone(get_pdb_row(0, name), name)
+    self.assertEqual(get_pdb_row(16, "?push_back@?$vector@HV?$allocator@H@std@@@std@@QAEXABH@Z"),
+                     (16, "std::vector<int,std::allocator<int> >::push_back", 1))
+    self.assertEqual(get_pdb_row(32, "_WinMain@16"), (32, "_WinMain", 0))
+
+  def test_fallback(self):
+    # unsupported encodings keep the core name and plain scopes
+    self.assertRaises(DemanglerException, SymbolDecoder("?f@?$A@$2AB@@@QAEXXZ").function_name)
+    self.assertEqual(Demangler.process_mangled("?f@?$A@$2AB@@@QAEXXZ"), "f")
+
+  def test_plain_differential(self):
+    # names without templates and back-references are decoded as before
+    rand = random.Random(0)
+    prefixes = ["?", "??0", "??1", "??4", "??H", "??_U", "??_7"]
+    for _ in range(CORPUS_SIZE):
+      scopes = [rand.choice(IDENTIFIERS) for _ in range(rand.randint(1, 4))]
+      name = rand.choice(prefixes) + "@".join(scopes) + "@@" + rand.choice(MANGLED_SIGNATURES)
+      self.assertEqual(Demangler.process_mangled(name), ReferenceDemangler.process_mangled(name), name)
+
+  def test_fuzz(self):
+    # decoding errors are contained, no new exceptions over the reference
+    rand = random.Random(0)
+    alphabet = "?@$_0126ABDHPQUVXYZ8aé"
+    for _ in range(CORPUS_SIZE):
+      name = "?" + "".join(rand.choice(alphabet) for _ in range(rand.randrange(0, 20)))
+      try:
+        SymbolDecoder(name).function_name()
+      except DemanglerException:
+        pass
+      if not isinstance(result(Demangler.process_mangled, name), str):
+        self.assertNotIsInstance(result(ReferenceDemangler.process_mangled, name), str, repr(name))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -1,7 +1,21 @@
-import unittest
+import itertools, os, random, tempfile, unittest
 from tokens.lexer import Lexer, MetaToken, MetaTokenType
 from tokens.preparser import PreParser
 from tokens.tokenizer import Tokenizer, tokenize
+from tokens.reference import ReferenceLexer, ReferencePreParser, ReferenceTokenizer
+from tokens.parallel import tokenize_all
+from tokens.cache import TokenCache
+from utils.corpus import make_corpus, make_function_name, make_operator_name, make_template
+
+CORPUS_SIZE = 5000
+"""Number of literals in differential tests."""
+
+TEMPLATE_CHAINS = ["A<T><U>B<T>::C<T><U>", "A<T><U>A<U><U>", "x<U><T>B<T><U>", "A<T><T>C<T><T>", "A<T><U>B<T><U>C<T><U>",
+                   "A<T>::A<T><U>B<T>::B<T><U>", "A<T><U>B::~B<U>"]
+"""Identifiers with chained templates, joins consuming post-templates of neighbouring matches."""
+
+TEMPLATE_CHAIN_PARTS = ["A", "B", "C", "x", "<T>", "<U>", "::", "::~", " "]
+"""Building blocks of random template chains in differential tests."""
 
 
 class TestCase(unittest.TestCase):
@@ -46,6 +60,111 @@ class TestCase(unittest.TestCase):
       self.assertEqual(result[idx].token, expected[idx].token)
       self.assertEqual(result[idx].type, expected[idx].type)
 
+  def test_lexer_differential(self):
+    lexer = Lexer("")
+    reference = ReferenceLexer("")
+    for input in make_corpus(CORPUS_SIZE) + ["a\u00b2b", "\u0663x::~y\\\\\\z:::"]:
+      lexer.reset(input)
+      reference.reset(input)
+      result = [(mt.token, mt.type) for mt in lexer.metatokens()]
+      expected = [(mt.token, mt.type) for mt in reference.metatokens()]
+      self.assertEqual(result, expected, input)
+
+  def test_operator_tables(self):
+    preparser = PreParser([])
+    reference = ReferencePreParser([])
+    # all mtoken types for every lookahead length
+    for length in range(1, 4):
+      for types in itertools.product(MetaTokenType, repeat=length):
+        mtokens = [MetaToken("", type) for type in types]
+        preparser.reset(mtokens)
+        reference.reset(mtokens)
+        self.assertEqual(preparser.try_parse_operator(), reference.try_parse_operator(), types)
+
+  def test_operators_differential(self):
+    lexer = Lexer("")
+    preparser = PreParser([])
+    reference = ReferencePreParser([])
+    rand = random.Random(0)
+    names = [make_operator_name(rand) for _ in range(CORPUS_SIZE)]
+    for input in make_corpus(CORPUS_SIZE) + names + ["operator", "operator ", "a::operator\\\\b"]:
+      lexer.reset(input)
+      preparser.reset(lexer.metatokens())
+      lexer.reset(input)
+      reference.reset(lexer.metatokens())
+      result = [(mt.token, mt.type) for mt in preparser.make_operator_ids()]
+      expected = [(mt.token, mt.type) for mt in reference.make_operator_ids()]
+      self.assertEqual(result, expected, input)
+
+  def test_templates_differential(self):
+    lexer = Lexer("")
+    preparser = PreParser([])
+    reference = ReferencePreParser([])
+    rand = random.Random(0)
+    templates = [make_template(rand, rand.randint(1, 6)) for _ in range(CORPUS_SIZE // 10)]
+    for input in make_corpus(CORPUS_SIZE) + templates + ["<a>>", "<a>b>", "a>b<c>", "<.>x>", ">>>", "a<b<c>.d>"]:
+      lexer.reset(input)
+      preparser.reset(lexer.metatokens())
+      metatokens = preparser.make_operator_ids()
+      preparser.reset(list(metatokens))
+      reference.reset(list(metatokens))
+      result = [(mt.token, mt.type) for mt in preparser.make_templates()]
+      expected = [(mt.token, mt.type) for mt in reference.make_templates()]
+      self.assertEqual(result, expected, input)
+
+  def test_patterns_differential(self):
+    lexer = Lexer("")
+    preparser = PreParser([])
+    tokenizer = Tokenizer([])
+    reference = ReferenceTokenizer([])
+    rand = random.Random(0)
+    names = [make_function_name(rand) for _ in range(CORPUS_SIZE)]
+    chains = ["".join(rand.choice(TEMPLATE_CHAIN_PARTS) for _ in range(rand.randint(1, 9))) for _ in range(CORPUS_SIZE)]
+    for input in make_corpus(CORPUS_SIZE) + names + chains + TEMPLATE_CHAINS + ["A::A::B::B", "a::b::c::d", "A<T>::A<T><U><V>", "x A::~A y::~y", "A<T><U> x::y", "A<T><U>"]:
+      lexer.reset(input)
+      preparser.reset(lexer.metatokens())
+      preparser.reset(preparser.make_operator_ids())
+      metatokens = preparser.make_templates()
+      tokenizer.reset(list(metatokens))
+      reference.reset(list(metatokens))
+      result = [(mt.token, mt.type) for mt in tokenizer.match_patterns()]
+      expected = [(mt.token, mt.type) for mt in reference.match_patterns()]
+      self.assertEqual(result, expected, input)
+
+  def test_pipeline_differential(self):
+    lexer, preparser, tokenizer = Lexer(""), PreParser([]), Tokenizer([])
+    references = ReferenceLexer(""), ReferencePreParser([]), ReferenceTokenizer([])
+    rand = random.Random(0)
+    names = [make_function_name(rand) for _ in range(CORPUS_SIZE // 2)] + [make_operator_name(rand) for _ in range(CORPUS_SIZE // 2)]
+    for input in make_corpus(CORPUS_SIZE) + names:
+      result = [(mt.token, mt.type) for mt in tokenize(input, lexer, preparser, tokenizer)]
+      expected = [(mt.token, mt.type) for mt in tokenize(input, *references)]
+      self.assertEqual(result, expected, input)
+
+  def test_parallel(self):
+    corpus = make_corpus(CORPUS_SIZE)
+    items = list(enumerate(corpus))
+    serial = [(key, [t.token for t in tokens]) for key, tokens in tokenize_all(items)]
+    parallel = [(key, [t.token for t in tokens]) for key, tokens in tokenize_all(items, jobs=2, batch_size=64)]
+    self.assertEqual(parallel, serial)
+
+  def test_cache(self):
+    corpus = make_corpus(500)
+    with tempfile.TemporaryDirectory() as dir:
+      path = os.path.join(dir, "cache.db")
+      cache = TokenCache(path)
+      expected = [[(t.token, t.type) for t in tokens] for _, tokens in tokenize_all(enumerate(corpus + corpus), cache=cache)]
+      self.assertEqual(cache.misses, len(set(corpus)))
+      self.assertEqual(cache.memory_hits, len(corpus) * 2 - len(set(corpus)))
+      cache.close()
+
+      # served from the store only
+      cache = TokenCache(path, size=1)
+      result = [[(t.token, t.type) for t in tokens] for _, tokens in tokenize_all(enumerate(corpus + corpus), cache=cache)]
+      self.assertEqual(result, expected)
+      self.assertEqual(cache.misses, 0)
+      cache.close()
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,78 @@
+import io, json, random, unittest
+from utils.jsonstream import iter_array
+from utils.search import AhoCorasick, ascii_lower
+
+
+class TestCase(unittest.TestCase):
+
+  def test_aho_corasick(self):
+    patterns = ["he", "she", "his", "hers", "use"]
+    automaton = AhoCorasick(patterns)
+    self.assertEqual(automaton.find("ushers"), {0, 1, 3})
+    self.assertEqual(automaton.find("houses"), {4})
+    self.assertEqual(automaton.find("this"), {2})
+    self.assertEqual(automaton.find("HERS"), set())
+    self.assertEqual(automaton.find(""), set())
+
+  def test_aho_corasick_ignore_case(self):
+    # ASCII-only case folding, same as SQLite `LIKE`
+    automaton = AhoCorasick(["Read", "ÄBC", "_"], ignore_case=True)
+    self.assertEqual(automaton.find("CFile::READ"), {0})
+    self.assertEqual(automaton.find("äbc"), set())
+    self.assertEqual(automaton.find("x_y"), {2})
+    self.assertEqual(automaton.find("xy"), set())
+
+  def test_aho_corasick_empty_pattern(self):
+    automaton = AhoCorasick(["", "a"])
+    self.assertEqual(automaton.find(""), {0})
+    self.assertEqual(automaton.find("bab"), {0, 1})
+
+  def test_aho_corasick_differential(self):
+    rand = random.Random(0)
+    for ignore_case in (False, True):
+      for _ in range(200):
+        patterns = ["".join(rand.choice("abAB_") for _ in range(rand.randrange(1, 6))) for _ in range(rand.randrange(1, 10))]
+        automaton = AhoCorasick(patterns, ignore_case)
+        for _ in range(20):
+          text = "".join(rand.choice("abAB_c") for _ in range(rand.randrange(0, 30)))
+          if ignore_case:
+            expected = {idx for idx, pattern in enumerate(patterns) if ascii_lower(pattern) in ascii_lower(text)}
+          else:
+            expected = {idx for idx, pattern in enumerate(patterns) if pattern in text}
+          self.assertEqual(automaton.find(text), expected, (patterns, text))
+
+  def test_iter_array(self):
+    for read_size in (1, 2, 3, 7, 1024):
+      self.assertEqual(list(iter_array(io.StringIO(' [ 12345 , -1.5e3,"a,]b" ,{"x": [1, {}]}, true,null ] '), read_size)),
+                       [12345, -1.5e3, "a,]b", {"x": [1, {}]}, True, None])
+      self.assertEqual(list(iter_array(io.StringIO("[]"), read_size)), [])
+      self.assertEqual(list(iter_array(io.StringIO("[1]"), read_size)), [1])
+
+  def test_iter_array_invalid(self):
+    for text in ("", "{}", "[1", "[1 2]", "[1,]", "[,1]", '["a]'):
+      with self.assertRaises(ValueError, msg=text):
+        list(iter_array(io.StringIO(text), 2))
+
+  def test_iter_array_differential(self):
+    rand = random.Random(0)
+    def value(depth):
+      kind = rand.randrange(6 if depth < 3 else 4)
+      if kind == 0:
+        return rand.randrange(-10**6, 10**6)
+      if kind == 1:
+        return "".join(rand.choice('ab"\\\n,]}é') for _ in range(rand.randrange(8)))
+      if kind == 2:
+        return rand.choice([True, False, None, 0.25])
+      if kind == 3:
+        return rand.random() * 10**rand.randrange(-5, 5)
+      if kind == 4:
+        return [value(depth + 1) for _ in range(rand.randrange(4))]
+      return {str(idx): value(depth + 1) for idx in range(rand.randrange(4))}
+    for _ in range(100):
+      items = [value(0) for _ in range(rand.randrange(10))]
+      text = json.dumps(items, indent=rand.choice([None, 1]))
+      self.assertEqual(list(iter_array(io.StringIO(text), rand.randrange(1, 16))), items, text)
+
+
+if __name__ == '__main__':
+  unittest.main()
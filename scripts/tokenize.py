@@ -1,13 +1,14 @@
 import os, sys, getopt
 import sqlite3
 import datetime
-from tokens.lexer import Lexer
-from tokens.preparser import PreParser
-from tokens.tokenizer import Tokenizer, tokenize
-from utils.db import DbException
+from tokens.parallel import get_jobs, tokenize_all
+from tokens.cache import TokenCache
+from typing import Iterator, Tuple
+from utils.db import DbException, bulk_load, execute_chunked, iter_rows
+from utils.schema import ensure_indexes
 
 
-HELP = 'Usage:\npython tokenize.py --dbpath=<database path>'
+HELP = 'Usage:\npython tokenize.py --dbpath=<database path> [--bulk] [--jobs=<worker processes, 0 for all CPUs>] [--cache=<token cache db path>]'
 
 def check_columns(c: sqlite3.Cursor):
   """Validates column integrity of `strings`table."""
@@ -33,19 +34,29 @@ def check_columns(c: sqlite3.Cursor):
   if columns[0][1] == "literal" and columns[0][2] != "TEXT":
     raise DbException("Invalid 'literal' column type, required: TEXT")
 
-def make_tokens(conn: sqlite3.Connection):
-  c = conn.cursor()
+def select_strings(conn: sqlite3.Connection) -> sqlite3.Cursor:
+  """Validates `strings` table and returns a cursor over its rows."""
+  strings = conn.cursor()
   try:
-    c.execute("SELECT * FROM strings")
+    strings.execute("SELECT * FROM strings")
   # 'no such table: strings'
   except sqlite3.OperationalError as ex:
     print(ex)
     sys.exit()
 
-  strings = c.fetchall()
-
   # table integrity check
-  check_columns(c)
+  check_columns(conn.cursor())
+  return strings
+
+def get_token_rows(strings: sqlite3.Cursor, jobs: int = 1, cache: TokenCache | None = None) -> Iterator[Tuple[int, str]]:
+  """Yields `(string_addr, literal)` rows of all tokens, streaming the strings."""
+  for address, tokens in tokenize_all(iter_rows(strings), jobs, cache=cache):
+    for t in tokens:
+      yield address, t.token
+
+def make_tokens(conn: sqlite3.Connection, jobs: int = 1, cache: TokenCache | None = None):
+  strings = select_strings(conn)
+  c = conn.cursor()
 
   # create 'tokens' table
   # duplicates are okay since if a token is a function name can depend on its context
@@ -55,39 +66,60 @@ def make_tokens(conn: sqlite3.Connection):
               (string_addr integer NOT NULL, literal text UNIQUE, is_name integer)''')
 
   print(f"start:\t{datetime.datetime.now()}")
-  # process strings
-  lexer = Lexer("")
-  preparser = PreParser([])
-  tokenizer = Tokenizer([])
-
-  for address, string in strings:
-    tokens = tokenize(string, lexer, preparser, tokenizer)
+  # process strings, token records are written in batches
+  # OR IGNORE skips duplicates on UNIQUE db constraint ('UNIQUE constraint failed: tokens.literal')
+  execute_chunked(c, "INSERT OR IGNORE INTO tokens (string_addr, literal) VALUES (?,?)", get_token_rows(strings, jobs, cache))
 
-    # add token records
-    for t in tokens:
-      try:
-        c.execute("INSERT INTO tokens (string_addr, literal) VALUES (?,?)", (address, t.token))
-      # Skip duplicate errors on UNIQUE db constraint ('UNIQUE constraint failed: tokens.literal')
-      except sqlite3.IntegrityError:
-        pass
-      except Exception as ex:
-        print(ex)
-        break
-  
   conn.commit()
   conn.close()
 
   print(f"end:\t{datetime.datetime.now()}")
 
+def make_tokens_bulk(conn: sqlite3.Connection, jobs: int = 1, cache: TokenCache | None = None):
+  """Bulk variant of `make_tokens`, writes the tokens in one WAL-journaled transaction."""
+  c = conn.cursor()
+  # journal mode is switched before the strings are read
+  with bulk_load(conn):
+    strings = select_strings(conn)
+
+    # same schema as `make_tokens`
+    c.execute('''CREATE TABLE IF NOT EXISTS tokens
+                (string_addr integer NOT NULL, literal text UNIQUE, is_name integer)''')
+
+    start = datetime.datetime.now()
+    print(f"start:\t{start}")
+
+    # first occurrence wins, OR IGNORE skips literals already present in the table
+    changes = conn.total_changes
+    count = execute_chunked(c, "INSERT OR IGNORE INTO tokens (string_addr, literal) VALUES (?,?)", get_token_rows(strings, jobs, cache))
+    unique = conn.total_changes - changes
+
+  string_count = conn.execute("SELECT COUNT(*) FROM strings").fetchone()[0]
+  conn.close()
+
+  end = datetime.datetime.now()
+  elapsed = max((end - start).total_seconds(), 1e-6)
+  print(f"Processed {string_count} strings into {count} tokens, {unique} unique ({string_count / elapsed:.0f} strings/s, {count / elapsed:.0f} tokens/s)")
+  print(f"end:\t{end}")
+
 def main(argv):
   db_path = ""
-  opts, args = getopt.getopt(argv,"hd:",["dbpath="])
+  bulk = False
+  jobs = 1
+  cache_path = ""
+  opts, args = getopt.getopt(argv,"hd:bj:c:",["dbpath=", "bulk", "jobs=", "cache="])
   for opt, arg in opts:
     if opt == '-h':
       print(HELP)
       sys.exit()
     elif opt in ("-d", "--dbpath"):
       db_path = arg
+    elif opt in ("-b", "--bulk"):
+      bulk = True
+    elif opt in ("-j", "--jobs"):
+      jobs = get_jobs(arg)
+    elif opt in ("-c", "--cache"):
+      cache_path = arg
 
   if db_path == "":
     raise DbException(f"SQLite database path required\n{HELP}")
@@ -95,7 +127,14 @@ def main(argv):
     raise DbException(f"Database not found at {db_path}")
 
   conn = sqlite3.connect(db_path)
-  make_tokens(conn)
+  ensure_indexes(conn)
+  cache = TokenCache(cache_path)
+  if bulk:
+    make_tokens_bulk(conn, jobs, cache)
+  else:
+    make_tokens(conn, jobs, cache)
+  cache.close()
+  print(cache.stats())
 
 if __name__ == "__main__":
    main(sys.argv[1:])
@@ -5,6 +5,7 @@ from tokens.lexer import Lexer
 from tokens.preparser import PreParser
 from tokens.tokenizer import Tokenizer, tokenize
 from utils.db import DbException
+from utils.schema import ensure_indexes
 
 
 HELP = 'Usage:\npython tokenize_one.py --dbpath="<database path>" --offset=<string offset>'
@@ -98,6 +99,7 @@ def main(argv):
     raise Exception(f"Invalid string offset: {offset}")
 
   conn = sqlite3.connect(db_path)
+  ensure_indexes(conn)
   make_tokens(conn, offset)
 
 if __name__ == "__main__":
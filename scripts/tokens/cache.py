@@ -0,0 +1,111 @@
+import json, sqlite3
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import List
+from .lexer import MetaToken, MetaTokenType, Lexer
+from .preparser import PreParser
+from .tokenizer import Tokenizer, tokenize
+
+TOKENIZER_VERSION = 2
+"""Tokenizer output version stamp, bump on any change of `tokenize` results to invalidate cached entries."""
+
+LRU_SIZE = 65536
+"""Maximal number of literals kept in memory."""
+
+FLUSH_SIZE = 4096
+"""Number of new entries buffered before writing them to the cache database."""
+
+class TokenCache:
+  """Content-addressed cache of tokenized literals with an in-memory LRU front and an optional SQLite store.
+
+  Cached token lists are shared between lookups and must not be modified."""
+  def __init__(self, path: str = "", size: int = LRU_SIZE) -> None:
+    self.size = size
+    self.lru = OrderedDict()
+    self.pending = []
+    self.memory_hits = 0
+    self.store_hits = 0
+    self.misses = 0
+    self.conn = None
+    if path != "":
+      self.conn = sqlite3.connect(path, timeout=60)
+      self.conn.execute('''CREATE TABLE IF NOT EXISTS token_cache (
+                        key BLOB PRIMARY KEY,
+                        tokens TEXT NOT NULL) WITHOUT ROWID''')
+      self.conn.commit()
+
+  @staticmethod
+  def key(literal: str) -> bytes:
+    """Returns the cache key of a literal."""
+    return blake2b(f"{TOKENIZER_VERSION}\0{literal}".encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+  @staticmethod
+  def encode(tokens: List[MetaToken]) -> str:
+    """Serializes tokens for the store."""
+    return json.dumps([[t.token, t.type.value] for t in tokens])
+
+  @staticmethod
+  def decode(value: str) -> List[MetaToken]:
+    """Deserializes stored tokens."""
+    return [MetaToken(token, MetaTokenType(type)) for token, type in json.loads(value)]
+
+  def get(self, literal: str) -> List[MetaToken] | None:
+    """Returns cached tokens of a literal or `None` on a miss."""
+    tokens = self.lru.get(literal)
+    if tokens is not None:
+      self.lru.move_to_end(literal)
+      self.memory_hits += 1
+      return tokens
+
+    if self.conn is not None:
+      row = self.conn.execute("SELECT tokens FROM token_cache WHERE key = ?", (TokenCache.key(literal),)).fetchone()
+      if row is not None:
+        tokens = TokenCache.decode(row[0])
+        self.__remember(literal, tokens)
+        self.store_hits += 1
+        return tokens
+
+    self.misses += 1
+    return None
+
+  def put(self, literal: str, tokens: List[MetaToken]) -> None:
+    """Caches tokens of a literal which missed the cache."""
+    self.__remember(literal, tokens)
+    if self.conn is not None:
+      self.pending.append((TokenCache.key(literal), TokenCache.encode(tokens)))
+      if len(self.pending) >= FLUSH_SIZE:
+        self.flush()
+
+  def tokenize(self, string: str, lexer: Lexer, preparser: PreParser, tokenizer: Tokenizer) -> List[MetaToken]:
+    """Cached `tokenize`."""
+    tokens = self.get(string)
+    if tokens is None:
+      tokens = tokenize(string, lexer, preparser, tokenizer)
+      self.put(string, tokens)
+    return tokens
+
+  def flush(self) -> None:
+    """Writes buffered entries to the cache database."""
+    if self.conn is not None and len(self.pending) > 0:
+      self.conn.executemany("INSERT OR IGNORE INTO token_cache VALUES (?,?)", self.pending)
+      self.conn.commit()
+    self.pending = []
+
+  def close(self) -> None:
+    """Flushes buffered entries and closes the cache database."""
+    self.flush()
+    if self.conn is not None:
+      self.conn.close()
+      self.conn = None
+
+  def stats(self) -> str:
+    """Returns a summary of cache hits and misses."""
+    lookups = self.memory_hits + self.store_hits + self.misses
+    hit_rate = (lookups - self.misses) / lookups * 100 if lookups > 0 else 0
+    return f"Token cache: {lookups} lookups, {self.memory_hits} memory hits, {self.store_hits} store hits, {self.misses} misses ({hit_rate:.1f}% hit rate)"
+
+  def __remember(self, literal: str, tokens: List[MetaToken]) -> None:
+    """Adds an entry to the LRU, evicting the least recently used one if full."""
+    self.lru[literal] = tokens
+    if len(self.lru) > self.size:
+      self.lru.popitem(last=False)
@@ -1,3 +1,4 @@
+import re, sys, functools
 from enum import Enum
 from typing import List
 
@@ -108,7 +109,68 @@ class MetaTokenType(Enum):
   UNDEFINED = 48
   """Joined literals which include `OTHER` type characters."""
 
+KEYWORD_TYPES = {
+  "operator": MetaTokenType.OPERATOR,
+  "new": MetaTokenType.NEW,
+  "delete": MetaTokenType.DELETE,
+}
+"""Identifier-like literals with a dedicated metatoken type."""
+
+SPECIAL_TYPES = {
+  " ": MetaTokenType.SPACE,
+  "<": MetaTokenType.LEFT_ANGLE,
+  ">": MetaTokenType.RIGHT_ANGLE,
+  ":": MetaTokenType.COLON,
+  "::": MetaTokenType.SCOPE_RES,
+  "::~": MetaTokenType.DEST_SCOPE_RES,
+  "~": MetaTokenType.TILDA,
+  "!": MetaTokenType.EXCLAMATION,
+  "%": MetaTokenType.PERCENT,
+  "^": MetaTokenType.CARET,
+  "&": MetaTokenType.AND,
+  "*": MetaTokenType.STAR,
+  "(": MetaTokenType.LEFT_PARENTH,
+  ")": MetaTokenType.RIGHT_PARENTH,
+  "-": MetaTokenType.HYPHEN,
+  "+": MetaTokenType.PLUS,
+  "=": MetaTokenType.EQUALS,
+  "|": MetaTokenType.PIPE,
+  "[": MetaTokenType.LEFT_SQUARE,
+  "]": MetaTokenType.RIGHT_SQUARE,
+  ",": MetaTokenType.COMMA,
+  "/": MetaTokenType.SLASH,
+  "`": MetaTokenType.BACKTICK,
+  "@": MetaTokenType.AT,
+  "#": MetaTokenType.HASH,
+  "$": MetaTokenType.DOLLAR,
+  "\\": MetaTokenType.BACKSLASH,
+  "\\\\": MetaTokenType.DBACKSLASH,
+  "{": MetaTokenType.LEFT_CURLY,
+  "}": MetaTokenType.RIGHT_CURLY,
+  ";": MetaTokenType.SEMICOLON,
+  "'": MetaTokenType.QUOTE,
+  "\"": MetaTokenType.DQUOTE,
+  "?": MetaTokenType.QUESTION,
+  ".": MetaTokenType.DOT,
+}
+"""Special character sequences and their metatoken types, any other character is `OTHER`."""
+
+_SCANNER_PATTERN = r"([A-Za-z_{digits}]+)|(::~?|\\\\?|.)"
+"""Identifier-like run (group 1) or a special character sequence (group 2)."""
+
+_ASCII_SCANNER = re.compile(_SCANNER_PATTERN.format(digits="0-9"), re.DOTALL)
+"""Scanner for ASCII-only strings."""
+
+@functools.cache
+def _unicode_scanner() -> re.Pattern:
+  """Returns the scanner accepting all `str.isdigit()` characters as identifier-like."""
+  digits = "".join(chr(code) for code in range(sys.maxunicode + 1) if chr(code).isdigit())
+  return re.compile(_SCANNER_PATTERN.format(digits=re.escape(digits)), re.DOTALL)
+
 class MetaToken:
+  """Typed substring of a literal; slotted (no per-instance `__dict__`), every character of a string produces one."""
+  __slots__ = ("token", "type")
+
   def __init__(self, token: str, type: MetaTokenType) -> None:
     self.token = token
     self.type = type
@@ -155,153 +217,20 @@ class Lexer:
     return self.pos == len(self.str)
 
   def metatokens(self) -> List[MetaToken]:
+    """Creates a list of metatokens in a single regex pass over the string."""
+    string = self.str[self.pos:]
+    # non-ASCII digits are rare, build the full character class only when needed
+    scanner = _ASCII_SCANNER if string.isascii() else _unicode_scanner()
     metatokens = []
 
-    while not self.empty():
-      token_str = ""
-      cur = self.current()
-      if cur == None:
-        break
-      # append if alphanumeric (accepts chinese etc.)
-      while not self.empty() and (isletter(cur) or cur.isdigit() or cur == "_"):
-        token_str += self.consume()
-        if not self.empty():
-          cur = self.current()
-      # add a token
-      if len(token_str) > 0:
-        # mark operator keywords
-        if token_str == "operator":
-          metatokens.append(MetaToken(token_str, MetaTokenType.OPERATOR))
-        elif token_str == "new":
-          metatokens.append(MetaToken(token_str, MetaTokenType.NEW))
-        elif token_str == "delete":
-          metatokens.append(MetaToken(token_str, MetaTokenType.DELETE))
-        else:
-          if token_str[0].isdigit():
-            metatokens.append(MetaToken(token_str, MetaTokenType.NUMBER_LIKE))
-          else:
-            metatokens.append(MetaToken(token_str, MetaTokenType.IDENTIFIER_LIKE))
+    for ident, special in scanner.findall(string):
+      if ident:
+        mt_type = KEYWORD_TYPES.get(ident)
+        if mt_type is None:
+          mt_type = MetaTokenType.NUMBER_LIKE if ident[0].isdigit() else MetaTokenType.IDENTIFIER_LIKE
+        metatokens.append(MetaToken(ident, mt_type))
       else:
-        # handle special characters
-        match cur:
-          # the space
-          case " ":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.SPACE))
-          # the angles
-          case "<":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.LEFT_ANGLE))
-          case ">":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.RIGHT_ANGLE))
-          # the colon
-          case ":":
-            token_str += self.consume()
-            if self.current() == ":":
-              token_str += self.consume()
-              if self.current() == "~":
-                token_str += self.consume()
-                metatokens.append(MetaToken(token_str, MetaTokenType.DEST_SCOPE_RES))
-              else:
-                metatokens.append(MetaToken(token_str, MetaTokenType.SCOPE_RES))
-            else:
-              metatokens.append(MetaToken(token_str, MetaTokenType.COLON))
-          # the tilda
-          case "~":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.TILDA))
-
-          # these make up overloadable operators
-          case "!":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.EXCLAMATION))
-          case "%":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.PERCENT))
-          case "^":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.CARET))
-          case "&":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.AND))
-          case "*":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.STAR))
-          case "(":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.LEFT_PARENTH))
-          case ")":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.RIGHT_PARENTH))
-          case "-":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.HYPHEN))
-          case "+":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.PLUS))
-          case "=":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.EQUALS))
-          case "|":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.PIPE))
-          case "[":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.LEFT_SQUARE))
-          case "]":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.RIGHT_SQUARE))
-          case ",":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.COMMA))
-          case "/":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.SLASH))
-
-          # non-overloadable
-          case "`":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.BACKTICK))
-          case "@":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.AT))
-          case "#":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.HASH))
-          case "$":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.DOLLAR))
-          case "\\":
-            token_str += self.consume()
-            if self.current() == "\\":
-              token_str += self.consume()
-              metatokens.append(MetaToken(token_str, MetaTokenType.DBACKSLASH))
-            else:
-              metatokens.append(MetaToken(token_str, MetaTokenType.BACKSLASH))
-          case "{":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.LEFT_CURLY))
-          case "}":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.RIGHT_CURLY))
-          case ";":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.SEMICOLON))
-          case "'":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.QUOTE))
-          case "\"":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.DQUOTE))
-          case "?":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.QUESTION))
-          case ".":
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.DOT))
-          case _:
-            token_str += self.consume()
-            metatokens.append(MetaToken(token_str, MetaTokenType.OTHER))
+        metatokens.append(MetaToken(special, SPECIAL_TYPES.get(special, MetaTokenType.OTHER)))
 
+    self.pos = len(self.str)
     return metatokens
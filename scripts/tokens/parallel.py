@@ -0,0 +1,86 @@
+import os
+from collections import deque
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Tuple
+from .lexer import MetaToken, Lexer
+from .preparser import PreParser
+from .tokenizer import Tokenizer, tokenize
+from .cache import TokenCache
+
+BATCH_SIZE = 256
+"""Number of strings sent to a worker at once."""
+
+BATCHES_PER_JOB = 4
+"""Number of batches queued per worker, bounds the memory used by results waiting for their turn."""
+
+_lexer = None
+_preparser = None
+_tokenizer = None
+
+def _init_worker():
+  """Creates the tokenizer stage instances of a worker process."""
+  global _lexer, _preparser, _tokenizer
+  _lexer = Lexer("")
+  _preparser = PreParser([])
+  _tokenizer = Tokenizer([])
+
+def _tokenize_batch(strings: List[str]) -> List[List[MetaToken]]:
+  """Tokenizes a batch of strings in a worker process."""
+  return [tokenize(string, _lexer, _preparser, _tokenizer) for string in strings]
+
+def get_jobs(arg: str) -> int:
+  """Parses a `--jobs` option value, `0` means all CPUs."""
+  jobs = int(arg)
+  if jobs < 0:
+    raise ValueError(f"Invalid number of jobs: {jobs}")
+  return jobs if jobs > 0 else os.cpu_count() or 1
+
+def tokenize_all(items: Iterable[Tuple[Any, str]], jobs: int = 1, batch_size: int = BATCH_SIZE, cache: TokenCache | None = None) -> Iterator[Tuple[Any, List[MetaToken]]]:
+  """Tokenizes `(key, string)` pairs with `jobs` worker processes, yields `(key, tokens)` pairs in input order.
+
+  Strings found in `cache` are not sent to the workers, the missing ones are added to it."""
+  # no pool overhead for serial runs
+  if jobs <= 1:
+    _init_worker()
+    for key, string in items:
+      if cache is not None:
+        yield key, cache.tokenize(string, _lexer, _preparser, _tokenizer)
+      else:
+        yield key, tokenize(string, _lexer, _preparser, _tokenizer)
+    return
+
+  # deferred, `concurrent.futures` indirectly imports the standard `tokenize` module
+  # which is shadowed by `tokenize.py` script
+  from concurrent.futures import ProcessPoolExecutor
+
+  items = iter(items)
+  pending = deque()
+  with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+    while True:
+      # keep the workers busy
+      while len(pending) < jobs * BATCHES_PER_JOB:
+        batch = list(islice(items, batch_size))
+        if len(batch) == 0:
+          break
+        keys = [key for key, _ in batch]
+        results = [cache.get(string) if cache is not None else None for _, string in batch]
+        missing = [string for (_, string), tokens in zip(batch, results) if tokens is None]
+        future = executor.submit(_tokenize_batch, missing) if len(missing) > 0 else None
+        pending.append((keys, results, missing, future))
+
+      if len(pending) == 0:
+        return
+
+      # results are collected in submission order
+      keys, results, missing, future = pending.popleft()
+      if future is not None:
+        tokenized = iter(future.result())
+        for idx in range(len(results)):
+          if results[idx] is None:
+            results[idx] = next(tokenized)
+        if cache is not None:
+          for string, tokens in zip(missing, future.result()):
+            cache.put(string, tokens)
+
+      for key, tokens in zip(keys, results):
+        yield key, tokens
@@ -34,6 +34,8 @@ INVALID_TEMPLATE_MTOKENS = [
 ]
 """Metatokens invalid inside of a template argument list literal."""
 
+_INVALID_TEMPLATE_MTOKENS = frozenset(INVALID_TEMPLATE_MTOKENS)
+
 class OperatorType(Enum):
   NEW = 0
   """`operator new`"""
@@ -122,6 +124,286 @@ class OperatorType(Enum):
   UNKNOWN = 42
   """Unknown operator or regular text match."""
 
+ONE_TOKEN_OPERATORS = {
+  # <
+  (MetaTokenType.LEFT_ANGLE,): OperatorType.LESS_THAN,
+  # >
+  (MetaTokenType.RIGHT_ANGLE,): OperatorType.GT_THAN,
+  # ~
+  (MetaTokenType.TILDA,): OperatorType.BIT_NOT,
+  # ,
+  (MetaTokenType.COMMA,): OperatorType.COMMA,
+  # =
+  (MetaTokenType.EQUALS,): OperatorType.ASSIGN,
+  # +
+  (MetaTokenType.PLUS,): OperatorType.ADD,
+  # -
+  (MetaTokenType.HYPHEN,): OperatorType.SUBTRACT,
+  # *
+  (MetaTokenType.STAR,): OperatorType.STAR,
+  # /
+  (MetaTokenType.SLASH,): OperatorType.DIV,
+  # !
+  (MetaTokenType.EXCLAMATION,): OperatorType.NOT,
+  # &
+  (MetaTokenType.AND,): OperatorType.BIT_AND,
+  # |
+  (MetaTokenType.PIPE,): OperatorType.BIT_OR,
+  # %
+  (MetaTokenType.PERCENT,): OperatorType.MOD,
+  # ^
+  (MetaTokenType.CARET,): OperatorType.BIT_XOR,
+  # new
+  (MetaTokenType.NEW,): OperatorType.NEW,
+  # delete
+  (MetaTokenType.DELETE,): OperatorType.DELETE,
+}
+"""Operators recognized with one mtoken left after the `operator` keyword (and space)."""
+
+TWO_TOKEN_OPERATORS = {
+  # <<
+  (MetaTokenType.LEFT_ANGLE, MetaTokenType.LEFT_ANGLE): OperatorType.LSHIFT,
+  # < (followed by space)
+  (MetaTokenType.LEFT_ANGLE, MetaTokenType.SPACE): OperatorType.LESS_THAN,
+  # <=
+  (MetaTokenType.LEFT_ANGLE, MetaTokenType.EQUALS): OperatorType.LESS_THAN_EQ,
+  # >< (not >>, kept for tokenization output compatibility)
+  (MetaTokenType.RIGHT_ANGLE, MetaTokenType.LEFT_ANGLE): OperatorType.RSHIFT,
+  # > (followed by space)
+  (MetaTokenType.RIGHT_ANGLE, MetaTokenType.SPACE): OperatorType.GT_THAN,
+  # >=
+  (MetaTokenType.RIGHT_ANGLE, MetaTokenType.EQUALS): OperatorType.GT_THAN_EQ,
+  # ~ (followed by space)
+  (MetaTokenType.TILDA, MetaTokenType.SPACE): OperatorType.BIT_NOT,
+  # ()
+  (MetaTokenType.LEFT_PARENTH, MetaTokenType.RIGHT_PARENTH): OperatorType.FUNC_CALL,
+  # , (followed by space)
+  (MetaTokenType.COMMA, MetaTokenType.SPACE): OperatorType.COMMA,
+  # = (followed by space)
+  (MetaTokenType.EQUALS, MetaTokenType.SPACE): OperatorType.ASSIGN,
+  # ==
+  (MetaTokenType.EQUALS, MetaTokenType.EQUALS): OperatorType.EQUAL_TO,
+  # + (followed by space)
+  (MetaTokenType.PLUS, MetaTokenType.SPACE): OperatorType.ADD,
+  # +=
+  (MetaTokenType.PLUS, MetaTokenType.EQUALS): OperatorType.ADD_ASSIGN,
+  # ++
+  (MetaTokenType.PLUS, MetaTokenType.PLUS): OperatorType.INCREMENT,
+  # ->
+  (MetaTokenType.HYPHEN, MetaTokenType.RIGHT_ANGLE): OperatorType.ARROW,
+  # - (followed by space)
+  (MetaTokenType.HYPHEN, MetaTokenType.SPACE): OperatorType.SUBTRACT,
+  # -=
+  (MetaTokenType.HYPHEN, MetaTokenType.EQUALS): OperatorType.SUB_ASSIGN,
+  # --
+  (MetaTokenType.HYPHEN, MetaTokenType.HYPHEN): OperatorType.DECREMENT,
+  # * (followed by space)
+  (MetaTokenType.STAR, MetaTokenType.SPACE): OperatorType.STAR,
+  # *=
+  (MetaTokenType.STAR, MetaTokenType.EQUALS): OperatorType.MULT_ASSIGN,
+  # / (followed by space)
+  (MetaTokenType.SLASH, MetaTokenType.SPACE): OperatorType.DIV,
+  # /=
+  (MetaTokenType.SLASH, MetaTokenType.EQUALS): OperatorType.DIV_ASSIGN,
+  # ! (followed by space)
+  (MetaTokenType.EXCLAMATION, MetaTokenType.SPACE): OperatorType.NOT,
+  # !=
+  (MetaTokenType.EXCLAMATION, MetaTokenType.EQUALS): OperatorType.NOT_EQUAL_TO,
+  # []
+  (MetaTokenType.LEFT_SQUARE, MetaTokenType.RIGHT_SQUARE): OperatorType.SUBSCRIPT,
+  # & (followed by space)
+  (MetaTokenType.AND, MetaTokenType.SPACE): OperatorType.BIT_AND,
+  # &=
+  (MetaTokenType.AND, MetaTokenType.EQUALS): OperatorType.BIT_AND_ASSIGN,
+  # &&
+  (MetaTokenType.AND, MetaTokenType.AND): OperatorType.AND,
+  # | (followed by space)
+  (MetaTokenType.PIPE, MetaTokenType.SPACE): OperatorType.BIT_OR,
+  # |=
+  (MetaTokenType.PIPE, MetaTokenType.EQUALS): OperatorType.BIT_OR_ASSIGN,
+  # ||
+  (MetaTokenType.PIPE, MetaTokenType.PIPE): OperatorType.OR,
+  # % (followed by space)
+  (MetaTokenType.PERCENT, MetaTokenType.SPACE): OperatorType.MOD,
+  # %=
+  (MetaTokenType.PERCENT, MetaTokenType.EQUALS): OperatorType.MOD_ASSIGN,
+  # ^ (followed by space)
+  (MetaTokenType.CARET, MetaTokenType.SPACE): OperatorType.BIT_XOR,
+  # ^=
+  (MetaTokenType.CARET, MetaTokenType.EQUALS): OperatorType.BIT_XOR_ASSIGN,
+  # new (followed by space)
+  (MetaTokenType.NEW, MetaTokenType.SPACE): OperatorType.NEW,
+  # delete (followed by space)
+  (MetaTokenType.DELETE, MetaTokenType.SPACE): OperatorType.DELETE,
+}
+"""Operators recognized with two mtokens left, single mtoken operators must be followed by a space."""
+
+THREE_TOKEN_OPERATORS = {
+  # << (followed by space)
+  (MetaTokenType.LEFT_ANGLE, MetaTokenType.LEFT_ANGLE, MetaTokenType.SPACE): OperatorType.LSHIFT,
+  # <<=
+  (MetaTokenType.LEFT_ANGLE, MetaTokenType.LEFT_ANGLE, MetaTokenType.EQUALS): OperatorType.LSHIFT_ASSIGN,
+  # < (followed by space)
+  (MetaTokenType.LEFT_ANGLE, MetaTokenType.SPACE): OperatorType.LESS_THAN,
+  # <= (followed by space)
+  (MetaTokenType.LEFT_ANGLE, MetaTokenType.EQUALS, MetaTokenType.SPACE): OperatorType.LESS_THAN_EQ,
+  # >> (followed by space)
+  (MetaTokenType.RIGHT_ANGLE, MetaTokenType.RIGHT_ANGLE, MetaTokenType.SPACE): OperatorType.RSHIFT,
+  # >>=
+  (MetaTokenType.RIGHT_ANGLE, MetaTokenType.RIGHT_ANGLE, MetaTokenType.EQUALS): OperatorType.RSHIFT_ASSIGN,
+  # > (followed by space)
+  (MetaTokenType.RIGHT_ANGLE, MetaTokenType.SPACE): OperatorType.GT_THAN,
+  # >= (followed by space)
+  (MetaTokenType.RIGHT_ANGLE, MetaTokenType.EQUALS, MetaTokenType.SPACE): OperatorType.GT_THAN_EQ,
+  # ~ (followed by space)
+  (MetaTokenType.TILDA, MetaTokenType.SPACE): OperatorType.BIT_NOT,
+  # ()
+  (MetaTokenType.LEFT_PARENTH, MetaTokenType.RIGHT_PARENTH): OperatorType.FUNC_CALL,
+  # , (followed by space)
+  (MetaTokenType.COMMA, MetaTokenType.SPACE): OperatorType.COMMA,
+  # = (followed by space)
+  (MetaTokenType.EQUALS, MetaTokenType.SPACE): OperatorType.ASSIGN,
+  # ==
+  (MetaTokenType.EQUALS, MetaTokenType.EQUALS): OperatorType.EQUAL_TO,
+  # + (followed by space)
+  (MetaTokenType.PLUS, MetaTokenType.SPACE): OperatorType.ADD,
+  # +=
+  (MetaTokenType.PLUS, MetaTokenType.EQUALS): OperatorType.ADD_ASSIGN,
+  # ++
+  (MetaTokenType.PLUS, MetaTokenType.PLUS): OperatorType.INCREMENT,
+  # -> (followed by space)
+  (MetaTokenType.HYPHEN, MetaTokenType.RIGHT_ANGLE, MetaTokenType.SPACE): OperatorType.ARROW,
+  # ->*
+  (MetaTokenType.HYPHEN, MetaTokenType.RIGHT_ANGLE, MetaTokenType.STAR): OperatorType.STRUCT_DEREF,
+  # - (followed by space)
+  (MetaTokenType.HYPHEN, MetaTokenType.SPACE): OperatorType.SUBTRACT,
+  # -= (followed by space)
+  (MetaTokenType.HYPHEN, MetaTokenType.EQUALS, MetaTokenType.SPACE): OperatorType.SUB_ASSIGN,
+  # -- (followed by space)
+  (MetaTokenType.HYPHEN, MetaTokenType.HYPHEN, MetaTokenType.SPACE): OperatorType.DECREMENT,
+  # * (followed by space)
+  (MetaTokenType.STAR, MetaTokenType.SPACE): OperatorType.STAR,
+  # *=
+  (MetaTokenType.STAR, MetaTokenType.EQUALS): OperatorType.MULT_ASSIGN,
+  # / (followed by space)
+  (MetaTokenType.SLASH, MetaTokenType.SPACE): OperatorType.DIV,
+  # /=
+  (MetaTokenType.SLASH, MetaTokenType.EQUALS): OperatorType.DIV_ASSIGN,
+  # ! (followed by space)
+  (MetaTokenType.EXCLAMATION, MetaTokenType.SPACE): OperatorType.NOT,
+  # !=
+  (MetaTokenType.EXCLAMATION, MetaTokenType.EQUALS): OperatorType.NOT_EQUAL_TO,
+  # []
+  (MetaTokenType.LEFT_SQUARE, MetaTokenType.RIGHT_SQUARE): OperatorType.SUBSCRIPT,
+  # & (followed by space)
+  (MetaTokenType.AND, MetaTokenType.SPACE): OperatorType.BIT_AND,
+  # &=
+  (MetaTokenType.AND, MetaTokenType.EQUALS): OperatorType.BIT_AND_ASSIGN,
+  # &&
+  (MetaTokenType.AND, MetaTokenType.AND): OperatorType.AND,
+  # | (followed by space)
+  (MetaTokenType.PIPE, MetaTokenType.SPACE): OperatorType.BIT_OR,
+  # |=
+  (MetaTokenType.PIPE, MetaTokenType.EQUALS): OperatorType.BIT_OR_ASSIGN,
+  # ||
+  (MetaTokenType.PIPE, MetaTokenType.PIPE): OperatorType.OR,
+  # % (followed by space)
+  (MetaTokenType.PERCENT, MetaTokenType.SPACE): OperatorType.MOD,
+  # %=
+  (MetaTokenType.PERCENT, MetaTokenType.EQUALS): OperatorType.MOD_ASSIGN,
+  # ^ (followed by space)
+  (MetaTokenType.CARET, MetaTokenType.SPACE): OperatorType.BIT_XOR,
+  # ^=
+  (MetaTokenType.CARET, MetaTokenType.EQUALS): OperatorType.BIT_XOR_ASSIGN,
+  # new (followed by space)
+  (MetaTokenType.NEW, MetaTokenType.SPACE): OperatorType.NEW,
+  # new[]
+  (MetaTokenType.NEW, MetaTokenType.LEFT_SQUARE, MetaTokenType.RIGHT_SQUARE): OperatorType.NEW_ARRAY,
+  # delete (followed by space)
+  (MetaTokenType.DELETE, MetaTokenType.SPACE): OperatorType.DELETE,
+  # delete[]
+  (MetaTokenType.DELETE, MetaTokenType.LEFT_SQUARE, MetaTokenType.RIGHT_SQUARE): OperatorType.DELETE_ARRAY,
+}
+"""Operators recognized with three or more mtokens left, shorter operators must be followed by a space."""
+
+OPERATOR_TABLES = [ONE_TOKEN_OPERATORS, TWO_TOKEN_OPERATORS, THREE_TOKEN_OPERATORS]
+"""Operator tables indexed by the number of mtokens left (capped at 3) minus one. Keys are mtoken type prefixes, the longest matching one wins."""
+
+def _make_trie(table: dict) -> dict:
+  """Returns an operator table as a trie, nodes map mtoken types to `(operator type or None, child node)`."""
+  root = {}
+  for types, optype in table.items():
+    node = root
+    for idx, type in enumerate(types):
+      terminal, child = node.get(type, (None, {}))
+      if idx == len(types) - 1:
+        terminal = optype
+      node[type] = (terminal, child)
+      node = child
+  return root
+
+_OPERATOR_TRIES = [_make_trie(table) for table in OPERATOR_TABLES]
+
+OPERATOR_LENGTHS = {
+  OperatorType.NEW: 1,
+  OperatorType.DELETE: 1,
+  OperatorType.ASSIGN: 1,
+  OperatorType.ADD: 1,
+  OperatorType.SUBTRACT: 1,
+  OperatorType.DIV: 1,
+  OperatorType.MOD: 1,
+  OperatorType.STAR: 1,
+  OperatorType.NOT: 1,
+  OperatorType.COMMA: 1,
+  OperatorType.BIT_AND: 1,
+  OperatorType.BIT_NOT: 1,
+  OperatorType.BIT_OR: 1,
+  OperatorType.BIT_XOR: 1,
+  OperatorType.LESS_THAN: 1,
+  OperatorType.GT_THAN: 1,
+  OperatorType.RSHIFT: 2,
+  OperatorType.LSHIFT: 2,
+  OperatorType.EQUAL_TO: 2,
+  OperatorType.NOT_EQUAL_TO: 2,
+  OperatorType.AND: 2,
+  OperatorType.OR: 2,
+  OperatorType.SUBSCRIPT: 2,
+  OperatorType.FUNC_CALL: 2,
+  OperatorType.ARROW: 2,
+  OperatorType.INCREMENT: 2,
+  OperatorType.DECREMENT: 2,
+  OperatorType.LESS_THAN_EQ: 2,
+  OperatorType.GT_THAN_EQ: 2,
+  OperatorType.MULT_ASSIGN: 2,
+  OperatorType.ADD_ASSIGN: 2,
+  OperatorType.SUB_ASSIGN: 2,
+  OperatorType.DIV_ASSIGN: 2,
+  OperatorType.MOD_ASSIGN: 2,
+  OperatorType.BIT_AND_ASSIGN: 2,
+  OperatorType.BIT_OR_ASSIGN: 2,
+  OperatorType.BIT_XOR_ASSIGN: 2,
+  OperatorType.STRUCT_DEREF: 3,
+  OperatorType.RSHIFT_ASSIGN: 3,
+  OperatorType.LSHIFT_ASSIGN: 3,
+  OperatorType.NEW_ARRAY: 3,
+  OperatorType.DELETE_ARRAY: 3,
+}
+"""Number of mtokens joined into `OPERATOR_ID` for each operator type."""
+
+UNPARSED_OPERATOR_MTOKENS = [
+  MetaTokenType.OPERATOR_ID,
+  MetaTokenType.TEMPLATE_LIKE,
+  MetaTokenType.CONSTRUCTOR_LIKE,
+  MetaTokenType.DESTRUCTOR_LIKE,
+  MetaTokenType.OPERATOR_LIKE,
+  MetaTokenType.REGULAR_LIKE,
+  MetaTokenType.NUMBER_LIKE,
+  MetaTokenType.DBACKSLASH,
+  MetaTokenType.PATH_LIKE,
+  MetaTokenType.UNDEFINED,
+]
+"""Metatokens not recognized after the `operator` keyword at all, the keyword (and space) preceding them is dropped."""
+
 class PreParser:
     """Joins metatokens into potentially semantically meaningful tokens."""
     def __init__(self, metatokens: List[MetaToken]) -> None:
@@ -172,935 +454,126 @@ class PreParser:
     
     def make_operator_ids(self) -> List[MetaToken]:
       """Creates `OPERATOR_ID` metatokens."""
+      # no operator keywords
+      if MetaTokenType.OPERATOR not in [mt.type for mt in self.mtokens[self.pos:]]:
+        mtokens = self.mtokens[self.pos:]
+        self.pos = len(self.mtokens)
+        return mtokens
+
       mtokens = []
       while not self.empty():
         cur = self.current()
-        if cur == None:
-          break
-        match cur.type:
-          # operators
-          case MetaTokenType.OPERATOR:
-            # consume "operator" keyword
-            keyword = self.consume()
-            cur = self.current()
-            # check for space between keyword and operator
-            space = None
-            if not self.empty() and cur.type == MetaTokenType.SPACE:
-              space = self.consume()
-            # try parsing an operator name
-            if not self.empty():
-              # look forward for the operator symbol
-              optype = self.try_parse_operator()
-              mt1 = mt2 = mt3 = None
-
-              # consume operator metatokens, join them into token(s)
-              match optype:
-                # 1 mtoken-long operators
-
-                case OperatorType.NEW | OperatorType.DELETE:
-                  # operator new
-                  # operator delete
-                  # space is required for `new` and `delete`
-                  value = keyword.token + space.token + self.consume().token
-                  mtokens.append(MetaToken(value, MetaTokenType.OPERATOR_ID))
-
-                case (
-                OperatorType.ASSIGN |
-                OperatorType.ADD |
-                OperatorType.SUBTRACT |
-                OperatorType.DIV |
-                OperatorType.MOD |
-                OperatorType.STAR |
-                OperatorType.NOT |
-                OperatorType.COMMA |
-                OperatorType.BIT_AND |
-                OperatorType.BIT_NOT |
-                OperatorType.BIT_OR |
-                OperatorType.BIT_XOR |
-                OperatorType.LESS_THAN |
-                OperatorType.GT_THAN):
-                  mt1 = self.consume()
-                  space_val = space.token if space != None else ""
-                  value = keyword.token + space_val + mt1.token
-                  mtokens.append(MetaToken(value, MetaTokenType.OPERATOR_ID))
-
-                # 2 mtokens-long operators
-
-                case (
-                OperatorType.RSHIFT |
-                OperatorType.LSHIFT |
-                OperatorType.EQUAL_TO |
-                OperatorType.NOT_EQUAL_TO |
-                OperatorType.AND |
-                OperatorType.OR |
-                OperatorType.SUBSCRIPT |
-                OperatorType.FUNC_CALL |
-                OperatorType.ARROW |
-                OperatorType.INCREMENT |
-                OperatorType.DECREMENT |
-                OperatorType.LESS_THAN_EQ |
-                OperatorType.GT_THAN_EQ |
-                OperatorType.MULT_ASSIGN |
-                OperatorType.ADD_ASSIGN |
-                OperatorType.SUB_ASSIGN |
-                OperatorType.DIV_ASSIGN |
-                OperatorType.MOD_ASSIGN |
-                OperatorType.BIT_AND_ASSIGN |
-                OperatorType.BIT_OR_ASSIGN |
-                OperatorType.BIT_XOR_ASSIGN):
-                  mt1 = self.consume()
-                  mt2 = self.consume()
-                  space_val = space.token if space != None else ""
-                  value = keyword.token + space_val + mt1.token + mt2.token
-                  mtokens.append(MetaToken(value, MetaTokenType.OPERATOR_ID))
-
-                # 3 mtokens-long operators
-
-                case OperatorType.STRUCT_DEREF | OperatorType.RSHIFT_ASSIGN | OperatorType.LSHIFT_ASSIGN:
-                  # operator ->*
-                  # operator >>=
-                  # operator <<=
-                  mt1 = self.consume()
-                  mt2 = self.consume()
-                  mt3 = self.consume()
-                  space_val = space.token if space != None else ""
-                  value = keyword.token + space_val + mt1.token + mt2.token + mt3.token
-                  mtokens.append(MetaToken(value, MetaTokenType.OPERATOR_ID))
-
-                case OperatorType.NEW_ARRAY | OperatorType.DELETE_ARRAY:
-                  # operator new[]
-                  # operator delete[]
-                  mt1 = self.consume()
-                  mt2 = self.consume()
-                  mt3 = self.consume()
-                  # space required
-                  value = keyword.token + space.token + mt1.token + mt2.token + mt3.token
-                  mtokens.append(MetaToken(value, MetaTokenType.OPERATOR_ID))
-
-                # default (not an operator)
-                case OperatorType.UNKNOWN:
-                  # only re-add keyword (and space if consumed) as separate tokens
-                  keyword.type = MetaTokenType.IDENTIFIER_LIKE
-                  mtokens.append(keyword)
-                  if(space != None):
-                    mtokens.append(space)
-                  
-            # keyword at the end of string, add as an indentifier-like (and optional space)
-            else:
-              keyword.type = MetaTokenType.IDENTIFIER_LIKE
-              mtokens.append(keyword)
-              if(space != None):
-                mtokens.append(space)
+        if cur.type != MetaTokenType.OPERATOR:
+          mtokens.append(self.consume())
+          continue
 
-          case _:
-            mtokens.append(self.consume())
+        # consume "operator" keyword
+        keyword = self.consume()
+        # check for space between keyword and operator
+        space = None
+        if not self.empty() and self.current().type == MetaTokenType.SPACE:
+          space = self.consume()
+
+        # keyword at the end of string, add as an indentifier-like (and optional space)
+        if self.empty():
+          optype = OperatorType.UNKNOWN
+        # look forward for the operator symbol
+        else:
+          optype = self.try_parse_operator()
+
+        # default (not an operator)
+        if optype == OperatorType.UNKNOWN:
+          # only re-add keyword (and space if consumed) as separate tokens
+          keyword.type = MetaTokenType.IDENTIFIER_LIKE
+          mtokens.append(keyword)
+          if space != None:
+            mtokens.append(space)
+        # consume operator metatokens, join them into a token
+        elif optype != None:
+          value = keyword.token
+          if space != None:
+            value += space.token
+          for _ in range(OPERATOR_LENGTHS[optype]):
+            value += self.consume().token
+          mtokens.append(MetaToken(value, MetaTokenType.OPERATOR_ID))
 
       return mtokens
 
-    def get_rangle_pos(self, index: int) -> int:
-      """Returns the index of the next `>` mtoken, searching right-to-left from `index`."""
-      while index >= 0:
-          if self.mtokens[index].type == MetaTokenType.RIGHT_ANGLE:
-            return index
-          index -= 1
-      return -1
-
     def make_templates(self) -> List[MetaToken]:
-      """Creates `TEMPLATE_LIKE` metatokens."""
-      result = self.mtokens
-      index = len(self.mtokens) - 1
-      
-      while index >= 0:
-        right_pos = self.get_rangle_pos(index)
-
-        # no templating (no > or not enough space to close the template expr)
+      """Creates `TEMPLATE_LIKE` metatokens in a single stack-based pass."""
+      mtokens = self.mtokens
+      types = [mt.type for mt in mtokens]
+      if MetaTokenType.RIGHT_ANGLE not in types:
+        return mtokens
+
+      # `>` positions and their matching `<` positions (`None` if unbalanced)
+      rangles = []
+      matches = []
+      stack = []
+      for idx, type in enumerate(types):
+        if type == MetaTokenType.LEFT_ANGLE:
+          stack.append(idx)
+        elif type == MetaTokenType.RIGHT_ANGLE:
+          rangles.append(idx)
+          matches.append(stack.pop() if len(stack) > 0 else None)
+
+      # template-like ranges, right-to-left; the ranges are disjoint so each mtoken is checked at most once
+      ranges = []
+      limit = len(mtokens)
+      for idx in range(len(rangles) - 1, -1, -1):
+        right_pos = rangles[idx]
+        # nested in an already processed range
+        if right_pos >= limit:
+          continue
+        # no templating (not enough space to close the template expr)
         if right_pos <= 1:
           break
 
-        # template args literal mtokens, stored in reverse order
-        templ_mtokens = [self.mtokens[right_pos]]
-
-        # try parsing args literal
-        expr_depth = 1
-        # skip tokens outside of the scope (and first >)
-        index = right_pos - 1
-
-        while index >= 0 and expr_depth > 0:
-          match self.mtokens[index].type:
-            # scope tokens
-            case MetaTokenType.LEFT_ANGLE:
-              templ_mtokens.append(self.mtokens[index])
-              expr_depth -= 1
-              if expr_depth == 0:
-                break
-            case MetaTokenType.RIGHT_ANGLE:
-              templ_mtokens.append(self.mtokens[index])
-              expr_depth += 1
-            case _:
-              templ_mtokens.append(self.mtokens[index])
-          index -= 1
-
-        # reverse the template-like mtokens
-        templ_mtokens.reverse()
-
-        # check if parse failed (should begin with <)
-        if templ_mtokens[0].type != MetaTokenType.LEFT_ANGLE:
-          # not a template literal (end of string)
-          # bring position back to the token in front of failed `>` and try other `>`
-          index = right_pos - 1
-          continue
+        left_pos = matches[idx]
+        if left_pos is None:
+          # unbalanced `>` can only be closed by `<` at the beginning of the string
+          if types[0] != MetaTokenType.LEFT_ANGLE:
+            continue
+          if _INVALID_TEMPLATE_MTOKENS.isdisjoint(types[:right_pos + 1]):
+            ranges.append((0, right_pos))
+          break
 
-        # check for invalid template arg list characters/sequences
-        invalid = False
-        for mt in templ_mtokens:
-          if mt.type in INVALID_TEMPLATE_MTOKENS:
-            invalid = True
-            break
-          
-        if invalid == True:
-          continue
+        # skip the whole range even if it contains invalid template arg list characters/sequences
+        if _INVALID_TEMPLATE_MTOKENS.isdisjoint(types[left_pos:right_pos + 1]):
+          ranges.append((left_pos, right_pos))
+        limit = left_pos
 
-        # valid template literal, join mtokens
-        value = ""
-        for tmt in templ_mtokens:
-          value += tmt.token
+      if len(ranges) == 0:
+        return mtokens
 
-        # insert new and delete the old
-        result.insert(right_pos + 1, MetaToken(value, MetaTokenType.TEMPLATE_LIKE))
-        for idx in range(0, len(templ_mtokens)):
-          result.pop(right_pos - idx)
+      # join mtokens of valid template literals
+      result = []
+      pos = 0
+      for left_pos, right_pos in reversed(ranges):
+        result.extend(mtokens[pos:left_pos])
+        value = "".join([mt.token for mt in mtokens[left_pos:right_pos + 1]])
+        result.append(MetaToken(value, MetaTokenType.TEMPLATE_LIKE))
+        pos = right_pos + 1
+      result.extend(mtokens[pos:])
 
       return result
 
-    def try_parse_one_token_op(self) -> OperatorType:
-      """Look forward for a one-mtoken long operator."""
-      mtoken = self.current()
-      match mtoken.type:
-
-        # valid single mtoken operators
-        case MetaTokenType.LEFT_ANGLE:
-          return OperatorType.LESS_THAN
-        
-        case MetaTokenType.RIGHT_ANGLE:
-          return OperatorType.GT_THAN
-        
-        case MetaTokenType.TILDA:
-          return OperatorType.BIT_NOT
-        
-        case MetaTokenType.COMMA:
-          return OperatorType.COMMA
-        
-        case MetaTokenType.EQUALS:
-          return OperatorType.ASSIGN
-        
-        case MetaTokenType.PLUS:
-          return OperatorType.ADD
-        
-        case MetaTokenType.HYPHEN:
-          return OperatorType.SUBTRACT
-        
-        case MetaTokenType.STAR:
-          return OperatorType.STAR
-        
-        case MetaTokenType.SLASH:
-          return OperatorType.DIV
-        
-        case MetaTokenType.EXCLAMATION:
-          return OperatorType.NOT
-        
-        case MetaTokenType.AND:
-          return OperatorType.BIT_AND
-        
-        case MetaTokenType.PIPE:
-          return OperatorType.BIT_OR
-        
-        case MetaTokenType.PERCENT:
-          return OperatorType.MOD
-        
-        case MetaTokenType.CARET:
-          return OperatorType.BIT_XOR
-        
-        case MetaTokenType.NEW:
-          return OperatorType.NEW
-        
-        case MetaTokenType.DELETE:
-          return OperatorType.DELETE
-
-        # regular text match or unknown/non-existent/non-overloadable operator
-        case MetaTokenType.IDENTIFIER_LIKE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.SCOPE_RES:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.SPACE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.OPERATOR:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.DOT:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.LEFT_PARENTH:
-          return OperatorType.UNKNOWN 
-        
-        case MetaTokenType.RIGHT_PARENTH:
-          return OperatorType.UNKNOWN 
-        
-        case MetaTokenType.BACKSLASH:
-          return OperatorType.UNKNOWN
-
-        case MetaTokenType.COLON:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.SEMICOLON:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.QUESTION:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.LEFT_SQUARE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.RIGHT_SQUARE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.QUOTE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.DQUOTE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.BACKTICK:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.AT:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.HASH:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.DOLLAR:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.LEFT_CURLY:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.RIGHT_CURLY:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.DEST_SCOPE_RES:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.OTHER:
-          return OperatorType.UNKNOWN
-
-    def try_parse_two_token_op(self) -> OperatorType:
-      """Look forward for <= 2 mtokens-long operator."""
-      mtoken = self.current()
-      match mtoken.type:
-        # valid double mtoken operators
-        case MetaTokenType.LEFT_PARENTH:
-          if self.next().type == MetaTokenType.RIGHT_PARENTH:
-            # ()
-            return OperatorType.FUNC_CALL
-          else:
-            return OperatorType.UNKNOWN
-        
-        case MetaTokenType.LEFT_SQUARE:
-          if self.next().type == MetaTokenType.RIGHT_SQUARE:
-            # []
-            return OperatorType.SUBSCRIPT
-          else:
-            return OperatorType.UNKNOWN
-
-        # valid double and single mtoken operators
-        case MetaTokenType.LEFT_ANGLE:
-          match self.next().type:
-            # <<
-            case MetaTokenType.LEFT_ANGLE:
-              return OperatorType.LSHIFT
-            # <=
-            case MetaTokenType.EQUALS:
-              return OperatorType.LESS_THAN_EQ
-            # < (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.LESS_THAN
-            case _:
-              return OperatorType.UNKNOWN
-        
-        case MetaTokenType.RIGHT_ANGLE:
-          match self.next().type:
-            # >>
-            case MetaTokenType.LEFT_ANGLE:
-              return OperatorType.RSHIFT
-            # >=
-            case MetaTokenType.EQUALS:
-              return OperatorType.GT_THAN_EQ
-            # > (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.GT_THAN
-            case _:
-              return OperatorType.UNKNOWN
-        
-        case MetaTokenType.EQUALS:
-          match self.next().type:
-            # ==
-            case MetaTokenType.EQUALS:
-              return OperatorType.EQUAL_TO
-            # = (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.ASSIGN
-            case _:
-              return OperatorType.UNKNOWN
-        
-        case MetaTokenType.PLUS:
-          match self.next().type:
-            # ++
-            case MetaTokenType.PLUS:
-              return OperatorType.INCREMENT
-            # +=
-            case MetaTokenType.EQUALS:
-              return OperatorType.ADD_ASSIGN
-            # + (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.ADD
-            case _:
-              return OperatorType.UNKNOWN
-        
-        case MetaTokenType.HYPHEN:
-          match self.next().type:
-            # --
-            case MetaTokenType.HYPHEN:
-              return OperatorType.DECREMENT
-            # -=
-            case MetaTokenType.EQUALS:
-              return OperatorType.SUB_ASSIGN
-            # ->
-            case MetaTokenType.RIGHT_ANGLE:
-              return OperatorType.ARROW
-            # - (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.SUBTRACT
-            case _:
-              return OperatorType.UNKNOWN
-        
-        case MetaTokenType.STAR:
-          match self.next().type:
-            # *=
-            case MetaTokenType.EQUALS:
-              return OperatorType.MULT_ASSIGN
-            # * (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.STAR
-            case _:
-              return OperatorType.UNKNOWN
-        
-        case MetaTokenType.SLASH:
-          match self.next().type:
-            # /=
-            case MetaTokenType.EQUALS:
-              return OperatorType.DIV_ASSIGN
-            # / (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.DIV
-            case _:
-              return OperatorType.UNKNOWN
-        
-        case MetaTokenType.EXCLAMATION:
-          match self.next().type:
-            # !=
-            case MetaTokenType.EQUALS:
-              return OperatorType.NOT_EQUAL_TO
-            # ! (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.NOT
-            case _:
-              return OperatorType.UNKNOWN
-        
-        case MetaTokenType.AND:
-          match self.next().type:
-            # &&
-            case MetaTokenType.AND:
-              return OperatorType.AND
-            # &=
-            case MetaTokenType.EQUALS:
-              return OperatorType.BIT_AND_ASSIGN
-            # & (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.BIT_AND
-            case _:
-              return OperatorType.UNKNOWN          
-        
-        case MetaTokenType.PIPE:
-          match self.next().type:
-            # ||
-            case MetaTokenType.PIPE:
-              return OperatorType.OR
-            # |=
-            case MetaTokenType.EQUALS:
-              return OperatorType.BIT_OR_ASSIGN
-            # | (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.BIT_OR
-            case _:
-              return OperatorType.UNKNOWN     
-        
-        case MetaTokenType.PERCENT:
-          match self.next().type:
-            # %=
-            case MetaTokenType.EQUALS:
-              return OperatorType.MOD_ASSIGN
-            # % (single)
-            case MetaTokenType.SPACE:
-               return OperatorType.MOD
-            case _:
-              return OperatorType.UNKNOWN
-         
-        case MetaTokenType.CARET:
-          match self.next().type:
-            # ^=
-            case MetaTokenType.EQUALS:
-              return OperatorType.BIT_XOR_ASSIGN
-            # ^ (single)
-            case MetaTokenType.SPACE:
-               return OperatorType.BIT_XOR
-            case _:
-              return OperatorType.UNKNOWN
-
-        # valid single mtoken operators
-        case MetaTokenType.TILDA:
-          if self.next().type == MetaTokenType.SPACE:
-            return OperatorType.BIT_NOT
-          else:
-            return OperatorType.UNKNOWN
-        
-        case MetaTokenType.COMMA:
-          if self.next().type == MetaTokenType.SPACE:
-            return OperatorType.COMMA
-          else:
-            return OperatorType.UNKNOWN
-       
-        case MetaTokenType.NEW:
-          if self.next().type == MetaTokenType.SPACE:
-            return OperatorType.NEW
-          else:
-            return OperatorType.UNKNOWN
-        
-        case MetaTokenType.DELETE:
-          if self.next().type == MetaTokenType.SPACE:
-            return OperatorType.DELETE
-          else:
-            return OperatorType.UNKNOWN
-
-        # regular text match or unknown/non-existent/non-overloadable operator
-        case MetaTokenType.IDENTIFIER_LIKE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.SCOPE_RES:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.SPACE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.OPERATOR:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.DOT:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.RIGHT_PARENTH:
-          return OperatorType.UNKNOWN 
-        
-        case MetaTokenType.BACKSLASH:
-          return OperatorType.UNKNOWN
-
-        case MetaTokenType.COLON:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.SEMICOLON:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.QUESTION:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.RIGHT_SQUARE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.QUOTE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.DQUOTE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.BACKTICK:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.AT:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.HASH:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.DOLLAR:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.LEFT_CURLY:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.RIGHT_CURLY:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.DEST_SCOPE_RES:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.OTHER:
-          return OperatorType.UNKNOWN
-
-    def try_parse_three_token_op(self) -> OperatorType:
-      """Look forward for <= 3 mtokens-long operator."""
-      mtoken = self.current()
-      next = self.next()
-      next_next = self.next_next()
-      match mtoken.type:
-        # valid triple, double and single mtoken operators
-        case MetaTokenType.LEFT_ANGLE:
-          match next.type:
-            # <<
-            case MetaTokenType.LEFT_ANGLE:
-              match next_next.type:
-                # <<=
-                case MetaTokenType.EQUALS:
-                  return OperatorType.LSHIFT_ASSIGN
-                # << (double)
-                case MetaTokenType.SPACE:
-                  return OperatorType.LSHIFT
-                case _:
-                  return OperatorType.UNKNOWN
-            # <=
-            case MetaTokenType.EQUALS:
-              match next_next.type:
-                case MetaTokenType.SPACE:
-                  return OperatorType.LESS_THAN_EQ
-                case _:
-                  return OperatorType.UNKNOWN
-            # < (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.LESS_THAN
-            case _:
-              return OperatorType.UNKNOWN
-            
-        # >
-        case MetaTokenType.RIGHT_ANGLE:
-          match next.type:
-            # <<
-            case MetaTokenType.RIGHT_ANGLE:
-              match next_next.type:
-                # >>=
-                case MetaTokenType.EQUALS:
-                  return OperatorType.RSHIFT_ASSIGN
-                # >> (double)
-                case MetaTokenType.SPACE:
-                  return OperatorType.RSHIFT
-                case _:
-                  return OperatorType.UNKNOWN
-            # >=
-            case MetaTokenType.EQUALS:
-              match next_next.type:
-                case MetaTokenType.SPACE:
-                  return OperatorType.GT_THAN_EQ
-                case _:
-                  return OperatorType.UNKNOWN
-            # > (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.GT_THAN
-            case _:
-              return OperatorType.UNKNOWN
-            
-        # -
-        case MetaTokenType.HYPHEN:
-          match next.type:
-            # -- (double)
-            case MetaTokenType.HYPHEN:
-              match next_next.type:
-                case MetaTokenType.SPACE:
-                  return OperatorType.DECREMENT
-                case _:
-                  return OperatorType.UNKNOWN
-            # -= (double)
-            case MetaTokenType.EQUALS:
-              match next_next.type:
-                case MetaTokenType.SPACE:
-                  return OperatorType.SUB_ASSIGN
-                case _:
-                  return OperatorType.UNKNOWN
-            # ->
-            case MetaTokenType.RIGHT_ANGLE:
-              match next_next.type:
-                # ->*
-                case MetaTokenType.STAR:
-                  return OperatorType.STRUCT_DEREF
-                # -> (double)
-                case MetaTokenType.SPACE:
-                  return OperatorType.ARROW
-                case _:
-                  return OperatorType.UNKNOWN
-            # - (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.SUBTRACT
-            case _:
-              return OperatorType.UNKNOWN
+    def try_parse_operator(self) -> OperatorType | None:
+      """Returns the available operator type (`UNKNOWN` if failed, `None` for unparsed mtokens)."""
+      # determine match length
+      node = _OPERATOR_TRIES[min(self.left(), 3) - 1]
+      result = OperatorType.UNKNOWN
 
-        # valid triple and double mtoken operators (none)
-
-        # valid triple and single mtoken operators
-        case MetaTokenType.NEW:
-          match next.type:
-            # new[
-            case MetaTokenType.LEFT_SQUARE:
-              # new[]
-              if next_next.type == MetaTokenType.RIGHT_SQUARE:
-                return OperatorType.NEW_ARRAY
-              else:
-                return OperatorType.UNKNOWN
-            # new (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.NEW
-            case _:
-              return OperatorType.UNKNOWN
-        
-        case MetaTokenType.DELETE:
-          match next.type:
-            # delete[
-            case MetaTokenType.LEFT_SQUARE:
-              # delete[]
-              if next_next.type == MetaTokenType.RIGHT_SQUARE:
-                return OperatorType.DELETE_ARRAY
-              else:
-                return OperatorType.UNKNOWN
-            # delete (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.DELETE
-            case _:
-              return OperatorType.UNKNOWN
-
-        # valid triple operators (none)
-
-        # valid double mtoken operators
-        case MetaTokenType.LEFT_PARENTH:
-          if next.type == MetaTokenType.RIGHT_PARENTH:
-            # ()
-            return OperatorType.FUNC_CALL
-          else:
-            return OperatorType.UNKNOWN
-        
-        case MetaTokenType.LEFT_SQUARE:
-          if next.type == MetaTokenType.RIGHT_SQUARE:
-            # []
-            return OperatorType.SUBSCRIPT
-          else:
-            return OperatorType.UNKNOWN
-
-        # valid double and single mtoken operators
-        case MetaTokenType.EQUALS:
-          match next.type:
-            # ==
-            case MetaTokenType.EQUALS:
-              return OperatorType.EQUAL_TO
-            # = (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.ASSIGN
-            case _:
-              return OperatorType.UNKNOWN
-        
-        case MetaTokenType.PLUS:
-          match next.type:
-            # ++
-            case MetaTokenType.PLUS:
-              return OperatorType.INCREMENT
-            # +=
-            case MetaTokenType.EQUALS:
-              return OperatorType.ADD_ASSIGN
-            # + (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.ADD
-            case _:
-              return OperatorType.UNKNOWN
-        
-        case MetaTokenType.STAR:
-          match next.type:
-            # *=
-            case MetaTokenType.EQUALS:
-              return OperatorType.MULT_ASSIGN
-            # * (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.STAR
-            case _:
-              return OperatorType.UNKNOWN
-        
-        case MetaTokenType.SLASH:
-          match next.type:
-            # /=
-            case MetaTokenType.EQUALS:
-              return OperatorType.DIV_ASSIGN
-            # / (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.DIV
-            case _:
-              return OperatorType.UNKNOWN
-        
-        case MetaTokenType.EXCLAMATION:
-          match next.type:
-            # !=
-            case MetaTokenType.EQUALS:
-              return OperatorType.NOT_EQUAL_TO
-            # ! (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.NOT
-            case _:
-              return OperatorType.UNKNOWN
-        
-        case MetaTokenType.AND:
-          match next.type:
-            # &&
-            case MetaTokenType.AND:
-              return OperatorType.AND
-            # &=
-            case MetaTokenType.EQUALS:
-              return OperatorType.BIT_AND_ASSIGN
-            # & (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.BIT_AND
-            case _:
-              return OperatorType.UNKNOWN          
-        
-        case MetaTokenType.PIPE:
-          match next.type:
-            # ||
-            case MetaTokenType.PIPE:
-              return OperatorType.OR
-            # |=
-            case MetaTokenType.EQUALS:
-              return OperatorType.BIT_OR_ASSIGN
-            # | (single)
-            case MetaTokenType.SPACE:
-              return OperatorType.BIT_OR
-            case _:
-              return OperatorType.UNKNOWN     
-        
-        case MetaTokenType.PERCENT:
-          match next.type:
-            # %=
-            case MetaTokenType.EQUALS:
-              return OperatorType.MOD_ASSIGN
-            # % (single)
-            case MetaTokenType.SPACE:
-               return OperatorType.MOD
-            case _:
-              return OperatorType.UNKNOWN
-         
-        case MetaTokenType.CARET:
-          match next.type:
-            # ^=
-            case MetaTokenType.EQUALS:
-              return OperatorType.BIT_XOR_ASSIGN
-            # ^ (single)
-            case MetaTokenType.SPACE:
-               return OperatorType.BIT_XOR
-            case _:
-              return OperatorType.UNKNOWN
-
-        # valid single mtoken operators
-        case MetaTokenType.TILDA:
-          if next.type == MetaTokenType.SPACE:
-            return OperatorType.BIT_NOT
-          else:
-            return OperatorType.UNKNOWN
-        
-        case MetaTokenType.COMMA:
-          if next.type == MetaTokenType.SPACE:
-            return OperatorType.COMMA
-          else:
-            return OperatorType.UNKNOWN
-
-        # regular text match or unknown/non-existent/non-overloadable operator
-        case MetaTokenType.IDENTIFIER_LIKE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.SCOPE_RES:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.SPACE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.OPERATOR:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.DOT:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.RIGHT_PARENTH:
-          return OperatorType.UNKNOWN 
-        
-        case MetaTokenType.BACKSLASH:
-          return OperatorType.UNKNOWN
-
-        case MetaTokenType.COLON:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.SEMICOLON:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.QUESTION:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.RIGHT_SQUARE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.QUOTE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.DQUOTE:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.BACKTICK:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.AT:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.HASH:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.DOLLAR:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.LEFT_CURLY:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.RIGHT_CURLY:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.DEST_SCOPE_RES:
-          return OperatorType.UNKNOWN
-        
-        case MetaTokenType.OTHER:
-          return OperatorType.UNKNOWN
-
-    def try_parse_operator(self) -> OperatorType:
-      """Returns the available operator type (`UNKNOWN` if failed)."""
-      # determine match length:
-      mtokens_left = self.left()
-      
-      # match on single mtoken ops, could be space
-      if mtokens_left == 1:
-        return self.try_parse_one_token_op()
-      # match on [1,2]-mtoken long ops
-      elif mtokens_left == 2:
-        return self.try_parse_two_token_op()
-      # match on [1,2,3]-mtoken long ops
-      else:
-        return self.try_parse_three_token_op()
- 
+      # look forward for the longest operator symbol
+      for mt in self.mtokens[self.pos:self.pos + 3]:
+        entry = node.get(mt.type)
+        if entry == None:
+          break
+        if entry[0] != None:
+          result = entry[0]
+        node = entry[1]
 
+      # regular text match or unknown/non-existent/non-overloadable operator
+      if result == OperatorType.UNKNOWN and self.current().type in UNPARSED_OPERATOR_MTOKENS:
+        return None
+      return result
@@ -0,0 +1,1247 @@
+from typing import List
+from .lexer import MetaToken, MetaTokenType, Lexer, isletter
+from .preparser import INVALID_TEMPLATE_MTOKENS, OperatorType, PreParser
+from .tokenizer import PATTERNS, Tokenizer
+
+# Original implementations of the tokenization stages, superseded by their optimized counterparts.
+# Kept as the behavioural reference for differential tests and benchmarks - do not optimize.
+
+class ReferenceMetaToken:
+  """`MetaToken` with a per-instance `__dict__`, for memory comparisons."""
+  def __init__(self, token: str, type: MetaTokenType) -> None:
+    self.token = token
+    self.type = type
+
+class ReferenceLexer(Lexer):
+  """Character-by-character `Lexer`."""
+  def metatokens(self) -> List[MetaToken]:
+    """Creates a list of metatokens, one character at a time."""
+    metatokens = []
+
+    while not self.empty():
+      token_str = ""
+      cur = self.current()
+      if cur == None:
+        break
+      # append if alphanumeric (accepts chinese etc.)
+      while not self.empty() and (isletter(cur) or cur.isdigit() or cur == "_"):
+        token_str += self.consume()
+        if not self.empty():
+          cur = self.current()
+      # add a token
+      if len(token_str) > 0:
+        # mark operator keywords
+        if token_str == "operator":
+          metatokens.append(MetaToken(token_str, MetaTokenType.OPERATOR))
+        elif token_str == "new":
+          metatokens.append(MetaToken(token_str, MetaTokenType.NEW))
+        elif token_str == "delete":
+          metatokens.append(MetaToken(token_str, MetaTokenType.DELETE))
+        else:
+          if token_str[0].isdigit():
+            metatokens.append(MetaToken(token_str, MetaTokenType.NUMBER_LIKE))
+          else:
+            metatokens.append(MetaToken(token_str, MetaTokenType.IDENTIFIER_LIKE))
+      else:
+        # handle special characters
+        match cur:
+          # the space
+          case " ":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.SPACE))
+          # the angles
+          case "<":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.LEFT_ANGLE))
+          case ">":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.RIGHT_ANGLE))
+          # the colon
+          case ":":
+            token_str += self.consume()
+            if self.current() == ":":
+              token_str += self.consume()
+              if self.current() == "~":
+                token_str += self.consume()
+                metatokens.append(MetaToken(token_str, MetaTokenType.DEST_SCOPE_RES))
+              else:
+                metatokens.append(MetaToken(token_str, MetaTokenType.SCOPE_RES))
+            else:
+              metatokens.append(MetaToken(token_str, MetaTokenType.COLON))
+          # the tilda
+          case "~":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.TILDA))
+
+          # these make up overloadable operators
+          case "!":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.EXCLAMATION))
+          case "%":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.PERCENT))
+          case "^":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.CARET))
+          case "&":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.AND))
+          case "*":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.STAR))
+          case "(":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.LEFT_PARENTH))
+          case ")":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.RIGHT_PARENTH))
+          case "-":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.HYPHEN))
+          case "+":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.PLUS))
+          case "=":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.EQUALS))
+          case "|":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.PIPE))
+          case "[":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.LEFT_SQUARE))
+          case "]":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.RIGHT_SQUARE))
+          case ",":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.COMMA))
+          case "/":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.SLASH))
+
+          # non-overloadable
+          case "`":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.BACKTICK))
+          case "@":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.AT))
+          case "#":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.HASH))
+          case "$":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.DOLLAR))
+          case "\\":
+            token_str += self.consume()
+            if self.current() == "\\":
+              token_str += self.consume()
+              metatokens.append(MetaToken(token_str, MetaTokenType.DBACKSLASH))
+            else:
+              metatokens.append(MetaToken(token_str, MetaTokenType.BACKSLASH))
+          case "{":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.LEFT_CURLY))
+          case "}":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.RIGHT_CURLY))
+          case ";":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.SEMICOLON))
+          case "'":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.QUOTE))
+          case "\"":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.DQUOTE))
+          case "?":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.QUESTION))
+          case ".":
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.DOT))
+          case _:
+            token_str += self.consume()
+            metatokens.append(MetaToken(token_str, MetaTokenType.OTHER))
+
+    return metatokens
+
+class ReferencePreParser(PreParser):
+  """`PreParser` with nested `match` operator parsing and in-place template matching."""
+  def get_rangle_pos(self, index: int) -> int:
+    """Returns the index of the next `>` mtoken, searching right-to-left from `index`."""
+    while index >= 0:
+        if self.mtokens[index].type == MetaTokenType.RIGHT_ANGLE:
+          return index
+        index -= 1
+    return -1
+
+  def make_templates(self) -> List[MetaToken]:
+    """Creates `TEMPLATE_LIKE` metatokens by rescanning from every `>` and splicing in place."""
+    result = self.mtokens
+    index = len(self.mtokens) - 1
+    
+    while index >= 0:
+      right_pos = self.get_rangle_pos(index)
+
+      # no templating (no > or not enough space to close the template expr)
+      if right_pos <= 1:
+        break
+
+      # template args literal mtokens, stored in reverse order
+      templ_mtokens = [self.mtokens[right_pos]]
+
+      # try parsing args literal
+      expr_depth = 1
+      # skip tokens outside of the scope (and first >)
+      index = right_pos - 1
+
+      while index >= 0 and expr_depth > 0:
+        match self.mtokens[index].type:
+          # scope tokens
+          case MetaTokenType.LEFT_ANGLE:
+            templ_mtokens.append(self.mtokens[index])
+            expr_depth -= 1
+            if expr_depth == 0:
+              break
+          case MetaTokenType.RIGHT_ANGLE:
+            templ_mtokens.append(self.mtokens[index])
+            expr_depth += 1
+          case _:
+            templ_mtokens.append(self.mtokens[index])
+        index -= 1
+
+      # reverse the template-like mtokens
+      templ_mtokens.reverse()
+
+      # check if parse failed (should begin with <)
+      if templ_mtokens[0].type != MetaTokenType.LEFT_ANGLE:
+        # not a template literal (end of string)
+        # bring position back to the token in front of failed `>` and try other `>`
+        index = right_pos - 1
+        continue
+
+      # check for invalid template arg list characters/sequences
+      invalid = False
+      for mt in templ_mtokens:
+        if mt.type in INVALID_TEMPLATE_MTOKENS:
+          invalid = True
+          break
+        
+      if invalid == True:
+        continue
+
+      # valid template literal, join mtokens
+      value = ""
+      for tmt in templ_mtokens:
+        value += tmt.token
+
+      # insert new and delete the old
+      result.insert(right_pos + 1, MetaToken(value, MetaTokenType.TEMPLATE_LIKE))
+      for idx in range(0, len(templ_mtokens)):
+        result.pop(right_pos - idx)
+
+    return result
+
+  def make_operator_ids(self) -> List[MetaToken]:
+    """Creates `OPERATOR_ID` metatokens."""
+    mtokens = []
+    while not self.empty():
+      cur = self.current()
+      if cur == None:
+        break
+      match cur.type:
+        # operators
+        case MetaTokenType.OPERATOR:
+          # consume "operator" keyword
+          keyword = self.consume()
+          cur = self.current()
+          # check for space between keyword and operator
+          space = None
+          if not self.empty() and cur.type == MetaTokenType.SPACE:
+            space = self.consume()
+          # try parsing an operator name
+          if not self.empty():
+            # look forward for the operator symbol
+            optype = self.try_parse_operator()
+            mt1 = mt2 = mt3 = None
+
+            # consume operator metatokens, join them into token(s)
+            match optype:
+              # 1 mtoken-long operators
+
+              case OperatorType.NEW | OperatorType.DELETE:
+                # operator new
+                # operator delete
+                # space is required for `new` and `delete`
+                value = keyword.token + space.token + self.consume().token
+                mtokens.append(MetaToken(value, MetaTokenType.OPERATOR_ID))
+
+              case (
+              OperatorType.ASSIGN |
+              OperatorType.ADD |
+              OperatorType.SUBTRACT |
+              OperatorType.DIV |
+              OperatorType.MOD |
+              OperatorType.STAR |
+              OperatorType.NOT |
+              OperatorType.COMMA |
+              OperatorType.BIT_AND |
+              OperatorType.BIT_NOT |
+              OperatorType.BIT_OR |
+              OperatorType.BIT_XOR |
+              OperatorType.LESS_THAN |
+              OperatorType.GT_THAN):
+                mt1 = self.consume()
+                space_val = space.token if space != None else ""
+                value = keyword.token + space_val + mt1.token
+                mtokens.append(MetaToken(value, MetaTokenType.OPERATOR_ID))
+
+              # 2 mtokens-long operators
+
+              case (
+              OperatorType.RSHIFT |
+              OperatorType.LSHIFT |
+              OperatorType.EQUAL_TO |
+              OperatorType.NOT_EQUAL_TO |
+              OperatorType.AND |
+              OperatorType.OR |
+              OperatorType.SUBSCRIPT |
+              OperatorType.FUNC_CALL |
+              OperatorType.ARROW |
+              OperatorType.INCREMENT |
+              OperatorType.DECREMENT |
+              OperatorType.LESS_THAN_EQ |
+              OperatorType.GT_THAN_EQ |
+              OperatorType.MULT_ASSIGN |
+              OperatorType.ADD_ASSIGN |
+              OperatorType.SUB_ASSIGN |
+              OperatorType.DIV_ASSIGN |
+              OperatorType.MOD_ASSIGN |
+              OperatorType.BIT_AND_ASSIGN |
+              OperatorType.BIT_OR_ASSIGN |
+              OperatorType.BIT_XOR_ASSIGN):
+                mt1 = self.consume()
+                mt2 = self.consume()
+                space_val = space.token if space != None else ""
+                value = keyword.token + space_val + mt1.token + mt2.token
+                mtokens.append(MetaToken(value, MetaTokenType.OPERATOR_ID))
+
+              # 3 mtokens-long operators
+
+              case OperatorType.STRUCT_DEREF | OperatorType.RSHIFT_ASSIGN | OperatorType.LSHIFT_ASSIGN:
+                # operator ->*
+                # operator >>=
+                # operator <<=
+                mt1 = self.consume()
+                mt2 = self.consume()
+                mt3 = self.consume()
+                space_val = space.token if space != None else ""
+                value = keyword.token + space_val + mt1.token + mt2.token + mt3.token
+                mtokens.append(MetaToken(value, MetaTokenType.OPERATOR_ID))
+
+              case OperatorType.NEW_ARRAY | OperatorType.DELETE_ARRAY:
+                # operator new[]
+                # operator delete[]
+                mt1 = self.consume()
+                mt2 = self.consume()
+                mt3 = self.consume()
+                # space required
+                value = keyword.token + space.token + mt1.token + mt2.token + mt3.token
+                mtokens.append(MetaToken(value, MetaTokenType.OPERATOR_ID))
+
+              # default (not an operator)
+              case OperatorType.UNKNOWN:
+                # only re-add keyword (and space if consumed) as separate tokens
+                keyword.type = MetaTokenType.IDENTIFIER_LIKE
+                mtokens.append(keyword)
+                if(space != None):
+                  mtokens.append(space)
+                
+          # keyword at the end of string, add as an indentifier-like (and optional space)
+          else:
+            keyword.type = MetaTokenType.IDENTIFIER_LIKE
+            mtokens.append(keyword)
+            if(space != None):
+              mtokens.append(space)
+
+        case _:
+          mtokens.append(self.consume())
+
+    return mtokens
+
+  def try_parse_one_token_op(self) -> OperatorType:
+    """Look forward for a one-mtoken long operator."""
+    mtoken = self.current()
+    match mtoken.type:
+
+      # valid single mtoken operators
+      case MetaTokenType.LEFT_ANGLE:
+        return OperatorType.LESS_THAN
+      
+      case MetaTokenType.RIGHT_ANGLE:
+        return OperatorType.GT_THAN
+      
+      case MetaTokenType.TILDA:
+        return OperatorType.BIT_NOT
+      
+      case MetaTokenType.COMMA:
+        return OperatorType.COMMA
+      
+      case MetaTokenType.EQUALS:
+        return OperatorType.ASSIGN
+      
+      case MetaTokenType.PLUS:
+        return OperatorType.ADD
+      
+      case MetaTokenType.HYPHEN:
+        return OperatorType.SUBTRACT
+      
+      case MetaTokenType.STAR:
+        return OperatorType.STAR
+      
+      case MetaTokenType.SLASH:
+        return OperatorType.DIV
+      
+      case MetaTokenType.EXCLAMATION:
+        return OperatorType.NOT
+      
+      case MetaTokenType.AND:
+        return OperatorType.BIT_AND
+      
+      case MetaTokenType.PIPE:
+        return OperatorType.BIT_OR
+      
+      case MetaTokenType.PERCENT:
+        return OperatorType.MOD
+      
+      case MetaTokenType.CARET:
+        return OperatorType.BIT_XOR
+      
+      case MetaTokenType.NEW:
+        return OperatorType.NEW
+      
+      case MetaTokenType.DELETE:
+        return OperatorType.DELETE
+
+      # regular text match or unknown/non-existent/non-overloadable operator
+      case MetaTokenType.IDENTIFIER_LIKE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.SCOPE_RES:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.SPACE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.OPERATOR:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.DOT:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.LEFT_PARENTH:
+        return OperatorType.UNKNOWN 
+      
+      case MetaTokenType.RIGHT_PARENTH:
+        return OperatorType.UNKNOWN 
+      
+      case MetaTokenType.BACKSLASH:
+        return OperatorType.UNKNOWN
+
+      case MetaTokenType.COLON:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.SEMICOLON:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.QUESTION:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.LEFT_SQUARE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.RIGHT_SQUARE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.QUOTE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.DQUOTE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.BACKTICK:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.AT:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.HASH:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.DOLLAR:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.LEFT_CURLY:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.RIGHT_CURLY:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.DEST_SCOPE_RES:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.OTHER:
+        return OperatorType.UNKNOWN
+
+  def try_parse_two_token_op(self) -> OperatorType:
+    """Look forward for <= 2 mtokens-long operator."""
+    mtoken = self.current()
+    match mtoken.type:
+      # valid double mtoken operators
+      case MetaTokenType.LEFT_PARENTH:
+        if self.next().type == MetaTokenType.RIGHT_PARENTH:
+          # ()
+          return OperatorType.FUNC_CALL
+        else:
+          return OperatorType.UNKNOWN
+      
+      case MetaTokenType.LEFT_SQUARE:
+        if self.next().type == MetaTokenType.RIGHT_SQUARE:
+          # []
+          return OperatorType.SUBSCRIPT
+        else:
+          return OperatorType.UNKNOWN
+
+      # valid double and single mtoken operators
+      case MetaTokenType.LEFT_ANGLE:
+        match self.next().type:
+          # <<
+          case MetaTokenType.LEFT_ANGLE:
+            return OperatorType.LSHIFT
+          # <=
+          case MetaTokenType.EQUALS:
+            return OperatorType.LESS_THAN_EQ
+          # < (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.LESS_THAN
+          case _:
+            return OperatorType.UNKNOWN
+      
+      case MetaTokenType.RIGHT_ANGLE:
+        match self.next().type:
+          # >>
+          case MetaTokenType.LEFT_ANGLE:
+            return OperatorType.RSHIFT
+          # >=
+          case MetaTokenType.EQUALS:
+            return OperatorType.GT_THAN_EQ
+          # > (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.GT_THAN
+          case _:
+            return OperatorType.UNKNOWN
+      
+      case MetaTokenType.EQUALS:
+        match self.next().type:
+          # ==
+          case MetaTokenType.EQUALS:
+            return OperatorType.EQUAL_TO
+          # = (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.ASSIGN
+          case _:
+            return OperatorType.UNKNOWN
+      
+      case MetaTokenType.PLUS:
+        match self.next().type:
+          # ++
+          case MetaTokenType.PLUS:
+            return OperatorType.INCREMENT
+          # +=
+          case MetaTokenType.EQUALS:
+            return OperatorType.ADD_ASSIGN
+          # + (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.ADD
+          case _:
+            return OperatorType.UNKNOWN
+      
+      case MetaTokenType.HYPHEN:
+        match self.next().type:
+          # --
+          case MetaTokenType.HYPHEN:
+            return OperatorType.DECREMENT
+          # -=
+          case MetaTokenType.EQUALS:
+            return OperatorType.SUB_ASSIGN
+          # ->
+          case MetaTokenType.RIGHT_ANGLE:
+            return OperatorType.ARROW
+          # - (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.SUBTRACT
+          case _:
+            return OperatorType.UNKNOWN
+      
+      case MetaTokenType.STAR:
+        match self.next().type:
+          # *=
+          case MetaTokenType.EQUALS:
+            return OperatorType.MULT_ASSIGN
+          # * (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.STAR
+          case _:
+            return OperatorType.UNKNOWN
+      
+      case MetaTokenType.SLASH:
+        match self.next().type:
+          # /=
+          case MetaTokenType.EQUALS:
+            return OperatorType.DIV_ASSIGN
+          # / (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.DIV
+          case _:
+            return OperatorType.UNKNOWN
+      
+      case MetaTokenType.EXCLAMATION:
+        match self.next().type:
+          # !=
+          case MetaTokenType.EQUALS:
+            return OperatorType.NOT_EQUAL_TO
+          # ! (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.NOT
+          case _:
+            return OperatorType.UNKNOWN
+      
+      case MetaTokenType.AND:
+        match self.next().type:
+          # &&
+          case MetaTokenType.AND:
+            return OperatorType.AND
+          # &=
+          case MetaTokenType.EQUALS:
+            return OperatorType.BIT_AND_ASSIGN
+          # & (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.BIT_AND
+          case _:
+            return OperatorType.UNKNOWN          
+      
+      case MetaTokenType.PIPE:
+        match self.next().type:
+          # ||
+          case MetaTokenType.PIPE:
+            return OperatorType.OR
+          # |=
+          case MetaTokenType.EQUALS:
+            return OperatorType.BIT_OR_ASSIGN
+          # | (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.BIT_OR
+          case _:
+            return OperatorType.UNKNOWN     
+      
+      case MetaTokenType.PERCENT:
+        match self.next().type:
+          # %=
+          case MetaTokenType.EQUALS:
+            return OperatorType.MOD_ASSIGN
+          # % (single)
+          case MetaTokenType.SPACE:
+             return OperatorType.MOD
+          case _:
+            return OperatorType.UNKNOWN
+       
+      case MetaTokenType.CARET:
+        match self.next().type:
+          # ^=
+          case MetaTokenType.EQUALS:
+            return OperatorType.BIT_XOR_ASSIGN
+          # ^ (single)
+          case MetaTokenType.SPACE:
+             return OperatorType.BIT_XOR
+          case _:
+            return OperatorType.UNKNOWN
+
+      # valid single mtoken operators
+      case MetaTokenType.TILDA:
+        if self.next().type == MetaTokenType.SPACE:
+          return OperatorType.BIT_NOT
+        else:
+          return OperatorType.UNKNOWN
+      
+      case MetaTokenType.COMMA:
+        if self.next().type == MetaTokenType.SPACE:
+          return OperatorType.COMMA
+        else:
+          return OperatorType.UNKNOWN
+     
+      case MetaTokenType.NEW:
+        if self.next().type == MetaTokenType.SPACE:
+          return OperatorType.NEW
+        else:
+          return OperatorType.UNKNOWN
+      
+      case MetaTokenType.DELETE:
+        if self.next().type == MetaTokenType.SPACE:
+          return OperatorType.DELETE
+        else:
+          return OperatorType.UNKNOWN
+
+      # regular text match or unknown/non-existent/non-overloadable operator
+      case MetaTokenType.IDENTIFIER_LIKE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.SCOPE_RES:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.SPACE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.OPERATOR:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.DOT:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.RIGHT_PARENTH:
+        return OperatorType.UNKNOWN 
+      
+      case MetaTokenType.BACKSLASH:
+        return OperatorType.UNKNOWN
+
+      case MetaTokenType.COLON:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.SEMICOLON:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.QUESTION:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.RIGHT_SQUARE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.QUOTE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.DQUOTE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.BACKTICK:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.AT:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.HASH:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.DOLLAR:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.LEFT_CURLY:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.RIGHT_CURLY:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.DEST_SCOPE_RES:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.OTHER:
+        return OperatorType.UNKNOWN
+
+  def try_parse_three_token_op(self) -> OperatorType:
+    """Look forward for <= 3 mtokens-long operator."""
+    mtoken = self.current()
+    next = self.next()
+    next_next = self.next_next()
+    match mtoken.type:
+      # valid triple, double and single mtoken operators
+      case MetaTokenType.LEFT_ANGLE:
+        match next.type:
+          # <<
+          case MetaTokenType.LEFT_ANGLE:
+            match next_next.type:
+              # <<=
+              case MetaTokenType.EQUALS:
+                return OperatorType.LSHIFT_ASSIGN
+              # << (double)
+              case MetaTokenType.SPACE:
+                return OperatorType.LSHIFT
+              case _:
+                return OperatorType.UNKNOWN
+          # <=
+          case MetaTokenType.EQUALS:
+            match next_next.type:
+              case MetaTokenType.SPACE:
+                return OperatorType.LESS_THAN_EQ
+              case _:
+                return OperatorType.UNKNOWN
+          # < (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.LESS_THAN
+          case _:
+            return OperatorType.UNKNOWN
+          
+      # >
+      case MetaTokenType.RIGHT_ANGLE:
+        match next.type:
+          # <<
+          case MetaTokenType.RIGHT_ANGLE:
+            match next_next.type:
+              # >>=
+              case MetaTokenType.EQUALS:
+                return OperatorType.RSHIFT_ASSIGN
+              # >> (double)
+              case MetaTokenType.SPACE:
+                return OperatorType.RSHIFT
+              case _:
+                return OperatorType.UNKNOWN
+          # >=
+          case MetaTokenType.EQUALS:
+            match next_next.type:
+              case MetaTokenType.SPACE:
+                return OperatorType.GT_THAN_EQ
+              case _:
+                return OperatorType.UNKNOWN
+          # > (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.GT_THAN
+          case _:
+            return OperatorType.UNKNOWN
+          
+      # -
+      case MetaTokenType.HYPHEN:
+        match next.type:
+          # -- (double)
+          case MetaTokenType.HYPHEN:
+            match next_next.type:
+              case MetaTokenType.SPACE:
+                return OperatorType.DECREMENT
+              case _:
+                return OperatorType.UNKNOWN
+          # -= (double)
+          case MetaTokenType.EQUALS:
+            match next_next.type:
+              case MetaTokenType.SPACE:
+                return OperatorType.SUB_ASSIGN
+              case _:
+                return OperatorType.UNKNOWN
+          # ->
+          case MetaTokenType.RIGHT_ANGLE:
+            match next_next.type:
+              # ->*
+              case MetaTokenType.STAR:
+                return OperatorType.STRUCT_DEREF
+              # -> (double)
+              case MetaTokenType.SPACE:
+                return OperatorType.ARROW
+              case _:
+                return OperatorType.UNKNOWN
+          # - (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.SUBTRACT
+          case _:
+            return OperatorType.UNKNOWN
+
+      # valid triple and double mtoken operators (none)
+
+      # valid triple and single mtoken operators
+      case MetaTokenType.NEW:
+        match next.type:
+          # new[
+          case MetaTokenType.LEFT_SQUARE:
+            # new[]
+            if next_next.type == MetaTokenType.RIGHT_SQUARE:
+              return OperatorType.NEW_ARRAY
+            else:
+              return OperatorType.UNKNOWN
+          # new (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.NEW
+          case _:
+            return OperatorType.UNKNOWN
+      
+      case MetaTokenType.DELETE:
+        match next.type:
+          # delete[
+          case MetaTokenType.LEFT_SQUARE:
+            # delete[]
+            if next_next.type == MetaTokenType.RIGHT_SQUARE:
+              return OperatorType.DELETE_ARRAY
+            else:
+              return OperatorType.UNKNOWN
+          # delete (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.DELETE
+          case _:
+            return OperatorType.UNKNOWN
+
+      # valid triple operators (none)
+
+      # valid double mtoken operators
+      case MetaTokenType.LEFT_PARENTH:
+        if next.type == MetaTokenType.RIGHT_PARENTH:
+          # ()
+          return OperatorType.FUNC_CALL
+        else:
+          return OperatorType.UNKNOWN
+      
+      case MetaTokenType.LEFT_SQUARE:
+        if next.type == MetaTokenType.RIGHT_SQUARE:
+          # []
+          return OperatorType.SUBSCRIPT
+        else:
+          return OperatorType.UNKNOWN
+
+      # valid double and single mtoken operators
+      case MetaTokenType.EQUALS:
+        match next.type:
+          # ==
+          case MetaTokenType.EQUALS:
+            return OperatorType.EQUAL_TO
+          # = (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.ASSIGN
+          case _:
+            return OperatorType.UNKNOWN
+      
+      case MetaTokenType.PLUS:
+        match next.type:
+          # ++
+          case MetaTokenType.PLUS:
+            return OperatorType.INCREMENT
+          # +=
+          case MetaTokenType.EQUALS:
+            return OperatorType.ADD_ASSIGN
+          # + (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.ADD
+          case _:
+            return OperatorType.UNKNOWN
+      
+      case MetaTokenType.STAR:
+        match next.type:
+          # *=
+          case MetaTokenType.EQUALS:
+            return OperatorType.MULT_ASSIGN
+          # * (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.STAR
+          case _:
+            return OperatorType.UNKNOWN
+      
+      case MetaTokenType.SLASH:
+        match next.type:
+          # /=
+          case MetaTokenType.EQUALS:
+            return OperatorType.DIV_ASSIGN
+          # / (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.DIV
+          case _:
+            return OperatorType.UNKNOWN
+      
+      case MetaTokenType.EXCLAMATION:
+        match next.type:
+          # !=
+          case MetaTokenType.EQUALS:
+            return OperatorType.NOT_EQUAL_TO
+          # ! (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.NOT
+          case _:
+            return OperatorType.UNKNOWN
+      
+      case MetaTokenType.AND:
+        match next.type:
+          # &&
+          case MetaTokenType.AND:
+            return OperatorType.AND
+          # &=
+          case MetaTokenType.EQUALS:
+            return OperatorType.BIT_AND_ASSIGN
+          # & (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.BIT_AND
+          case _:
+            return OperatorType.UNKNOWN          
+      
+      case MetaTokenType.PIPE:
+        match next.type:
+          # ||
+          case MetaTokenType.PIPE:
+            return OperatorType.OR
+          # |=
+          case MetaTokenType.EQUALS:
+            return OperatorType.BIT_OR_ASSIGN
+          # | (single)
+          case MetaTokenType.SPACE:
+            return OperatorType.BIT_OR
+          case _:
+            return OperatorType.UNKNOWN     
+      
+      case MetaTokenType.PERCENT:
+        match next.type:
+          # %=
+          case MetaTokenType.EQUALS:
+            return OperatorType.MOD_ASSIGN
+          # % (single)
+          case MetaTokenType.SPACE:
+             return OperatorType.MOD
+          case _:
+            return OperatorType.UNKNOWN
+       
+      case MetaTokenType.CARET:
+        match next.type:
+          # ^=
+          case MetaTokenType.EQUALS:
+            return OperatorType.BIT_XOR_ASSIGN
+          # ^ (single)
+          case MetaTokenType.SPACE:
+             return OperatorType.BIT_XOR
+          case _:
+            return OperatorType.UNKNOWN
+
+      # valid single mtoken operators
+      case MetaTokenType.TILDA:
+        if next.type == MetaTokenType.SPACE:
+          return OperatorType.BIT_NOT
+        else:
+          return OperatorType.UNKNOWN
+      
+      case MetaTokenType.COMMA:
+        if next.type == MetaTokenType.SPACE:
+          return OperatorType.COMMA
+        else:
+          return OperatorType.UNKNOWN
+
+      # regular text match or unknown/non-existent/non-overloadable operator
+      case MetaTokenType.IDENTIFIER_LIKE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.SCOPE_RES:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.SPACE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.OPERATOR:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.DOT:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.RIGHT_PARENTH:
+        return OperatorType.UNKNOWN 
+      
+      case MetaTokenType.BACKSLASH:
+        return OperatorType.UNKNOWN
+
+      case MetaTokenType.COLON:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.SEMICOLON:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.QUESTION:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.RIGHT_SQUARE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.QUOTE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.DQUOTE:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.BACKTICK:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.AT:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.HASH:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.DOLLAR:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.LEFT_CURLY:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.RIGHT_CURLY:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.DEST_SCOPE_RES:
+        return OperatorType.UNKNOWN
+      
+      case MetaTokenType.OTHER:
+        return OperatorType.UNKNOWN
+
+  def try_parse_operator(self) -> OperatorType:
+    """Returns the available operator type (`UNKNOWN` if failed)."""
+    # determine match length:
+    mtokens_left = self.left()
+    
+    # match on single mtoken ops, could be space
+    if mtokens_left == 1:
+      return self.try_parse_one_token_op()
+    # match on [1,2]-mtoken long ops
+    elif mtokens_left == 2:
+      return self.try_parse_two_token_op()
+    # match on [1,2,3]-mtoken long ops
+    else:
+      return self.try_parse_three_token_op()
+ 
+
+class ReferenceTokenizer(Tokenizer):
+  """`Tokenizer` with per-pattern restarting matcher."""
+  def match_patterns(self):
+    """Produces structured tokens with potential function names joined together, rescanning after every in-place join."""
+    result = self.mtokens
+    
+    # try matching on all patterns
+    for pattern_idx in range(0, len(PATTERNS)):
+      pattern = PATTERNS[pattern_idx]
+      
+      # mtokens too short, cannot match
+      if len(self.mtokens) < len(pattern):
+        continue
+
+      mt_idx = len(self.mtokens) - 1
+      # iterate right-to-left and try to match
+
+      while mt_idx >= len(pattern) - 1:
+        matched = True
+        # if first token does not match, skip to next
+        if self.mtokens[mt_idx].type != pattern[0]:
+          mt_idx -= 1
+          continue
+
+        # match on pattern sequence
+        for pt_idx in range(0, len(pattern)):
+          if self.mtokens[mt_idx - pt_idx].type != pattern[pt_idx]:
+            matched = False
+            break
+        
+        # match failed
+        if matched == False:
+          mt_idx -= 1
+          continue
+
+        # try optional matches
+        matched_posttempl = 0
+        matched_qual = 0
+
+        # check constructor/destructor post-templating [t]
+        if pt_idx in [1, 3] and mt_idx < len(self.mtokens) - 1:
+          if self.mtokens[mt_idx + 1].type == MetaTokenType.TEMPLATE_LIKE:
+            matched_posttempl = 1
+
+        # check for qualification prefix
+        begin = mt_idx - len(pattern)
+        # [i, [t], sr]*
+        while begin > 0:
+          # [i, sr]
+          if (self.mtokens[begin].type == MetaTokenType.SCOPE_RES and 
+              self.mtokens[begin - 1].type == MetaTokenType.IDENTIFIER_LIKE):
+              matched_qual += 2
+              begin -= 2
+          # [i, t, sr]
+          elif (begin > 1 and 
+              self.mtokens[begin].type == MetaTokenType.SCOPE_RES and
+              self.mtokens[begin - 1].type == MetaTokenType.TEMPLATE_LIKE and
+              self.mtokens[begin - 2].type == MetaTokenType.IDENTIFIER_LIKE):
+              matched_qual += 3
+              begin -= 3
+          # end of qualification
+          else:
+            break
+
+        # join mtokens        
+        value = ""
+        for pt_idx in range(len(pattern) + matched_qual + matched_posttempl):
+          # mt_idx = 9
+          # len(pattern) = 5
+          value += self.mtokens[mt_idx - (len(pattern) + matched_qual) + 1 + pt_idx].token
+
+        mt_type = None
+        match pattern_idx:
+          case 0:
+            # constructor
+            if self.mtokens[mt_idx].token == self.mtokens[mt_idx - 2].token:
+              mt_type = MetaTokenType.CONSTRUCTOR_LIKE
+            # regular function, match later
+            else:
+              mt_idx -= 1
+              continue
+          case 1:
+            # constructor
+            if (self.mtokens[mt_idx - 1].token == self.mtokens[mt_idx - 4].token and
+              self.mtokens[mt_idx].token == self.mtokens[mt_idx - 3].token):
+              mt_type = MetaTokenType.CONSTRUCTOR_LIKE
+            # regular function, match later
+            else:
+              mt_idx -= 1
+              continue
+          case 2:
+            # destructor
+            if self.mtokens[mt_idx].token == self.mtokens[mt_idx - 2].token:
+              mt_type = MetaTokenType.DESTRUCTOR_LIKE
+            # not a valid destructor
+            else:
+              mt_idx -= 1
+              continue
+          case 3:
+            # destructor
+            if (self.mtokens[mt_idx - 1].token == self.mtokens[mt_idx - 4].token and
+              self.mtokens[mt_idx].token == self.mtokens[mt_idx - 3].token):
+              mt_type = MetaTokenType.DESTRUCTOR_LIKE
+            # not a valid destructor
+            else:
+              mt_idx -= 1
+              continue
+          case 4:
+            mt_type = MetaTokenType.OPERATOR_LIKE
+          case 5:
+            mt_type = MetaTokenType.REGULAR_LIKE
+          case 6:
+            mt_type = MetaTokenType.REGULAR_LIKE
+          case _:
+            raise Exception(f"Unimplemented structural pattern {pattern_idx}")
+
+        # update result mtokens
+        result.insert(mt_idx + 1, MetaToken(value, mt_type))
+        for idx in range(0, len(pattern) + matched_qual + matched_posttempl):
+          result.pop(mt_idx - idx)
+
+        mt_idx = len(result) - 1
+      
+    # try joining regulars on leftover scope res operators
+    for idx in range(len(result)):
+      if idx + 2 < len(result):
+        if (result[idx].type == MetaTokenType.REGULAR_LIKE and
+            result[idx + 1].type == MetaTokenType.SCOPE_RES and 
+            result[idx + 2].type == MetaTokenType.REGULAR_LIKE):
+          # join regulars into a larger regular
+          value = result[idx].token + result[idx + 1].token + result[idx + 2].token
+          result.insert(idx, MetaToken(value, MetaTokenType.REGULAR_LIKE))
+          # 1st regular
+          result.pop(idx + 1)
+          # ::
+          result.pop(idx + 1)
+          # 2nd regular
+          result.pop(idx + 1)
+      else:
+        break
+
+    return result
@@ -80,6 +80,112 @@ NON_JOINABLE = [
 ]
 """Tokens unjoinable for `UNDEFINED` neighbours."""
 
+_PATTERN_TYPES = [
+  None,
+  None,
+  None,
+  None,
+  MetaTokenType.OPERATOR_LIKE,
+  MetaTokenType.REGULAR_LIKE,
+  MetaTokenType.REGULAR_LIKE,
+]
+"""Metatoken types of `PATTERNS` matches, `None` for constructor/destructor patterns which depend on the names."""
+
+_PATTERN_SEQUENCES = [list(reversed(pattern)) for pattern in PATTERNS]
+"""`PATTERNS` token types in left-to-right order."""
+
+_PATTERN_REQUIRED = [list(dict.fromkeys(pattern)) for pattern in PATTERNS]
+"""Distinct token types required by `PATTERNS`."""
+
+def _match_pattern(mtokens: List[MetaToken], types: List[MetaTokenType], pattern_idx: int) -> tuple[List[MetaToken], List[MetaTokenType]]:
+  """Joins all matches of a single pattern (with qualification prefixes) in a right-to-left sweep. Returns new mtokens and their types."""
+  pattern = PATTERNS[pattern_idx]
+  sequence = _PATTERN_SEQUENCES[pattern_idx]
+  length = len(pattern)
+  # (begin, end, mtoken) replacements, right-to-left
+  joins = []
+  drop_last = False
+  # joined mtokens are never matched again and everything to the right of a match has been checked already,
+  # resume the sweep to the left of the match
+  limit = len(mtokens)
+  # index removed by the latest join with post-templating, stale in `types`
+  consumed = -1
+  anchors = [idx for idx, type in enumerate(types) if type == pattern[0]]
+
+  for mt_idx in reversed(anchors):
+    if mt_idx >= limit:
+      continue
+    if mt_idx < length - 1:
+      break
+
+    # match on pattern sequence
+    if length > 1 and types[mt_idx - length + 1:mt_idx + 1] != sequence:
+      continue
+
+    mt_type = _PATTERN_TYPES[pattern_idx]
+    if mt_type is None:
+      # constructors/destructors repeat the (templated) class name
+      if length == 3:
+        named = mtokens[mt_idx].token == mtokens[mt_idx - 2].token
+      else:
+        named = (mtokens[mt_idx - 1].token == mtokens[mt_idx - 4].token and
+                 mtokens[mt_idx].token == mtokens[mt_idx - 3].token)
+      # regular function (matched later) or not a valid destructor
+      if not named:
+        continue
+      mt_type = MetaTokenType.DESTRUCTOR_LIKE if MetaTokenType.DEST_SCOPE_RES in pattern else MetaTokenType.CONSTRUCTOR_LIKE
+
+    # post-templating [t], only checked for the `i, t` pattern
+    matched_posttempl = 0
+    if (length == 2 and mt_idx < len(mtokens) - 1 and mt_idx + 1 != consumed and
+        types[mt_idx + 1] == MetaTokenType.TEMPLATE_LIKE):
+      matched_posttempl = 1
+
+    # qualification prefix [i, [t], sr]*
+    begin = mt_idx - length
+    while begin > 0 and types[begin] == MetaTokenType.SCOPE_RES:
+      # [i, sr]
+      if types[begin - 1] == MetaTokenType.IDENTIFIER_LIKE:
+        begin -= 2
+      # [i, t, sr]
+      elif (begin > 1 and
+          types[begin - 1] == MetaTokenType.TEMPLATE_LIKE and
+          types[begin - 2] == MetaTokenType.IDENTIFIER_LIKE):
+        begin -= 3
+      # end of qualification
+      else:
+        break
+
+    value = "".join([mt.token for mt in mtokens[begin + 1:mt_idx + matched_posttempl + 1]])
+    # the joined post-templating mtoken is kept in place, the one preceding the match
+    # (or the last one if there is none) is removed instead - tokenization output compatibility
+    limit = begin + 1 - matched_posttempl
+    if matched_posttempl:
+      consumed = limit
+    if limit < 0:
+      limit = 0
+      drop_last = True
+    joins.append((limit, mt_idx + 1, MetaToken(value, mt_type)))
+
+  if len(joins) == 0:
+    return mtokens, types
+
+  result = []
+  result_types = []
+  pos = 0
+  for begin, end, mtoken in reversed(joins):
+    result.extend(mtokens[pos:begin])
+    result_types.extend(types[pos:begin])
+    result.append(mtoken)
+    result_types.append(mtoken.type)
+    pos = end
+  result.extend(mtokens[pos:])
+  result_types.extend(types[pos:])
+  if drop_last:
+    result.pop()
+    result_types.pop()
+  return result, result_types
+
 class Tokenizer:
   """Creates labelling-ready tokens out of preprocessed metatokens."""
   def __init__(self, metatokens) -> None:
@@ -92,143 +198,34 @@ class Tokenizer:
   def match_patterns(self):
     """Produces structured tokens with potential function names joined together."""
     result = self.mtokens
-    
-    # try matching on all patterns
-    for pattern_idx in range(0, len(PATTERNS)):
-      pattern = PATTERNS[pattern_idx]
-      
-      # mtokens too short, cannot match
-      if len(self.mtokens) < len(pattern):
-        continue
-
-      mt_idx = len(self.mtokens) - 1
-      # iterate right-to-left and try to match
-
-      while mt_idx >= len(pattern) - 1:
-        matched = True
-        # if first token does not match, skip to next
-        if self.mtokens[mt_idx].type != pattern[0]:
-          mt_idx -= 1
-          continue
-
-        # match on pattern sequence
-        for pt_idx in range(0, len(pattern)):
-          if self.mtokens[mt_idx - pt_idx].type != pattern[pt_idx]:
-            matched = False
-            break
-        
-        # match failed
-        if matched == False:
-          mt_idx -= 1
-          continue
+    types = [mt.type for mt in result]
+
+    # one right-to-left sweep per pattern, in the order of precedence
+    for pattern_idx in range(len(PATTERNS)):
+      # (enum hashing is slow, list lookups compare identities)
+      for type in _PATTERN_REQUIRED[pattern_idx]:
+        if type not in types:
+          break
+      else:
+        result, types = _match_pattern(result, types, pattern_idx)
 
-        # try optional matches
-        matched_posttempl = 0
-        matched_qual = 0
-
-        # check constructor/destructor post-templating [t]
-        if pt_idx in [1, 3] and mt_idx < len(self.mtokens) - 1:
-          if self.mtokens[mt_idx + 1].type == MetaTokenType.TEMPLATE_LIKE:
-            matched_posttempl = 1
-
-        # check for qualification prefix
-        begin = mt_idx - len(pattern)
-        # [i, [t], sr]*
-        while begin > 0:
-          # [i, sr]
-          if (self.mtokens[begin].type == MetaTokenType.SCOPE_RES and 
-              self.mtokens[begin - 1].type == MetaTokenType.IDENTIFIER_LIKE):
-              matched_qual += 2
-              begin -= 2
-          # [i, t, sr]
-          elif (begin > 1 and 
-              self.mtokens[begin].type == MetaTokenType.SCOPE_RES and
-              self.mtokens[begin - 1].type == MetaTokenType.TEMPLATE_LIKE and
-              self.mtokens[begin - 2].type == MetaTokenType.IDENTIFIER_LIKE):
-              matched_qual += 3
-              begin -= 3
-          # end of qualification
-          else:
-            break
-
-        # join mtokens        
-        value = ""
-        for pt_idx in range(len(pattern) + matched_qual + matched_posttempl):
-          # mt_idx = 9
-          # len(pattern) = 5
-          value += self.mtokens[mt_idx - (len(pattern) + matched_qual) + 1 + pt_idx].token
-
-        mt_type = None
-        match pattern_idx:
-          case 0:
-            # constructor
-            if self.mtokens[mt_idx].token == self.mtokens[mt_idx - 2].token:
-              mt_type = MetaTokenType.CONSTRUCTOR_LIKE
-            # regular function, match later
-            else:
-              mt_idx -= 1
-              continue
-          case 1:
-            # constructor
-            if (self.mtokens[mt_idx - 1].token == self.mtokens[mt_idx - 4].token and
-              self.mtokens[mt_idx].token == self.mtokens[mt_idx - 3].token):
-              mt_type = MetaTokenType.CONSTRUCTOR_LIKE
-            # regular function, match later
-            else:
-              mt_idx -= 1
-              continue
-          case 2:
-            # destructor
-            if self.mtokens[mt_idx].token == self.mtokens[mt_idx - 2].token:
-              mt_type = MetaTokenType.DESTRUCTOR_LIKE
-            # not a valid destructor
-            else:
-              mt_idx -= 1
-              continue
-          case 3:
-            # destructor
-            if (self.mtokens[mt_idx - 1].token == self.mtokens[mt_idx - 4].token and
-              self.mtokens[mt_idx].token == self.mtokens[mt_idx - 3].token):
-              mt_type = MetaTokenType.DESTRUCTOR_LIKE
-            # not a valid destructor
-            else:
-              mt_idx -= 1
-              continue
-          case 4:
-            mt_type = MetaTokenType.OPERATOR_LIKE
-          case 5:
-            mt_type = MetaTokenType.REGULAR_LIKE
-          case 6:
-            mt_type = MetaTokenType.REGULAR_LIKE
-          case _:
-            raise Exception(f"Unimplemented structural pattern {pattern_idx}")
-
-        # update result mtokens
-        result.insert(mt_idx + 1, MetaToken(value, mt_type))
-        for idx in range(0, len(pattern) + matched_qual + matched_posttempl):
-          result.pop(mt_idx - idx)
-
-        mt_idx = len(result) - 1
-      
     # try joining regulars on leftover scope res operators
-    for idx in range(len(result)):
-      if idx + 2 < len(result):
-        if (result[idx].type == MetaTokenType.REGULAR_LIKE and
-            result[idx + 1].type == MetaTokenType.SCOPE_RES and 
-            result[idx + 2].type == MetaTokenType.REGULAR_LIKE):
-          # join regulars into a larger regular
-          value = result[idx].token + result[idx + 1].token + result[idx + 2].token
-          result.insert(idx, MetaToken(value, MetaTokenType.REGULAR_LIKE))
-          # 1st regular
-          result.pop(idx + 1)
-          # ::
-          result.pop(idx + 1)
-          # 2nd regular
-          result.pop(idx + 1)
+    joined = []
+    idx = 0
+    while idx + 2 < len(result):
+      if (types[idx] == MetaTokenType.REGULAR_LIKE and
+          types[idx + 1] == MetaTokenType.SCOPE_RES and
+          types[idx + 2] == MetaTokenType.REGULAR_LIKE):
+        # join regulars into a larger regular (not rejoined with the next one)
+        value = result[idx].token + result[idx + 1].token + result[idx + 2].token
+        joined.append(MetaToken(value, MetaTokenType.REGULAR_LIKE))
+        idx += 3
       else:
-        break
+        joined.append(result[idx])
+        idx += 1
+    joined.extend(result[idx:])
 
-    return result
+    return joined
 
   def make_paths(self) -> List[MetaToken]:
     """Creates `PATH_LIKE` metatokens."""
@@ -1,25 +1,65 @@
 import os, sys, getopt
 import sqlite3
 from datetime import datetime
-from typing import List
-from utils.db import DbException
-from tokens.lexer import Lexer
-from tokens.preparser import PreParser
-from tokens.tokenizer import Tokenizer, tokenize
+from typing import Dict, Iterable, Iterator, List, Tuple
+from utils.db import DbException, bulk_load, execute_chunked, iter_rows
+from utils.schema import ensure_indexes
+from tokens.parallel import get_jobs, tokenize_all
+from tokens.cache import TokenCache
 
 
-HELP = 'Usage:\npython tpaths.py --dbpath=<database path>\n'
+HELP = 'Usage:\npython tpaths.py --dbpath=<database path> [--bulk] [--jobs=<worker processes, 0 for all CPUs>] [--cache=<token cache db path>]\n'
 
-def get_unique_functions(paths) -> List[int]:
-  """Returns unique function addresses from path rows."""
-  unique = []
-  for path in paths:
-    if path[4] not in unique:
-      unique.append(path[4])
+def get_unique_functions(paths: Iterable[tuple]) -> List[int]:
+  """Returns unique function addresses from path rows, in the order of appearance."""
+  return list(dict.fromkeys(path[4] for path in paths))
 
-  return unique
+def get_path_literals(c: sqlite3.Cursor, funcs: List[int]) -> Iterator[Tuple[tuple, str]]:
+  """Yields `((path_id, func_addr, string_addr), literal)` pairs of all paths of the functions."""
+  for func_ea in funcs:
+    c.execute("SELECT * FROM paths WHERE func_addr = ?", (func_ea,))
+    paths = c.fetchall()
+    for path in paths:
+      path_id = path[0]
+      func_addr = path[1]
+      string_addr = path[2]
+
+      c.execute("SELECT literal FROM strings WHERE address = ?", (string_addr,))
+      string_literal = c.fetchone()
+      # line vars - skip bad path data
+      if string_literal is None:
+        continue
+
+      yield (path_id, func_addr, string_addr), string_literal[0]
 
-def make_token_paths(conn: sqlite3.Connection):
+def get_function_path_literals(c: sqlite3.Cursor, funcs: List[int]) -> Iterator[Tuple[tuple, str]]:
+  """Set-based `get_path_literals`, reads all paths with their literals in one query.
+
+  Paths of a function are in the order of `paths` UNIQUE constraint index, same as the lookups of `get_path_literals`."""
+  wanted = set(funcs)
+  func_paths = {}
+  c.execute("""SELECT paths.id, paths.func_addr, paths.string_addr, strings.literal
+            FROM paths JOIN strings ON strings.address = paths.string_addr
+            ORDER BY paths.func_addr, paths.string_addr, paths.path_func1, paths.path_func2, paths.path_func3""")
+  for path_id, func_addr, string_addr, literal in iter_rows(c):
+    if func_addr in wanted:
+      func_paths.setdefault(func_addr, []).append(((path_id, func_addr, string_addr), literal))
+
+  for func_ea in funcs:
+    yield from func_paths.get(func_ea, ())
+
+def tokenize_distinct(path_literals: List[Tuple[tuple, str]], jobs: int = 1, cache: TokenCache | None = None) -> Dict[str, List[str]]:
+  """Tokenizes each distinct literal of the paths once, returns token literals by string literal."""
+  literals = dict.fromkeys(literal for _, literal in path_literals)
+  return {literal: [token.token for token in tokens] for literal, tokens in tokenize_all(((literal, literal) for literal in literals), jobs, cache=cache)}
+
+def get_token_path_rows(path_literals: Iterable[Tuple[tuple, str]], jobs: int = 1, cache: TokenCache | None = None) -> Iterator[tuple]:
+  """Yields `(path_id, func_addr, string_addr, token_literal)` rows of the tokenized path literals."""
+  for (path_id, func_addr, string_addr), tokens in tokenize_all(path_literals, jobs, cache=cache):
+    for token in tokens:
+      yield path_id, func_addr, string_addr, token.token
+
+def make_token_paths(conn: sqlite3.Connection, jobs: int = 1, cache: TokenCache | None = None):
   """Populates function-token paths (`token_paths`) SQLite table (based on `tokens` labels)."""
   
   print(f"start:\t{datetime.now()}")
@@ -35,57 +75,87 @@ def make_token_paths(conn: sqlite3.Connection):
               names_func INTEGER)''')
 
   try:
-    c.execute("SELECT * FROM (SELECT * FROM tokens WHERE is_name = 1) AS tokens LEFT JOIN (SELECT * FROM paths WHERE to_name = 1) AS paths ON tokens.string_addr = paths.string_addr WHERE id IS NOT NULL")
+    # explicit order, independent of the query plan
+    c.execute('''SELECT tokens.*, paths.* FROM tokens JOIN paths ON tokens.string_addr = paths.string_addr
+              WHERE tokens.is_name = 1 AND paths.to_name = 1
+              ORDER BY tokens.rowid, paths.func_addr, paths.path_func1, paths.path_func2, paths.path_func3''')
   # 'no such table: x'
   except sqlite3.OperationalError as ex:
     print(ex)
     sys.exit()
 
-  # get all positive xref paths
-  tpath_positives = c.fetchall()
   # extract unique functions with path positives
-  funcs = get_unique_functions(tpath_positives)
-  lexer = Lexer("")
-  parser = PreParser([])
-  tokenizer = Tokenizer([])
+  funcs = get_unique_functions(iter_rows(c))
+  path_literals = get_path_literals(conn.cursor(), funcs)
 
-  for func_ea in funcs:
-    c.execute("SELECT * FROM paths WHERE func_addr = ?", (func_ea,))
-    paths = c.fetchall()
-    for path in paths:
-      path_id = path[0]
-      func_addr = path[1]
-      string_addr = path[2]
+  try:
+    execute_chunked(c, "INSERT INTO token_paths (path_id,func_addr,string_addr,token_literal) VALUES (?,?,?,?)", get_token_path_rows(path_literals, jobs, cache))
+  # 'no such table: token_paths'
+  except sqlite3.OperationalError as ex:
+    print(ex)
+    sys.exit()
 
-      c.execute("SELECT literal FROM strings WHERE address = ?", (string_addr,))
-      string_literal = c.fetchone()
-      # line vars - skip bad path data
-      if string_literal is None:
-        continue
+  print(f"end:\t{datetime.now()}")
 
-      tokens = tokenize(string_literal[0], lexer, parser, tokenizer)
+  conn.commit()
 
-      for token in tokens:
-        try:
-          c.execute("INSERT INTO token_paths (path_id,func_addr,string_addr,token_literal) VALUES (?,?,?,?)", (path_id, func_addr, string_addr, token.token))
-        # 'no such table: token_paths'
-        except sqlite3.OperationalError as ex:
-          print(ex)
-          sys.exit()
+def make_token_paths_bulk(conn: sqlite3.Connection, jobs: int = 1, cache: TokenCache | None = None):
+  """Bulk variant of `make_token_paths`, joins paths with strings in one query, tokenizes distinct literals once
+  and writes the token paths in one WAL-journaled transaction."""
+  start = datetime.now()
+  print(f"start:\t{start}")
 
-  print(f"end:\t{datetime.now()}")
+  c = conn.cursor()
 
-  conn.commit()
+  # same schema as `make_token_paths`
+  c.execute('''CREATE TABLE IF NOT EXISTS token_paths (
+              path_id INTEGER NOT NULL,
+              func_addr INTEGER NOT NULL,
+              string_addr INTEGER NOT NULL,
+              token_literal TEXT NOT NULL,
+              names_func INTEGER)''')
+
+  try:
+    # explicit order, independent of the query plan
+    c.execute('''SELECT tokens.*, paths.* FROM tokens JOIN paths ON tokens.string_addr = paths.string_addr
+              WHERE tokens.is_name = 1 AND paths.to_name = 1
+              ORDER BY tokens.rowid, paths.func_addr, paths.path_func1, paths.path_func2, paths.path_func3''')
+  # 'no such table: x'
+  except sqlite3.OperationalError as ex:
+    print(ex)
+    sys.exit()
+
+  funcs = get_unique_functions(iter_rows(c))
+  path_literals = list(get_function_path_literals(c, funcs))
+  tokens = tokenize_distinct(path_literals, jobs, cache)
+
+  rows = ((path_id, func_addr, string_addr, token) for (path_id, func_addr, string_addr), literal in path_literals for token in tokens[literal])
+  with bulk_load(conn):
+    count = execute_chunked(c, "INSERT INTO token_paths (path_id,func_addr,string_addr,token_literal) VALUES (?,?,?,?)", rows)
+
+  end = datetime.now()
+  elapsed = max((end - start).total_seconds(), 1e-6)
+  print(f"Processed {len(funcs)} functions, {len(path_literals)} paths and {len(tokens)} distinct strings into {count} token paths ({len(path_literals) / elapsed:.0f} paths/s)")
+  print(f"end:\t{end}")
 
 def main(argv):
   db_path = ""
-  opts, args = getopt.getopt(argv,"hd:",["dbpath="])
+  bulk = False
+  jobs = 1
+  cache_path = ""
+  opts, args = getopt.getopt(argv,"hd:bj:c:",["dbpath=", "bulk", "jobs=", "cache="])
   for opt, arg in opts:
     if opt == '-h':
       print(HELP)
       sys.exit()
     elif opt in ("-d", "--dbpath"):
       db_path = arg
+    elif opt in ("-b", "--bulk"):
+      bulk = True
+    elif opt in ("-j", "--jobs"):
+      jobs = get_jobs(arg)
+    elif opt in ("-c", "--cache"):
+      cache_path = arg
 
   if db_path == "":
     raise DbException(f"SQLite database path required\n{HELP}")
@@ -93,8 +163,15 @@ def main(argv):
     raise DbException(f"Database not found at {db_path}")
   
   conn = sqlite3.connect(db_path)
-  make_token_paths(conn)
+  ensure_indexes(conn)
+  cache = TokenCache(cache_path)
+  if bulk:
+    make_token_paths_bulk(conn, jobs, cache)
+  else:
+    make_token_paths(conn, jobs, cache)
   conn.close()
+  cache.close()
+  print(cache.stats())
   
 
 if __name__ == "__main__":
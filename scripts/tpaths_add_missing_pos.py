@@ -1,14 +1,40 @@
 import os, sys, getopt
 import sqlite3
 from datetime import datetime
-from utils.db import DbException
-from tokens.lexer import Lexer
-from tokens.preparser import PreParser
-from tokens.tokenizer import Tokenizer, tokenize
+from utils.db import DbException, execute_chunked, iter_rows
+from utils.schema import ensure_indexes
+from typing import Iterable, Iterator, Tuple
+from tokens.parallel import get_jobs, tokenize_all
+from tokens.cache import TokenCache
 
-HELP = 'Usage:\npython tpaths_add_missing_pos.py --dbpath="<database path>"\n'
+HELP = 'Usage:\npython tpaths_add_missing_pos.py --dbpath="<database path>" [--jobs=<worker processes, 0 for all CPUs>] [--cache=<token cache db path>]\n'
 
-def add_missing_positives(conn: sqlite3.Connection):
+def get_path_literals(c: sqlite3.Cursor, paths: Iterable[tuple]) -> Iterator[Tuple[tuple, str]]:
+  """Yields `((path_id, func_addr, string_addr), literal)` pairs of the paths."""
+  for path in paths:
+    path_id = path[0]
+    func_addr = path[1]
+    string_addr = path[2]
+
+    c.execute("SELECT literal FROM strings WHERE address = ?", (string_addr,))
+    string_literal = c.fetchone()
+    # line vars - skip bad path data
+    if string_literal is None:
+      print(f"Referenced string at {hex(string_addr)} doesn't exist in the database (likely a duplicate)")
+      continue
+
+    yield (path_id, func_addr, string_addr), string_literal[0]
+
+def get_token_path_rows(path_literals: Iterable[Tuple[tuple, str]], jobs: int = 1, cache: TokenCache | None = None) -> Iterator[tuple]:
+  """Yields `token_paths_positive` rows of the tokenized path literals."""
+  count = 0
+  for (path_id, func_addr, string_addr), tokens in tokenize_all(path_literals, jobs, cache=cache):
+    for token in tokens:
+      count += 1
+      print(f"{count}.\t{path_id}\t{token.token}")
+      yield path_id, func_addr, string_addr, token.token
+
+def add_missing_positives(conn: sqlite3.Connection, jobs: int = 1, cache: TokenCache | None = None):
   """Adds missing token paths from `paths` positives to `token_paths_positive` to be labelled and merged into `token_paths`."""
 
   print(f"start:\t{datetime.now()}")
@@ -24,40 +50,21 @@ def add_missing_positives(conn: sqlite3.Connection):
               names_func INTEGER)''')
   
   # get path positives missing token paths
+  missing_pos = conn.cursor()
   try:
-    c.execute('''SELECT * FROM (SELECT * FROM paths WHERE to_name = 1) LEFT JOIN token_paths ON id = path_id WHERE token_literal IS NULL''')
-    missing_pos = c.fetchall()
+    missing_pos.execute('''SELECT * FROM (SELECT * FROM paths WHERE to_name = 1) LEFT JOIN token_paths ON id = path_id WHERE token_literal IS NULL''')
   except:
     raise DbException("Missing `paths` table")
   
   # get unlabelled paths of a function positive
-  count = 0
-  for path in missing_pos:
-    path_id = path[0]
-    func_addr = path[1]
-    string_addr = path[2]
-    lexer = Lexer("")
-    parser = PreParser([])
-    tokenizer = Tokenizer([])
+  path_literals = get_path_literals(conn.cursor(), iter_rows(missing_pos))
 
-    c.execute("SELECT literal FROM strings WHERE address = ?", (string_addr,))
-    string_literal = c.fetchone()
-    # line vars - skip bad path data
-    if string_literal is None:
-      print(f"Referenced string at {hex(string_addr)} doesn't exist in the database (likely a duplicate)")
-      continue
-
-    tokens = tokenize(string_literal[0], lexer, parser, tokenizer)
-  
-    for token in tokens:
-      try:
-        c.execute("INSERT INTO token_paths_positive (path_id,func_addr,string_addr,token_literal) VALUES (?,?,?,?)", (path_id, func_addr, string_addr, token.token))
-        count += 1
-      # 'no such table: token_paths'
-      except sqlite3.OperationalError as ex:
-        print(ex)
-        sys.exit()
-      print(f"{count}.\t{path_id}\t{token.token}")
+  try:
+    execute_chunked(c, "INSERT INTO token_paths_positive (path_id,func_addr,string_addr,token_literal) VALUES (?,?,?,?)", get_token_path_rows(path_literals, jobs, cache))
+  # 'no such table: token_paths'
+  except sqlite3.OperationalError as ex:
+    print(ex)
+    sys.exit()
 
   print(f"end:\t{datetime.now()}")
 
@@ -65,13 +72,19 @@ def add_missing_positives(conn: sqlite3.Connection):
 
 def main(argv):
   db_path = ""
-  opts, args = getopt.getopt(argv,"hd:",["dbpath="])
+  jobs = 1
+  cache_path = ""
+  opts, args = getopt.getopt(argv,"hd:j:c:",["dbpath=", "jobs=", "cache="])
   for opt, arg in opts:
     if opt == '-h':
       print(HELP)
       sys.exit()
     elif opt in ("-d", "--dbpath"):
       db_path = arg
+    elif opt in ("-j", "--jobs"):
+      jobs = get_jobs(arg)
+    elif opt in ("-c", "--cache"):
+      cache_path = arg
 
   if db_path == "":
     raise DbException(f"SQLite database path required\n{HELP}")
@@ -79,8 +92,12 @@ def main(argv):
     raise DbException(f"Database not found at {db_path}")
   
   conn = sqlite3.connect(db_path)
-  add_missing_positives(conn)
+  ensure_indexes(conn)
+  cache = TokenCache(cache_path)
+  add_missing_positives(conn, jobs, cache)
   conn.close()
+  cache.close()
+  print(cache.stats())
   
 
 if __name__ == "__main__":
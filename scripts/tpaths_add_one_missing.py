@@ -2,14 +2,16 @@ import os, sys, getopt
 import sqlite3
 from datetime import datetime
 from utils.db import DbException
+from utils.schema import ensure_indexes
 from tokens.lexer import Lexer
 from tokens.preparser import PreParser
-from tokens.tokenizer import Tokenizer, tokenize
+from tokens.tokenizer import Tokenizer
+from tokens.cache import TokenCache
 
 
-HELP = 'Usage:\npython tpaths_add_one_missing.py --dbpath="<database path>" --pathid=<path id>\n'
+HELP = 'Usage:\npython tpaths_add_one_missing.py --dbpath="<database path>" --pathid=<path id> [--cache=<token cache db path>]\n'
 
-def add_one_missing(conn: sqlite3.Connection, id: int):
+def add_one_missing(conn: sqlite3.Connection, id: int, cache: TokenCache):
   """Adds missing `tokens` and `token_paths` of a single unlabelled string referenced by a path."""
   
   print(f"start:\t{datetime.now()}")
@@ -57,7 +59,7 @@ def add_one_missing(conn: sqlite3.Connection, id: int):
   parser = PreParser([])
   tokenizer = Tokenizer([])
 
-  tokens = tokenize(string_literal, lexer, parser, tokenizer)
+  tokens = cache.tokenize(string_literal, lexer, parser, tokenizer)
 
   for token in tokens:
     try:
@@ -80,7 +82,8 @@ def add_one_missing(conn: sqlite3.Connection, id: int):
 def main(argv):
   db_path = ""
   id = ""
-  opts, args = getopt.getopt(argv,"hdp:",["dbpath=", "pathid="])
+  cache_path = ""
+  opts, args = getopt.getopt(argv,"hdp:c:",["dbpath=", "pathid=", "cache="])
   for opt, arg in opts:
     if opt == '-h':
       print(HELP)
@@ -89,6 +92,8 @@ def main(argv):
       db_path = arg
     elif opt in ("-p", "--pathid"):
       id = arg
+    elif opt in ("-c", "--cache"):
+      cache_path = arg
 
   if db_path == "":
     raise DbException(f"SQLite database path required\n{HELP}")
@@ -96,8 +101,12 @@ def main(argv):
     raise DbException(f"Database not found at {db_path}")
   
   conn = sqlite3.connect(db_path)
-  add_one_missing(conn, int(id))
+  ensure_indexes(conn)
+  cache = TokenCache(cache_path)
+  add_one_missing(conn, int(id), cache)
   conn.close()
+  cache.close()
+  print(cache.stats())
   
 
 if __name__ == "__main__":
@@ -1,59 +1,52 @@
 import os, sys, getopt
 import sqlite3
 from datetime import datetime
-from utils.db import DbException
+from utils.db import DbException, iter_rows
+from utils.schema import ensure_indexes
 
 
-HELP = 'Usage:\npython tpaths_cleanse.py --dbpath="<database path>"\n'
+HELP = 'Usage:\npython tpaths_cleanse.py --dbpath="<database path>" [--quiet]\n'
 
-def cleanse(conn: sqlite3.Connection):
+def cleanse(conn: sqlite3.Connection, quiet: bool = False):
   """Unlabels token paths which refer to unlabelled paths."""
   
   print(f"start:\t{datetime.now()}")
 
   c = conn.cursor()
 
+  # all token paths missing labelling in paths
+  candidates = "SELECT path_id, token_literal FROM (SELECT * FROM token_paths WHERE names_func IS NOT NULL) LEFT JOIN paths ON path_id = id WHERE to_name IS NULL"
   try:
-    # get all token paths missing labelling in paths
-    c.execute("SELECT * FROM (SELECT * FROM token_paths WHERE names_func IS NOT NULL) LEFT JOIN paths ON path_id = id WHERE to_name IS NULL")
+    if not quiet:
+      c.execute(candidates)
+      for count, (path_id, token_literal) in enumerate(iter_rows(c), 1):
+        print(f"{count}. {path_id} {token_literal}")
+
+    # one statement, the candidates are selected before the update
+    changes = conn.total_changes
+    c.execute(f"UPDATE token_paths SET names_func = NULL WHERE (path_id, token_literal) IN ({candidates})")
   # 'no such table: x'
   except sqlite3.OperationalError as ex:
     print(ex)
     sys.exit()
 
-  # get all labelled negative function-token paths
-  tpaths = c.fetchall()
-  path_id = 0
-  token_literal = ""
-  count = 0
-  for tpath in tpaths:
-    path_id = tpath[0]
-    token_literal = tpath[3]
-    
-    try:
-      c.execute("UPDATE token_paths SET names_func = NULL WHERE path_id = ? AND token_literal = ?", (path_id, token_literal))
-    # 'no such table: token_paths'
-    except sqlite3.OperationalError as ex:
-      print(ex)
-      sys.exit()
-    
-    count += 1
-    print(f"{count}. {path_id} {token_literal}")
-
-  print(f"Unlabelled {count} token paths missing path labelling")
+  print(f"Unlabelled {conn.total_changes - changes} token paths missing path labelling")
   print(f"end:\t{datetime.now()}")
 
   conn.commit()
 
 def main(argv):
   db_path = ""
-  opts, args = getopt.getopt(argv,"hd:",["dbpath="])
+  quiet = False
+  opts, args = getopt.getopt(argv,"hd:q",["dbpath=", "quiet"])
   for opt, arg in opts:
     if opt == '-h':
       print(HELP)
       sys.exit()
     elif opt in ("-d", "--dbpath"):
       db_path = arg
+    elif opt in ("-q", "--quiet"):
+      quiet = True
 
   if db_path == "":
     raise DbException(f"SQLite database path required\n{HELP}")
@@ -61,7 +54,8 @@ def main(argv):
     raise DbException(f"Database not found at {db_path}")
   
   conn = sqlite3.connect(db_path)
-  cleanse(conn)
+  ensure_indexes(conn)
+  cleanse(conn, quiet)
   conn.close()
   
 
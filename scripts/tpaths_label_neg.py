@@ -1,58 +1,52 @@
 import os, sys, getopt
 import sqlite3
 from datetime import datetime
-from utils.db import DbException
+from utils.db import DbException, iter_rows
+from utils.schema import ensure_indexes
 
 
-HELP = 'Usage:\npython tpaths_label_neg.py --dbpath="<database path>"\n'
+HELP = 'Usage:\npython tpaths_label_neg.py --dbpath="<database path>" [--quiet]\n'
 
-def label_negative(conn: sqlite3.Connection):
+def label_negative(conn: sqlite3.Connection, quiet: bool = False):
   """Adds missing labels of negative token paths (based on `paths` labels)."""
   
   print(f"start:\t{datetime.now()}")
 
   c = conn.cursor()
 
+  # all negative token paths missing labelling in token paths
+  candidates = "SELECT path_id, token_literal FROM (SELECT * FROM paths WHERE to_name = 0) JOIN token_paths ON id = path_id WHERE token_literal IS NOT NULL AND names_func IS NULL"
   try:
-    # get all negative token paths missing labelling in token paths
-    c.execute("SELECT * FROM (SELECT * FROM paths WHERE to_name = 0) JOIN token_paths ON id = path_id WHERE token_literal IS NOT NULL AND names_func IS NULL")
+    if not quiet:
+      c.execute(candidates)
+      for count, (path_id, token_literal) in enumerate(iter_rows(c), 1):
+        print(f"{count}.\t{path_id}\t{token_literal}")
+
+    # one statement, the candidates are selected before the update
+    changes = conn.total_changes
+    c.execute(f"UPDATE token_paths SET names_func = 0 WHERE (path_id, token_literal) IN ({candidates})")
   # 'no such table: x'
   except sqlite3.OperationalError as ex:
     print(ex)
     sys.exit()
 
-  # get all labelled negative function-token paths
-  path_negs = c.fetchall()
-  path_id = 0
-  token_literal = ""
-  count = 0
-  for path in path_negs:
-    count += 1
-    path_id = path[0]
-    token_literal = path[12]
-    print(f"{count}.\t{path_id}\t{token_literal}")
-    
-    try:
-      c.execute("UPDATE token_paths SET names_func = 0 WHERE path_id = ? AND token_literal = ?", (path_id, token_literal))
-    # 'no such table: token_paths'
-    except sqlite3.OperationalError as ex:
-      print(ex)
-      sys.exit()
-
-  print(f"Labelled {count} missing negative token paths")
+  print(f"Labelled {conn.total_changes - changes} missing negative token paths")
   print(f"end:\t{datetime.now()}")
 
   conn.commit()
 
 def main(argv):
   db_path = ""
-  opts, args = getopt.getopt(argv,"hd:",["dbpath="])
+  quiet = False
+  opts, args = getopt.getopt(argv,"hd:q",["dbpath=", "quiet"])
   for opt, arg in opts:
     if opt == '-h':
       print(HELP)
       sys.exit()
     elif opt in ("-d", "--dbpath"):
       db_path = arg
+    elif opt in ("-q", "--quiet"):
+      quiet = True
 
   if db_path == "":
     raise DbException(f"SQLite database path required\n{HELP}")
@@ -60,7 +54,8 @@ def main(argv):
     raise DbException(f"Database not found at {db_path}")
   
   conn = sqlite3.connect(db_path)
-  label_negative(conn)
+  ensure_indexes(conn)
+  label_negative(conn, quiet)
   conn.close()
   
 
@@ -1,7 +1,8 @@
 import os, sys, getopt
 import sqlite3
 from datetime import datetime
-from utils.db import DbException
+from utils.db import DbException, execute_chunked, iter_rows
+from utils.schema import ensure_indexes
 
 
 HELP = 'Usage:\npython tpaths_merge_pos.py --dbpath=<database path>\n'
@@ -14,28 +15,23 @@ def merge_token_paths(conn: sqlite3.Connection):
   c = conn.cursor()
 
   try:
-    c.execute("SELECT * FROM token_paths_positive")
+    # in order, the last label of a token path wins
+    c.execute("SELECT names_func, path_id, token_literal FROM token_paths_positive ORDER BY rowid")
   # 'no such table: x'
   except sqlite3.OperationalError as ex:
     print(ex)
     sys.exit()
 
-  # get all positive function-string paths
-  positive_paths = c.fetchall()
-
-  for path in positive_paths:
-    path_id = path[0]
-    token = path[3]
-    label = path[4]
-
-    try:
-      c.execute("UPDATE token_paths SET names_func = ? WHERE path_id = ? AND token_literal = ?", (label, path_id, token))
-    # 'no such table: token_paths'
-    except sqlite3.OperationalError as ex:
-      print(ex)
-      sys.exit()
+  # get all positive function-string paths, batched updates are served by `token_paths` path index
+  try:
+    count = execute_chunked(conn.cursor(), "UPDATE token_paths SET names_func = ? WHERE path_id = ? AND token_literal = ?", iter_rows(c))
+  # 'no such table: token_paths'
+  except sqlite3.OperationalError as ex:
+    print(ex)
+    sys.exit()
 
   conn.commit()
+  print(f"Merged {count} positive token path labels")
 
   # delete the helper table
   c.execute("DROP TABLE token_paths_positive")
@@ -59,6 +55,7 @@ def main(argv):
     raise DbException(f"Database not found at {db_path}")
   
   conn = sqlite3.connect(db_path)
+  ensure_indexes(conn)
   merge_token_paths(conn)
   conn.close()
   
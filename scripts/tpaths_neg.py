@@ -1,16 +1,46 @@
 import os, sys, getopt
 import sqlite3
 from datetime import datetime
-from utils.db import DbException
-from tokens.lexer import Lexer
-from tokens.preparser import PreParser
-from tokens.tokenizer import Tokenizer, tokenize
+from utils.db import DbException, execute_chunked, iter_rows
+from utils.schema import ensure_indexes
+from utils.progress import ProgressBar
+from typing import Iterable, Iterator, Tuple
+from tokens.parallel import get_jobs, tokenize_all
+from tokens.cache import TokenCache
 
 
-HELP = 'Usage:\npython tpaths_neg.py --dbpath="<database path>"\n'
+HELP = 'Usage:\npython tpaths_neg.py --dbpath="<database path>" [--quiet] [--jobs=<worker processes, 0 for all CPUs>] [--cache=<token cache db path>]\n'
 
-def make_token_paths_negative(conn: sqlite3.Connection):
-  """Adds and autolabels negative `token_paths` (based on `paths` labels)."""
+def get_path_literals(c: sqlite3.Cursor, paths: Iterable[tuple]) -> Iterator[Tuple[tuple, str]]:
+  """Yields `((path_id, func_addr, string_addr), literal)` pairs of the paths."""
+  for path in paths:
+    path_id = path[0]
+    func_addr = path[1]
+    string_addr = path[2]
+
+    c.execute("SELECT literal FROM strings WHERE address = ?", (string_addr,))
+    string_literal = c.fetchone()
+    # line vars - skip bad path data
+    if string_literal is None:
+      print(f"Referenced string at {hex(string_addr)} doesn't exist in the database (likely a duplicate)")
+      continue
+
+    yield (path_id, func_addr, string_addr), string_literal[0]
+
+def get_token_path_rows(path_literals: Iterable[Tuple[tuple, str]], jobs: int = 1, cache: TokenCache | None = None, quiet: bool = False) -> Iterator[tuple]:
+  """Yields negative `token_paths` rows of the tokenized path literals."""
+  count = 0
+  for (path_id, func_addr, string_addr), tokens in tokenize_all(path_literals, jobs, cache=cache):
+    for token in tokens:
+      count += 1
+      if not quiet:
+        print(f"{count}.\t{path_id}\t{token.token}")
+      yield path_id, func_addr, string_addr, token.token, 0
+
+def make_token_paths_negative(conn: sqlite3.Connection, jobs: int = 1, cache: TokenCache | None = None, quiet: bool = False):
+  """Adds and autolabels negative `token_paths` (based on `paths` labels).
+
+  Quiet mode shows a progress bar of the processed paths instead of every added token path."""
   
   print(f"start:\t{datetime.now()}")
 
@@ -26,42 +56,34 @@ def make_token_paths_negative(conn: sqlite3.Connection):
 
   try:
     # get all negative paths missing token paths
-    c.execute("SELECT * FROM (SELECT * FROM paths WHERE to_name = 0) LEFT JOIN token_paths ON id = path_id WHERE token_literal IS NULL")
+    # (copied to a temporary table, `token_paths` is modified while they are read)
+    c.execute('''CREATE TEMP TABLE missing_negatives AS
+              SELECT paths.id, paths.func_addr, paths.string_addr FROM (SELECT * FROM paths WHERE to_name = 0) AS paths
+              LEFT JOIN token_paths ON id = path_id WHERE token_literal IS NULL''')
   # 'no such table: x'
   except sqlite3.OperationalError as ex:
     print(ex)
     sys.exit()
 
   # get all labelled negative function-string paths
-  path_negs = c.fetchall()
-  lexer = Lexer("")
-  parser = PreParser([])
-  tokenizer = Tokenizer([])
-  count = 0
+  path_negs = conn.cursor()
+  path_negs.execute("SELECT * FROM missing_negatives ORDER BY rowid")
+  paths = iter_rows(path_negs)
+  progress = None
+  if quiet:
+    progress = ProgressBar(conn.execute("SELECT COUNT(*) FROM missing_negatives").fetchone()[0])
+    paths = progress.track(paths)
+  path_literals = get_path_literals(conn.cursor(), paths)
 
-  for path in path_negs:
-    path_id = path[0]
-    func_addr = path[1]
-    string_addr = path[2]
-
-    c.execute("SELECT literal FROM strings WHERE address = ?", (string_addr,))
-    string_literal = c.fetchone()
-    # line vars - skip bad path data
-    if string_literal is None:
-      print(f"Referenced string at {hex(string_addr)} doesn't exist in the database (likely a duplicate)")
-      continue
-
-    tokens = tokenize(string_literal[0], lexer, parser, tokenizer)
-    
-    for token in tokens:
-      try:
-        c.execute("INSERT INTO token_paths VALUES (?,?,?,?,?)", (path_id, func_addr, string_addr, token.token, 0))
-        count += 1
-      # 'no such table: token_paths'
-      except sqlite3.OperationalError as ex:
-        print(ex)
-        sys.exit()
-      print(f"{count}.\t{path_id}\t{token.token}")
+  try:
+    count = execute_chunked(c, "INSERT INTO token_paths VALUES (?,?,?,?,?)", get_token_path_rows(path_literals, jobs, cache, quiet))
+  # 'no such table: token_paths'
+  except sqlite3.OperationalError as ex:
+    print(ex)
+    sys.exit()
+  if progress is not None:
+    progress.close()
+  c.execute("DROP TABLE missing_negatives")
 
   print(f"Added and labelled {count} missing negative token paths")
   print(f"end:\t{datetime.now()}")
@@ -70,13 +92,22 @@ def make_token_paths_negative(conn: sqlite3.Connection):
 
 def main(argv):
   db_path = ""
-  opts, args = getopt.getopt(argv,"hd:",["dbpath="])
+  jobs = 1
+  cache_path = ""
+  quiet = False
+  opts, args = getopt.getopt(argv,"hd:qj:c:",["dbpath=", "quiet", "jobs=", "cache="])
   for opt, arg in opts:
     if opt == '-h':
       print(HELP)
       sys.exit()
     elif opt in ("-d", "--dbpath"):
       db_path = arg
+    elif opt in ("-q", "--quiet"):
+      quiet = True
+    elif opt in ("-j", "--jobs"):
+      jobs = get_jobs(arg)
+    elif opt in ("-c", "--cache"):
+      cache_path = arg
 
   if db_path == "":
     raise DbException(f"SQLite database path required\n{HELP}")
@@ -84,8 +115,12 @@ def main(argv):
     raise DbException(f"Database not found at {db_path}")
   
   conn = sqlite3.connect(db_path)
-  make_token_paths_negative(conn)
+  ensure_indexes(conn)
+  cache = TokenCache(cache_path)
+  make_token_paths_negative(conn, jobs, cache, quiet)
   conn.close()
+  cache.close()
+  print(cache.stats())
   
 
 if __name__ == "__main__":
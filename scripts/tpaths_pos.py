@@ -1,7 +1,9 @@
 import os, sys, getopt
 import sqlite3
 from datetime import datetime
-from utils.db import DbException
+from typing import Iterable, Iterator
+from utils.db import DbException, execute_chunked, iter_rows
+from utils.schema import ensure_indexes
 from tokens.lexer import Lexer
 from tokens.preparser import PreParser
 from tokens.tokenizer import Tokenizer, tokenize
@@ -9,6 +11,28 @@ from tokens.tokenizer import Tokenizer, tokenize
 
 HELP = 'Usage:\npython tpaths_pos.py --dbpath=<database path>\n'
 
+def get_token_path_rows(c: sqlite3.Cursor, tpath_positives: Iterable[tuple]) -> Iterator[tuple]:
+  """Yields `(path_id, func_addr, string_addr, token_literal)` rows of the tokenized path literals."""
+  lexer = Lexer("")
+  parser = PreParser([])
+  tokenizer = Tokenizer([])
+
+  for path in tpath_positives:
+    path_id = path[3]
+    func_addr = path[4]
+    string_addr = path[5]
+
+    c.execute("SELECT literal FROM strings WHERE address = ?", (string_addr,))
+    string_literal = c.fetchone()
+    # line vars - skip bad path data
+    if string_literal is None:
+      continue
+
+    tokens = tokenize(string_literal[0], lexer, parser, tokenizer)
+
+    for token in tokens:
+      yield path_id, func_addr, string_addr, token.token
+
 def make_token_paths_positive(conn: sqlite3.Connection):
   """Populates `token_paths_positive` SQLite helper table (for manual labelling)."""
   
@@ -25,38 +49,23 @@ def make_token_paths_positive(conn: sqlite3.Connection):
               names_func INTEGER)''')
 
   try:
-    c.execute("SELECT * FROM (SELECT * FROM tokens WHERE is_name = 1) AS tokens LEFT JOIN (SELECT * FROM paths WHERE to_name = 1) AS paths ON tokens.string_addr = paths.string_addr WHERE id IS NOT NULL")
+    # explicit order, independent of the query plan
+    c.execute('''SELECT tokens.*, paths.* FROM tokens JOIN paths ON tokens.string_addr = paths.string_addr
+              WHERE tokens.is_name = 1 AND paths.to_name = 1
+              ORDER BY tokens.rowid, paths.func_addr, paths.path_func1, paths.path_func2, paths.path_func3''')
   # 'no such table: x'
   except sqlite3.OperationalError as ex:
     print(ex)
     sys.exit()
 
   # get all positive function-string paths
-  tpath_positives = c.fetchall()
-  lexer = Lexer("")
-  parser = PreParser([])
-  tokenizer = Tokenizer([])
-
-  for path in tpath_positives:
-    path_id = path[3]
-    func_addr = path[4]
-    string_addr = path[5]
-
-    c.execute("SELECT literal FROM strings WHERE address = ?", (string_addr,))
-    string_literal = c.fetchone()
-    # line vars - skip bad path data
-    if string_literal is None:
-      continue
-
-    tokens = tokenize(string_literal[0], lexer, parser, tokenizer)
-
-    for token in tokens:
-      try:
-        c.execute("INSERT INTO token_paths_positive (path_id,func_addr,string_addr,token_literal) VALUES (?,?,?,?)", (path_id, func_addr, string_addr, token.token))
-      # 'no such table: token_paths_positive'
-      except sqlite3.OperationalError as ex:
-        print(ex)
-        sys.exit()
+  rows = get_token_path_rows(conn.cursor(), iter_rows(c))
+  try:
+    execute_chunked(conn.cursor(), "INSERT INTO token_paths_positive (path_id,func_addr,string_addr,token_literal) VALUES (?,?,?,?)", rows)
+  # 'no such table: token_paths_positive'
+  except sqlite3.OperationalError as ex:
+    print(ex)
+    sys.exit()
 
   print(f"end:\t{datetime.now()}")
 
@@ -78,6 +87,7 @@ def main(argv):
     raise DbException(f"Database not found at {db_path}")
   
   conn = sqlite3.connect(db_path)
+  ensure_indexes(conn)
   make_token_paths_positive(conn)
   conn.close()
   
@@ -0,0 +1,180 @@
+import random
+from typing import Callable, Dict, List
+
+IDENTIFIERS = [
+  "TArray", "FString", "UObject", "AActor", "FName", "TMap", "TSharedPtr", "FVector",
+  "vector", "basic_string", "allocator", "char_traits", "unique_ptr", "oo2", "oo2net",
+  "Update", "Tick", "GetName", "Serialize", "operator", "new", "delete", "__int64", "x64", "0x1F",
+]
+"""Identifier-like building blocks of synthetic literals."""
+
+PUNCTUATION = " <>:~!%^&*()-+=|[],/`@#$\\{};'\"?."
+"""Special characters recognized by the lexer."""
+
+OTHER = "\t\n\r\x00é€中²٣"
+"""Characters outside of the lexer alphabet (including non-ASCII digits)."""
+
+SAMPLES = [
+  "TIndexedContainerIterator<TArray<TScriptDelegate<FWeakObjectPtr>,TSizedInlineAllocator<4,32,TSizedDefaultAllocator<32> > > const ,TScriptDelegate<FWeakObjectPtr> const ,int>::operator->",
+  "oo2::vector_flex<unsigned __int64,oo2::vector_storage_a<unsigned __int64> >::vector_flex<unsigned __int64,oo2::vector_storage_a<unsigned __int64> >",
+  "oo2net::vector_storage<oo2net::rated_packet>::~vector_storage<oo2net::rated_packet>",
+  "TSparseDynamicDelegate<FActorBeginOverlapSignature_MCSignature,AActor,FActorBeginOverlapSignatureInfoGetter>::Add",
+  "std::basic_string<char,std::char_traits<char>,std::allocator<char> >::operator=",
+  "std::vector<int>::operator[]",
+  "operator new[]",
+  "operator delete",
+  "Foo::operator <<=",
+  "Foo::operator ->*",
+  "C:\\Program Files\\Epic Games\\UE_4.27\\Engine\\Source\\Runtime\\Core\\Private\\Misc\\OutputDevice.cpp",
+  "D:\\\\build\\\\++UE4\\\\Sync\\\\Engine\\\\Plugins\\\\Online\\\\OnlineSubsystem.h",
+  "/usr/include/c++/9/bits/stl_vector.h",
+  "..\\..\\src\\main.c",
+  "Assertion failed: %s, file %s, line %d\\n",
+  "LogTemp: Warning: Failed to load '%s' (%d)",
+  "\\r\\nError: \\t%s\\r\\n",
+  "Unknown exception",
+  "bad allocation",
+  "12345",
+  "x86_64-pc-windows-msvc",
+  "",
+]
+"""Hand-picked literals covering the main token structures."""
+
+def make_literal(rand: random.Random, max_parts: int = 12) -> str:
+  """Returns a random literal assembled from identifiers, special characters and unknown characters."""
+  parts = []
+  for _ in range(rand.randint(1, max_parts)):
+    roll = rand.random()
+    if roll < 0.5:
+      parts.append(rand.choice(IDENTIFIERS))
+    elif roll < 0.93:
+      parts.append(rand.choice(PUNCTUATION))
+    else:
+      parts.append(rand.choice(OTHER))
+  return "".join(parts)
+
+def make_template(rand: random.Random, depth: int, width: int = 3) -> str:
+  """Returns a random template name nested up to `depth` levels, occasionally unbalanced or with invalid argument characters."""
+  name = rand.choice(IDENTIFIERS)
+  if depth <= 0:
+    return name
+  args = ",".join(make_template(rand, depth - 1, width) for _ in range(rand.randint(1, width)))
+  roll = rand.random()
+  if roll < 0.05:
+    return f"{name}<{args}"
+  elif roll < 0.1:
+    return f"{name}{args}>"
+  elif roll < 0.15:
+    return f"{name}<{args}.{rand.choice(PUNCTUATION)}>"
+  return f"{name}<{args}>"
+
+def make_function_name(rand: random.Random, max_scopes: int = 4) -> str:
+  """Returns a random qualified function name: regular, templated, operator, constructor or destructor (valid or not)."""
+  scopes = [rand.choice(IDENTIFIERS) + (f"<{make_template(rand, 1)}>" if rand.random() < 0.3 else "") for _ in range(rand.randint(0, max_scopes))]
+  cls = rand.choice(IDENTIFIERS)
+  templ = f"<{make_template(rand, 2)}>" if rand.random() < 0.4 else ""
+  roll = rand.random()
+  if roll < 0.25:
+    name = f"{cls}{templ}::{cls}{templ}"
+  elif roll < 0.5:
+    name = f"{cls}{templ}::~{rand.choice([cls, rand.choice(IDENTIFIERS)])}{templ}"
+  elif roll < 0.65:
+    name = f"{cls}{templ}::operator{rand.choice(['==', '()', '[]', ' new', '->', '<<='])}"
+  else:
+    name = f"{cls}{templ}::{rand.choice(IDENTIFIERS)}" + (f"<{make_template(rand, 1)}>" if rand.random() < 0.3 else "")
+  # occasional trailing explicit template arguments and surrounding text
+  if rand.random() < 0.1:
+    name += f"<{make_template(rand, 1)}>"
+  if rand.random() < 0.2:
+    name = f"{rand.choice(IDENTIFIERS)} {name}{rand.choice(PUNCTUATION)}"
+  return "::".join(scopes + [name])
+
+OPERATOR_SYMBOLS = [
+  "<", ">", "~", ",", "=", "+", "-", "*", "/", "!", "&", "|", "%", "^", "(", ")", "[", "]",
+  " ", "new", "delete", "new[]", "delete[]", "->*", "<<=", ">>=", "()", "[]", "\\\\", "\x00", "1",
+]
+"""Symbols found after (or instead of) the operators of demangled names."""
+
+def make_operator_name(rand: random.Random) -> str:
+  """Returns a random demangled operator name, possibly malformed."""
+  symbol = "".join(rand.choice(OPERATOR_SYMBOLS) for _ in range(rand.randint(0, 3)))
+  space = " " if rand.random() < 0.3 else ""
+  name = f"{rand.choice(IDENTIFIERS)}::operator{space}{symbol}"
+  if rand.random() < 0.3:
+    name += rand.choice(["", " ", "(", "<T>", "::x", " operator"])
+  return name
+
+def make_corpus(size: int, seed: int = 0) -> List[str]:
+  """Returns a reproducible corpus of hand-picked and random literals."""
+  rand = random.Random(seed)
+  corpus = list(SAMPLES)
+  while len(corpus) < size:
+    corpus.append(make_literal(rand))
+  return corpus[:size]
+
+WORDS = [
+  "Failed", "to", "load", "file", "error", "Warning", "invalid", "argument", "Assertion", "failed",
+  "connection", "closed", "unknown", "exception", "bad", "allocation", "out", "of", "memory", "LogTemp",
+]
+"""Words of C string messages."""
+
+FORMATS = ["%s", "%d", "%u", "%x", "%08X", "%p", "%f", "%.2f", "%lld", "%ls", "\\n", "\\r\\n", "\\t"]
+"""Format specifiers and escapes of C string messages."""
+
+MANGLED_PREFIXES = ["?", "??0", "??1", "??_G", "??$", "??4", "??H", "??_7"]
+"""MSVC name prefixes (plain names, special member functions and template names)."""
+
+MANGLED_SIGNATURES = ["QEAAXXZ", "QEBA_NXZ", "UEAAXH@Z", "SAPEAV1@XZ", "AEAAHPEBD@Z", "QEAA@XZ", "6B@", "QAEXXZ", "YAXPAX@Z"]
+"""MSVC type encodings following the qualified name."""
+
+def make_c_string(rand: random.Random) -> str:
+  """Returns a random C string message with format specifiers and escapes."""
+  parts = []
+  for _ in range(rand.randint(1, 10)):
+    parts.append(rand.choice(FORMATS) if rand.random() < 0.25 else rand.choice(WORDS))
+  separator = rand.choice([" ", ": ", ", "])
+  return separator.join(parts) + rand.choice(["", ".", "\\n", "!"])
+
+def make_path(rand: random.Random) -> str:
+  """Returns a random Windows or POSIX file path."""
+  parts = [rand.choice(IDENTIFIERS + WORDS) for _ in range(rand.randint(1, 8))]
+  file = f"{rand.choice(IDENTIFIERS)}.{rand.choice(['cpp', 'h', 'c', 'dll', 'pdb'])}"
+  roll = rand.random()
+  if roll < 0.4:
+    return "C:\\" + "\\".join(parts + [file])
+  elif roll < 0.6:
+    return "D:\\\\" + "\\\\".join(parts + [file])
+  elif roll < 0.8:
+    return "/" + "/".join(parts + [file])
+  return "..\\" + "\\".join(parts + [file])
+
+def make_mangled_name(rand: random.Random) -> str:
+  """Returns a random MSVC-mangled function name."""
+  scopes = [rand.choice(IDENTIFIERS) for _ in range(rand.randint(1, 4))]
+  prefix = rand.choice(MANGLED_PREFIXES)
+  if prefix == "??$":
+    scopes[0] += f"@{rand.choice(['H', 'M', 'PEAV' + rand.choice(IDENTIFIERS) + '@@', '_N'])}"
+  return prefix + "@".join(scopes) + "@@" + rand.choice(MANGLED_SIGNATURES)
+
+def make_demangled_name(rand: random.Random) -> str:
+  """Returns a random demangled function or operator name."""
+  return make_operator_name(rand) if rand.random() < 0.2 else make_function_name(rand)
+
+def make_long_template(rand: random.Random) -> str:
+  """Returns a random deeply nested template name."""
+  return make_template(rand, rand.randint(4, 8), 2)
+
+CORPORA: Dict[str, Callable[[random.Random], str]] = {
+  "c_strings": make_c_string,
+  "paths": make_path,
+  "mangled": make_mangled_name,
+  "demangled": make_demangled_name,
+  "templates": make_long_template,
+  "mixed": make_literal,
+}
+"""Synthetic literal generators by corpus name."""
+
+def make_named_corpus(name: str, size: int, seed: int = 0) -> List[str]:
+  """Returns a reproducible corpus of literals of a single kind (see `CORPORA`)."""
+  rand = random.Random(seed)
+  return [CORPORA[name](rand) for _ in range(size)]
@@ -1,4 +1,62 @@
+import sqlite3
+from contextlib import contextmanager
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+BULK_CHUNK_SIZE = 10000
+"""Number of rows written per `executemany` call in bulk modes."""
+
+FETCH_SIZE = 1000
+"""Number of rows fetched per `fetchmany` call in streaming reads."""
+
 class DbException(Exception):
   """SQLite database exception."""
-  def __init__(self, message):            
+  def __init__(self, message):
     super().__init__(message)
+
+def chunked(rows: Iterable, size: int = BULK_CHUNK_SIZE) -> Iterator[List]:
+  """Splits an iterable into lists of at most `size` elements."""
+  it = iter(rows)
+  while True:
+    chunk = list(islice(it, size))
+    if len(chunk) == 0:
+      return
+    yield chunk
+
+def iter_rows(c: sqlite3.Cursor, size: int = FETCH_SIZE) -> Iterator[tuple]:
+  """Yields the rows of an executed query, fetching `size` rows at a time.
+
+  The cursor must not be reused until the rows are consumed."""
+  while True:
+    rows = c.fetchmany(size)
+    if len(rows) == 0:
+      return
+    yield from rows
+
+def execute_chunked(c: sqlite3.Cursor, sql: str, rows: Iterable, size: int = BULK_CHUNK_SIZE) -> int:
+  """Executes a statement for each row of an iterable in `executemany` batches of `size` rows, returns the number of rows."""
+  count = 0
+  for chunk in chunked(rows, size):
+    c.executemany(sql, chunk)
+    count += len(chunk)
+  return count
+
+@contextmanager
+def bulk_load(conn: sqlite3.Connection):
+  """Switches the database to WAL journal with relaxed syncing for a bulk load, restores the journal mode afterwards."""
+  c = conn.cursor()
+  # journal mode cannot be changed inside of a transaction
+  conn.commit()
+  journal_mode = c.execute("PRAGMA journal_mode").fetchone()[0]
+  synchronous = c.execute("PRAGMA synchronous").fetchone()[0]
+  c.execute("PRAGMA journal_mode=WAL")
+  c.execute("PRAGMA synchronous=NORMAL")
+  try:
+    yield conn
+    conn.commit()
+  except:
+    conn.rollback()
+    raise
+  finally:
+    c.execute(f"PRAGMA journal_mode={journal_mode}")
+    c.execute(f"PRAGMA synchronous={synchronous}")
@@ -0,0 +1,62 @@
+import json, re
+from typing import Any, Iterator, TextIO
+
+READ_SIZE = 1 << 20
+"""Number of characters read from the file at once."""
+
+_WHITESPACE = " \t\n\r"
+_DELIMITER = re.compile(r"[ \t\n\r,\]}]")
+
+def iter_array(file: TextIO, read_size: int = READ_SIZE) -> Iterator[Any]:
+  """Yields the elements of a top-level JSON array, reading the file in chunks instead of loading the whole document.
+
+  Memory use is bounded by the chunk size and the largest element."""
+  decoder = json.JSONDecoder()
+  buffer = ""
+  pos = 0
+  eof = False
+  # "[" - array start, "first" - element or end, "," - separator or end, "value" - element
+  expected = "["
+  while True:
+    while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+      pos += 1
+    if pos == len(buffer):
+      if eof:
+        raise ValueError("Unexpected end of JSON array")
+      buffer = file.read(read_size)
+      pos = 0
+      eof = buffer == ""
+      continue
+
+    char = buffer[pos]
+    if expected == "[":
+      if char != "[":
+        raise ValueError(f"Expected JSON array, found {char!r}")
+      pos += 1
+      expected = "first"
+    elif char == "]" and expected in ("first", ","):
+      return
+    elif expected == ",":
+      if char != ",":
+        raise ValueError(f"Expected ',' or ']' in JSON array, found {char!r}")
+      pos += 1
+      expected = "value"
+    else:
+      end = None
+      # numbers and literals are complete only when followed by a delimiter, their prefixes are valid too
+      if eof or char in '{["' or _DELIMITER.search(buffer, pos) is not None:
+        try:
+          value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+          if eof:
+            raise
+      if end is None:
+        # growing reads keep elements spanning many chunks linear
+        chunk = file.read(max(read_size, len(buffer) - pos))
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        eof = chunk == ""
+        continue
+      pos = end
+      expected = ","
+      yield value
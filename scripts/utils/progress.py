@@ -0,0 +1,42 @@
+import sys, time
+from typing import Iterable, Iterator, TextIO
+
+class ProgressBar:
+  """Progress bar of a long-running loop, redrawn in place on one line."""
+  def __init__(self, total: int, width: int = 40, interval: float = 0.2, file: TextIO | None = None) -> None:
+    self.total = total
+    self.width = width
+    self.interval = interval
+    # resolved late, the standard error can be redirected
+    self.file = file if file is not None else sys.stderr
+    self.count = 0
+    self.start = time.monotonic()
+    self.drawn = 0.0
+
+  def update(self, count: int = 1) -> None:
+    """Advances the progress by `count` items."""
+    self.count += count
+    now = time.monotonic()
+    if now - self.drawn >= self.interval:
+      self.drawn = now
+      self.__draw(now)
+
+  def track(self, items: Iterable) -> Iterator:
+    """Yields the items, advancing the progress by one for each."""
+    for item in items:
+      yield item
+      self.update()
+
+  def close(self) -> None:
+    """Draws the final state and ends the line."""
+    self.__draw(time.monotonic())
+    self.file.write("\n")
+    self.file.flush()
+
+  def __draw(self, now: float) -> None:
+    """Redraws the bar with the item count and rate."""
+    ratio = min(self.count / self.total, 1.0) if self.total > 0 else 1.0
+    filled = int(ratio * self.width)
+    rate = self.count / max(now - self.start, 1e-6)
+    self.file.write(f"\r[{'#' * filled}{'.' * (self.width - filled)}] {self.count}/{self.total} ({rate:.0f}/s)")
+    self.file.flush()
@@ -0,0 +1,97 @@
+import sqlite3
+from typing import List, Tuple
+
+BINARY_INDEXES = [
+  # positives join of `tpaths.py` and `tpaths_pos.py`
+  ("paths_string_addr", "paths", ("string_addr", "to_name")),
+  ("tokens_string_addr", "tokens", ("string_addr", "is_name")),
+  # `token_paths` lookups and updates by path
+  ("token_paths_path_id", "token_paths", ("path_id", "token_literal")),
+  ("funcs_func_addr", "funcs", ("func_addr",)),
+]
+"""Indexes of single-binary database tables, `(name, table, columns)`.
+
+`strings.address` and `paths.func_addr` are covered by the UNIQUE constraint indexes."""
+
+MERGED_INDEXES = [
+  # covering the path joins of `models/paths/utils.py` and `models/pipeline/utils.py`
+  ("paths_binary_local_id", "paths", ("binary", "local_id", "to_name", "func_addr", "ref_depth", "is_upward")),
+  ("token_paths_binary_local_path_id", "token_paths", ("binary", "local_path_id", "names_func", "token_literal")),
+  ("paths_binary_string_addr", "paths", ("binary", "string_addr")),
+  ("tokens_binary_string_addr", "tokens", ("binary", "string_addr")),
+]
+"""Indexes of merged dataset tables (`mergedb.py`), `(name, table, columns)`.
+
+`funcs(binary, func_addr)` and `strings(binary, address)` are covered by the primary key indexes."""
+
+REPORT_QUERIES = [
+  ("tpaths.py positives", '''SELECT tokens.*, paths.* FROM tokens JOIN paths ON tokens.string_addr = paths.string_addr
+                          WHERE tokens.is_name = 1 AND paths.to_name = 1
+                          ORDER BY tokens.rowid, paths.func_addr, paths.path_func1, paths.path_func2, paths.path_func3'''),
+  ("tpaths_neg.py missing negatives", '''SELECT paths.id, paths.func_addr, paths.string_addr FROM (SELECT * FROM paths WHERE to_name = 0) AS paths
+                                      LEFT JOIN token_paths ON id = path_id WHERE token_literal IS NULL'''),
+  ("models/paths/utils.py get_unbalanced_data", '''SELECT token_literal, names_func, ref_depth, is_upward, nb_referrers, nb_strings, nb_referees, instructions
+                                                FROM (SELECT * FROM token_paths WHERE names_func IS NOT NULL) AS tp
+                                                JOIN (SELECT * FROM paths WHERE to_name IS NOT NULL) AS p ON tp.binary = p.binary AND tp.local_path_id = p.local_id
+                                                JOIN funcs ON p.binary = funcs.binary AND p.func_addr = funcs.func_addr'''),
+  ("models/pipeline/utils.py query_data", '''SELECT p.binary, p.func_addr, ref_depth, is_upward, token_literal, names_func, nb_referrers, nb_strings, nb_referees, instructions FROM (SELECT binary, local_id, func_addr, ref_depth, is_upward FROM paths WHERE to_name IS NOT NULL) AS p
+                                          JOIN token_paths AS tp ON p.binary = tp.binary AND local_id = local_path_id
+                                          JOIN funcs ON funcs.binary = p.binary AND funcs.func_addr = p.func_addr
+                                          WHERE names_func IS NOT NULL'''),
+]
+"""Big joins of the scripts and models, `(name, query)`."""
+
+def get_columns(c: sqlite3.Cursor, table: str) -> List[str]:
+  """Returns column names of a table, empty if it does not exist."""
+  c.execute("SELECT name FROM pragma_table_info(?)", (table,))
+  return [row[0] for row in c.fetchall()]
+
+def ensure_indexes(conn: sqlite3.Connection) -> List[str]:
+  """Creates missing indexes of existing single-binary or merged tables and updates the planner statistics,
+  returns the names of the created indexes.
+
+  Merged tables are recognized by their `binary` column."""
+  c = conn.cursor()
+  created = []
+  tables = {}
+  for name, table, columns in BINARY_INDEXES + MERGED_INDEXES:
+    if table not in tables:
+      tables[table] = get_columns(c, table)
+    table_columns = tables[table]
+    merged = "binary" in table_columns
+    if merged != ("binary" in columns) or not all(column in table_columns for column in columns):
+      continue
+
+    if c.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone() is None:
+      c.execute(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+      created.append(name)
+
+  # statistics are gathered once and refreshed with new indexes
+  analyzed = c.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is not None
+  if len(created) > 0 or not analyzed:
+    c.execute("ANALYZE")
+  conn.commit()
+
+  for name in created:
+    print(f"Created index {name}")
+  return created
+
+def explain_queries(conn: sqlite3.Connection, queries: List[Tuple[str, str]] = REPORT_QUERIES) -> List[Tuple[str, List[str]]]:
+  """Returns `EXPLAIN QUERY PLAN` details of the queries which can run on the database, `(name, plan)`."""
+  c = conn.cursor()
+  plans = []
+  for name, query in queries:
+    try:
+      c.execute(f"EXPLAIN QUERY PLAN {query}")
+    # other schema
+    except sqlite3.OperationalError:
+      continue
+    plans.append((name, [row[3] for row in c.fetchall()]))
+  return plans
+
+def print_report(conn: sqlite3.Connection) -> None:
+  """Prints query plans of the big joins."""
+  for name, plan in explain_queries(conn):
+    print(f"{name}:")
+    for detail in plan:
+      print(f"  {detail}")
@@ -0,0 +1,72 @@
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+def ascii_lower(text: str) -> str:
+  """Lowercases ASCII letters only, same case folding as SQLite `LIKE`."""
+  return text.translate(_ASCII_LOWER)
+
+class AhoCorasick:
+  """Aho-Corasick automaton finding all of a set of patterns in a single pass over a text."""
+  def __init__(self, patterns: Iterable[str], ignore_case: bool = False) -> None:
+    self.ignore_case = ignore_case
+    # trie transitions, failure links, patterns ending in a node
+    # and the next node on the failure chain ending any pattern
+    self.goto: List[Dict[str, int]] = [{}]
+    self.fail = [0]
+    self.outputs: List[List[int]] = [[]]
+    self.next_output = [0]
+    for idx, pattern in enumerate(patterns):
+      self.__add(ascii_lower(pattern) if ignore_case else pattern, idx)
+    self.__link()
+
+  def find(self, text: str) -> Set[int]:
+    """Returns indices of the patterns occurring in a text."""
+    if self.ignore_case:
+      text = ascii_lower(text)
+    goto = self.goto
+    fail = self.fail
+    outputs = self.outputs
+    next_output = self.next_output
+    found = set(outputs[0])
+    node = 0
+    for char in text:
+      while char not in goto[node] and node != 0:
+        node = fail[node]
+      node = goto[node].get(char, 0)
+      # report every pattern ending here, nodes without own patterns are skipped by output links
+      out = node if len(outputs[node]) > 0 else next_output[node]
+      while out != 0:
+        found.update(outputs[out])
+        out = next_output[out]
+    return found
+
+  def __add(self, pattern: str, idx: int) -> None:
+    """Adds a pattern to the trie."""
+    node = 0
+    for char in pattern:
+      child = self.goto[node].get(char)
+      if child is None:
+        child = len(self.goto)
+        self.goto[node][char] = child
+        self.goto.append({})
+        self.fail.append(0)
+        self.outputs.append([])
+        self.next_output.append(0)
+      node = child
+    self.outputs[node].append(idx)
+
+  def __link(self) -> None:
+    """Computes failure and output links breadth-first."""
+    queue = deque(self.goto[0].values())
+    while len(queue) > 0:
+      node = queue.popleft()
+      for char, child in self.goto[node].items():
+        queue.append(child)
+        state = self.fail[node]
+        while char not in self.goto[state] and state != 0:
+          state = self.fail[state]
+        self.fail[child] = self.goto[state].get(char, 0)
+        fail = self.fail[child]
+        self.next_output[child] = fail if len(self.outputs[fail]) > 0 and fail != 0 else self.next_output[fail]